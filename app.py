@@ -1,15 +1,275 @@
-from flask import Flask, render_template, request, redirect, url_for
-from battleship import BattleshipGame
+import hashlib
+import os
+import secrets
+from functools import lru_cache
+
+from flask import (
+    Flask, Response, g, jsonify, render_template, request, redirect, url_for,
+    session, stream_with_context,
+)
+from markupsafe import Markup
+from werkzeug.middleware.proxy_fix import ProxyFix
+from battleship import (
+    BattleshipGame, DIFFICULTIES, FLEET, MIN_SIZE, MAX_SIZE, position_name,
+    row_label,
+)
+from events import Broadcaster
+from game_store import GameStore
+from leaderboard import Leaderboard, clean_name, default_path
+from metrics import games_finished, games_started, shots
+from metrics import instrument_app, instrument_engine
+from ratelimit import (
+    ClientRateLimit, ConcurrencyLimit, TokenBuckets, protect_app,
+)
+from replay import LogCache
+from rooms import Lobby, RoomRegistry
+from solver import best_cell
+from storage import SQLiteGameStore
+from tokens import TokenGameStore
 
 app = Flask(__name__)
+# Set SECRET_KEY when running several workers so they share sessions
+app.secret_key = os.environ.get("SECRET_KEY") or secrets.token_hex(32)
+app.json.ensure_ascii = False  # emoji as UTF-8, not \uXXXX pairs
+
+# One game per browser session: in memory (LRU + idle TTL, bounded
+# memory), or in a shared SQLite file when BATTLESHIP_DB is set so any
+# worker process can serve any request. With BATTLESHIP_TOKENS=1 the
+# server keeps no games at all: each one lives in an encrypted, signed
+# cookie (every worker needs the same SECRET_KEY).
+if int(os.environ.get("BATTLESHIP_TOKENS", 0)):
+    games = TokenGameStore(
+        app.secret_key,
+        max_age=int(os.environ.get("BATTLESHIP_GAME_TTL", 3600)))
+    games.install(app)
+elif os.environ.get("BATTLESHIP_DB"):
+    games = SQLiteGameStore(
+        os.environ["BATTLESHIP_DB"],
+        ttl=int(os.environ.get("BATTLESHIP_GAME_TTL", 3600)))
+else:
+    games = GameStore(
+        max_games=int(os.environ.get("BATTLESHIP_MAX_GAMES", 50_000)),
+        ttl=int(os.environ.get("BATTLESHIP_GAME_TTL", 3600)),
+        max_bytes=int(os.environ.get("BATTLESHIP_MAX_BYTES",
+                                     512 * 1024 * 1024)),
+    )
+
+# Results of finished games and the leaderboards built from them. Not
+# from games a client can rewind (token mode): they could replay a turn
+# until it hits, or a winning shot many times.
+results = Leaderboard(default_path())
+RANKED = not getattr(games, "replayable", False)
+
+# Move logs of the games being replayed, extended as they are played
+replay_logs = LogCache()
+
+# Live shot events for spectators (/game/<id>/events)
+spectators = Broadcaster()
+
+# Human-vs-human rooms. Like the spectator streams they live in this
+# process, so run one worker (threaded) or route players stickily.
+rooms = RoomRegistry(
+    size=int(os.environ.get("BATTLESHIP_PVP_SIZE", 10)),
+    num_ships=int(os.environ.get("BATTLESHIP_PVP_SHIPS", 5)),
+)
+lobby = Lobby(rooms)
+LONG_POLL_SECONDS = 25
+
+# Latency histograms and counters, scraped from /metrics
+instrument_engine(BattleshipGame)
+instrument_app(app, live_games=lambda: games.stats()["games"])
+
+# Rate limits on the routes that run the engine: tokens per request from
+# the client's bucket (a new game costs more; checked before Flask), one
+# from the game's, and a cap on how many of them run at once. Long-polls
+# are not limited.
+ENGINE_COSTS = {"/setup": 5, "/fire": 1, "/api/fire": 1, "/api/salvo": 1,
+                "/api/hint": 2}
+ENGINE_ENDPOINTS = {"setup", "fire", "api_fire", "api_salvo", "api_hint"}
+if os.environ.get("BATTLESHIP_RATE_LIMITS", "1") != "0":
+    app.wsgi_app = ClientRateLimit(
+        app.wsgi_app, ENGINE_COSTS,
+        TokenBuckets(
+            rate=float(os.environ.get("BATTLESHIP_CLIENT_RATE", 10)),
+            burst=float(os.environ.get("BATTLESHIP_CLIENT_BURST", 20))))
+    protect_app(
+        app, ENGINE_ENDPOINTS,
+        games=TokenBuckets(
+            rate=float(os.environ.get("BATTLESHIP_GAME_RATE", 5)),
+            burst=float(os.environ.get("BATTLESHIP_GAME_BURST", 10))),
+        concurrency=ConcurrencyLimit(
+            int(os.environ.get("BATTLESHIP_MAX_IN_FLIGHT", 32))),
+        game_key=lambda: session.get("game_id"),
+    )
+# Number of trusted proxies in front of the app (the client IP then
+# comes from X-Forwarded-For)
+if int(os.environ.get("BATTLESHIP_PROXIES", 0)):
+    app.wsgi_app = ProxyFix(app.wsgi_app,
+                            x_for=int(os.environ["BATTLESHIP_PROXIES"]))
+
+
+def current_game(turn=False):
+    """Return the game of this browser session (None when there is none).
+
+    turn=True for requests that play a turn: with a store that shares
+    one game object between requests, the game's turn lock is then held
+    until the request ends.
+    """
+    game_id = session.get("game_id")
+    if game_id is None:
+        return None
+    if turn and hasattr(games, "turn_lock") and "turn_lock" not in g:
+        g.turn_lock = games.turn_lock(game_id)
+        g.turn_lock.acquire()
+    if hasattr(games, "load"):  # versioned store: the row's version
+        game, g.loaded_version = games.load(game_id)
+        return game
+    game = games.get(game_id)
+    if game is not None:
+        g.loaded_version = game.version
+    return game
+
+
+def game_changed(game):
+    """Queue the session's game to be saved once the request is done."""
+    g.changed_games = [(session["game_id"], game, g.loaded_version)]
+
+
+@app.after_request
+def save_changed_games(response):
+    """Write every game changed by this request in one batch."""
+    if response.status_code >= 500:
+        return response  # left for drop_failed_games
+    changed = g.pop("changed_games", None)
+    if changed and games.save_many(changed):
+        return jsonify(error="game was changed by another request"), 409
+    return response
+
 
-# Global game instance (simple & acceptable for Project 3)
-game = None
+@app.teardown_request
+def release_turn_lock(exc):
+    """Let the next request of this game play (see current_game)."""
+    lock = g.pop("turn_lock", None)
+    if lock is not None:
+        lock.release()
+
+
+@app.teardown_request
+def drop_failed_games(exc):
+    """A request that crashed mid-turn must not leave a stale cache."""
+    changed = g.pop("changed_games", None)
+    if changed and hasattr(games, "forget"):
+        for game_id, _, _ in changed:
+            games.forget(game_id)
+
+
+# Key of the page ETags: a bare seed would give away the ship positions
+ETAG_KEY = hashlib.sha256(b"battleship etag:"
+                          + app.secret_key.encode()).digest()
+
+
+def game_etag(game):
+    """Strong ETag for the rendered page: keyed hash of the game identity
+    and state version (opaque to the client)."""
+    return hashlib.blake2b(f"{game.seed}:{game.version}".encode(),
+                           key=ETAG_KEY, digest_size=12).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def board_header_html(size):
+    """Cached column-number header row of one board."""
+    cells = "".join(f"<th>{c + 1}</th>" for c in range(size))
+    return Markup(f"<tr><th></th>{cells}</tr>")
+
+
+@lru_cache(maxsize=None)
+def row_header_html(size):
+    """Cached row-label header cells (A, B, ... AA...) for one board."""
+    return tuple(Markup(f"<th>{row_label(r)}</th>") for r in range(size))
+
+
+def take_turn(game, position, game_id=None):
+    """Player shot (or salvo), then the enemy reply if still running.
+
+    An invalid guess, or any guess once the game is over, is refused
+    (see player_turn) and the enemy does not fire.
+    """
+    moved = game.player_turn(position)
+
+    # Enemy only plays after a shot, and if the game is still running
+    game.last_enemy_shot = None
+    if moved and game.winner() is None:
+        game.enemy_turn()
+
+    for side, salvo in (("player", game.last_player_salvo),
+                        ("enemy", game.last_enemy_salvo)):
+        if salvo:
+            shots.inc(side, amount=len(salvo))
+    winner = game.winner()
+    if moved and winner is not None:  # this turn ended the game
+        games_finished.inc(winner)
+        if RANKED:
+            results.record(game, session.get("player_name"))
+
+    if game_id is not None:
+        publish_turn(game_id, game)
+
+
+def publish_turn(game_id, game):
+    """Push the shots of the last turn to spectators (one event each)."""
+    for side, salvo in (("player", game.last_player_salvo),
+                        ("enemy", game.last_enemy_salvo)):
+        board = game.enemy_fleet if side == "player" else game.player_fleet
+        for r, c, hit in salvo:
+            sunk = board.sunk_ship(r, c)
+            spectators.publish(game_id, "shot", {
+                "side": side,
+                "cell": position_name(r, c),
+                "result": "hit" if hit else "miss",
+                "sunk": None if sunk is None else FLEET[sunk][0],
+                "v": game.version,
+            })
+    winner = game.winner()
+    if winner is not None:
+        spectators.publish(game_id, "over", {"winner": winner})
+
+
+def shot_json(shot, board, reveal=False):
+    """One resolved shot as {'cell', 'r', 'c', 'result', 'symbol', 'sunk'}.
+
+    sunk names the ship this shot sank, else None.
+    """
+    if shot is None:
+        return None
+    r, c, hit = shot
+    sunk = board.sunk_ship(r, c)
+    return {
+        "cell": position_name(r, c),
+        "r": r,
+        "c": c,
+        "result": "hit" if hit else "miss",
+        "symbol": board.symbol(r, c, reveal),
+        "sunk": None if sunk is None else FLEET[sunk][0],
+    }
+
+
+def counts_json(game):
+    """Ship and shot counters plus game-over state."""
+    winner = game.winner()
+    return {
+        "enemy_ships": game.enemy_fleet.ships_afloat,
+        "player_ships": game.player_fleet.ships_afloat,
+        "player_shots": game.total_player_shots,
+        "enemy_shots": game.total_enemy_shots,
+        "salvo_size": game.salvo_size(),
+        "over": winner is not None,
+        "winner": winner,
+    }
 
 
 @app.route("/", methods=["GET"])
 def home():
-    return render_template("setup.html")
+    return render_template("setup.html", ranked=RANKED)
 
 
 @app.route("/setup", methods=["POST"])
@@ -17,10 +277,24 @@ def setup():
     """
     Create a new game from setup form
     """
-    global game
-    size = int(request.form.get("size", 8))
-    ships = int(request.form.get("ships", 3))
-    game = BattleshipGame(size=size, num_ships=ships)
+    size = int(request.form.get("size", MIN_SIZE))
+    size = min(max(size, MIN_SIZE), MAX_SIZE)
+    ships = min(max(int(request.form.get("ships", 3)), 1), len(FLEET))
+    difficulty = request.form.get("difficulty", "easy")
+    if difficulty not in DIFFICULTIES:
+        difficulty = "easy"
+    salvo = request.form.get("mode") == "salvo"
+    name = clean_name(request.form.get("name"))
+    if name is None:
+        session.pop("player_name", None)
+    else:
+        session["player_name"] = name
+    game_id = session.get("game_id") or secrets.token_urlsafe(16)
+    session["game_id"] = game_id
+    game = BattleshipGame(size=size, num_ships=ships, difficulty=difficulty,
+                          salvo=salvo)
+    games.put(game_id, game)
+    games_started.inc()
     return redirect(url_for("play_game"))
 
 
@@ -29,11 +303,23 @@ def play_game():
     """
     Main game screen (browser playable)
     """
-    global game
+    game = current_game()
     if game is None:
         return redirect(url_for("home"))
 
-    return render_template("game.html", game=game, chr=chr)
+    # Unchanged since the browser's copy: skip rendering entirely
+    etag = game_etag(game)
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        response = app.make_response(render_template(
+            "game.html", game=game,
+            board_header=board_header_html(game.size),
+            row_headers=row_header_html(game.size),
+        ))
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
 
 
 @app.route("/fire", methods=["POST"])
@@ -41,27 +327,324 @@ def fire():
     """
     Handle a player shot from the browser
     """
-    global game
+    game = current_game(turn=True)
     if game is None:
         return redirect(url_for("home"))
 
     position = request.form.get("position", "").upper()
-    game.player_turn(position)
-
-    # Enemy only plays if game still running
-    if game.enemy_ships and game.player_ships:
-        game.enemy_turn()
+    take_turn(game, position, session["game_id"])
+    game_changed(game)
 
     return redirect(url_for("play_game"))
 
 
+@app.route("/api/fire", methods=["POST"])
+def api_fire():
+    """
+    Fire one shot; returns only what changed (one round trip per turn)
+    """
+    game = current_game(turn=True)
+    if game is None:
+        return jsonify(error="no game"), 404
+
+    data = request.get_json(silent=True) or request.form
+    take_turn(game, data.get("position", ""), session["game_id"])
+    game_changed(game)
+
+    return jsonify(
+        player=shot_json(game.last_player_shot, game.enemy_fleet),
+        enemy=shot_json(game.last_enemy_shot, game.player_fleet,
+                        reveal=True),
+        player_msg=game.player_msg,
+        enemy_msg=game.enemy_msg,
+        **counts_json(game),
+    )
+
+
+@app.route("/api/salvo", methods=["POST"])
+def api_salvo():
+    """
+    Fire a whole salvo (salvo mode) in one request; one combined reply
+    """
+    game = current_game(turn=True)
+    if game is None:
+        return jsonify(error="no game"), 404
+
+    data = request.get_json(silent=True) or request.form
+    positions = data.get("positions", "")
+    if isinstance(positions, list):
+        positions = " ".join(map(str, positions))
+    take_turn(game, positions, session["game_id"])
+    game_changed(game)
+
+    return jsonify(
+        player=[shot_json(shot, game.enemy_fleet)
+                for shot in game.last_player_salvo],
+        enemy=[shot_json(shot, game.player_fleet, reveal=True)
+               for shot in game.last_enemy_salvo],
+        player_msg=game.player_msg,
+        enemy_msg=game.enemy_msg,
+        **counts_json(game),
+    )
+
+
+@app.route("/api/state", methods=["GET"])
+def api_state():
+    """
+    Full snapshot of the current game (emoji rows as strings)
+    """
+    game = current_game()
+    if game is None:
+        return jsonify(error="no game"), 404
+
+    return jsonify(
+        size=game.size,
+        rows=[row_label(r) for r in range(game.size)],
+        enemy_view=["".join(row) for row in game.enemy_view],
+        player_board=["".join(row) for row in game.player_board],
+        player_msg=game.player_msg,
+        enemy_msg=game.enemy_msg,
+        **counts_json(game),
+    )
+
+
+@app.route("/api/hint", methods=["GET"])
+def api_hint():
+    """
+    Ship probability of every untried enemy cell (training aid)
+    """
+    game = current_game()
+    if game is None:
+        return jsonify(error="no game"), 404
+
+    post = game.hint()
+    best = best_cell(post)
+    return jsonify(
+        method=post.method,
+        samples=post.samples,
+        best=None if best is None else position_name(*best),
+        probabilities=[[None if p is None else round(p, 4) for p in row]
+                       for row in post.grid],
+    )
+
+
+@app.route("/api/log", methods=["GET"])
+def api_log():
+    """
+    Download the current game's binary move log (for bug reports)
+
+    Only once the game is over: the log (and its file name) carries the
+    seed, which reproduces the enemy's ship placement.
+    """
+    game = current_game()
+    if game is None:
+        return jsonify(error="no game"), 404
+    if game.winner() is None:
+        return jsonify(error="the log is available once the game is "
+                             "over"), 409
+
+    return Response(
+        replay_logs.log_of(session["game_id"], game).to_bytes(),
+        mimetype="application/octet-stream",
+        headers={"Content-Disposition":
+                 f"attachment; filename=battleship-{game.seed:x}.bslog"},
+    )
+
+
+@app.route("/api/replay/<int:turn>", methods=["GET"])
+def api_replay(turn):
+    """
+    The current game as it was after `turn` shots
+    """
+    game = current_game()
+    if game is None:
+        return jsonify(error="no game"), 404
+
+    log = replay_logs.log_of(session["game_id"], game)
+    if turn > len(log):
+        return jsonify(error=f"turn must be 0–{len(log)}"), 404
+    past = log.game_at(turn)
+    return jsonify(
+        turn=turn,
+        turns=len(log),
+        enemy_view=["".join(row) for row in past.enemy_view],
+        player_board=["".join(row) for row in past.player_board],
+        **counts_json(past),
+    )
+
+
+def board_setup():
+    """(size, ships) of the fastest-wins board from the query string."""
+    size = request.args.get("size", type=int) or MIN_SIZE
+    ships = request.args.get("ships", type=int) or 3
+    return (min(max(size, MIN_SIZE), MAX_SIZE),
+            min(max(ships, 1), len(FLEET)))
+
+
+@app.route("/leaderboard", methods=["GET"])
+def leaderboard():
+    """
+    Top players and fastest wins for one board setup
+    """
+    size, ships = board_setup()
+    return render_template(
+        "leaderboard.html",
+        size=size, ships=ships, min_size=MIN_SIZE, max_size=MAX_SIZE,
+        max_ships=len(FLEET),
+        totals=results.totals(),
+        players=results.top_players(10),
+        fastest=results.fastest_wins(size, ships, 10),
+    )
+
+
+@app.route("/api/leaderboard", methods=["GET"])
+def api_leaderboard():
+    """
+    Leaderboards as JSON (?n=10&size=8&ships=3)
+    """
+    size, ships = board_setup()
+    n = min(max(request.args.get("n", 10, type=int), 1), 100)
+    return jsonify(
+        totals=results.totals(),
+        players=results.top_players(n),
+        fastest={"size": size, "ships": ships,
+                 "wins": results.fastest_wins(size, ships, n)},
+    )
+
+
+@app.route("/game/<game_id>/events", methods=["GET"])
+def game_events(game_id):
+    """
+    Server-sent events: every shot of a running game, for spectators
+    """
+    if game_id not in games:
+        return jsonify(error="no game"), 404
+
+    last_id = request.headers.get("Last-Event-ID", "")
+    stream = spectators.subscribe(
+        game_id, int(last_id) if last_id.isdigit() else None)
+    return Response(
+        stream_with_context(stream),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# ----- Human vs human -----
+def player_id():
+    """Stable per-browser player id for PvP (kept in the session)."""
+    if "player_id" not in session:
+        session["player_id"] = secrets.token_urlsafe(16)
+    return session["player_id"]
+
+
+def poll_timeout():
+    """Long-poll timeout from ?timeout=, capped at LONG_POLL_SECONDS."""
+    try:
+        timeout = float(request.args.get("timeout", LONG_POLL_SECONDS))
+    except ValueError:
+        timeout = LONG_POLL_SECONDS
+    return min(max(timeout, 0.0), LONG_POLL_SECONDS)
+
+
+def room_json(room, player, status="matched", **extra):
+    return jsonify(status=status, **room.view(player), **extra)
+
+
+@app.route("/pvp", methods=["GET"])
+def pvp():
+    """
+    Human-vs-human page (lobby, then the game; updates by long-poll)
+    """
+    return render_template("pvp.html")
+
+
+@app.route("/pvp/join", methods=["POST"])
+def pvp_join():
+    """
+    Enter the lobby; matched at once if someone is waiting
+    """
+    player = player_id()
+    room = rooms.room_of(player)
+    if room is None or room.winner is not None:
+        room = lobby.join(player)
+    if room is None:
+        return jsonify(status="waiting")
+    return room_json(room, player)
+
+
+@app.route("/pvp/match", methods=["GET"])
+def pvp_match():
+    """
+    Long-poll: returns as soon as a waiting player is paired
+    """
+    player = player_id()
+    room = lobby.wait_match(player, poll_timeout())
+    if room is None:
+        return jsonify(status="waiting")
+    return room_json(room, player)
+
+
+@app.route("/pvp/state", methods=["GET"])
+def pvp_state():
+    player = player_id()
+    room = rooms.room_of(player)
+    if room is None:
+        return jsonify(error="no room"), 404
+    return room_json(room, player)
+
+
+@app.route("/pvp/wait", methods=["GET"])
+def pvp_wait():
+    """
+    Long-poll: returns once the room moves past ?since=<version>
+    """
+    player = player_id()
+    room = rooms.room_of(player)
+    if room is None:
+        return jsonify(error="no room"), 404
+    since = request.args.get("since", "")
+    room.wait(int(since) if since.lstrip("-").isdigit() else -1,
+              poll_timeout())
+    return room_json(room, player)
+
+
+@app.route("/pvp/fire", methods=["POST"])
+def pvp_fire():
+    player = player_id()
+    room = rooms.room_of(player)
+    if room is None:
+        return jsonify(error="no room"), 404
+    data = request.get_json(silent=True) or request.form
+    try:
+        message = room.fire(player, data.get("position", ""))
+    except ValueError as err:
+        return room_json(room, player, error=str(err)), 409
+    return room_json(room, player, message=message)
+
+
+@app.route("/pvp/leave", methods=["POST"])
+def pvp_leave():
+    """
+    Leave the lobby, or forfeit the current game
+    """
+    player = player_id()
+    lobby.leave(player)
+    room = rooms.room_of(player)
+    if room is not None:
+        room.leave(player)
+    return jsonify(status="left")
+
+
 @app.route("/new-game", methods=["POST"])
 def new_game():
     """
     Reset and go to setup again
     """
-    global game
-    game = None
+    game_id = session.pop("game_id", None)
+    if game_id is not None:
+        games.delete(game_id)
+        spectators.close(game_id)
     return redirect(url_for("home"))
 
 
@@ -1,13 +1,58 @@
 # Battleship Game
+import argparse
+import importlib
 import os
 import re
 import random
+import shutil
+import struct
+import sys
 import time
-from colorama import init, Fore, Style
-from wcwidth import wcswidth
+from collections.abc import Set
+from functools import lru_cache
+from string import ascii_uppercase
 
-# Initialize colorama (cross-platform color support)
-init(autoreset=True)
+
+# ----- Lazily loaded terminal dependencies -----
+# colorama and wcwidth are only imported when something draws to a
+# terminal, so headless users (protocol mode, the web app, simulations)
+# never pay for them.
+class _LazyAttr:
+    """Stand-in for a module attribute, imported on first access."""
+
+    def __init__(self, module, name):
+        self._module = module
+        self._name = name
+
+    def __getattr__(self, attr):
+        target = getattr(importlib.import_module(self._module), self._name)
+        value = getattr(target, attr)
+        setattr(self, attr, value)  # later lookups skip __getattr__
+        return value
+
+
+Fore = _LazyAttr("colorama", "Fore")
+Style = _LazyAttr("colorama", "Style")
+
+
+def init_colors():
+    """Initialize colorama (cross-platform color support)."""
+    from colorama import init
+    init(autoreset=True)
+
+
+def wcswidth(text: str) -> int:
+    """Terminal width of a string (wcwidth.wcswidth, loaded on first use)."""
+    global wcswidth
+    from wcwidth import wcswidth
+    return wcswidth(text)
+
+
+def wcwidth(char: str) -> int:
+    """Terminal width of one character (wcwidth.wcwidth, loaded lazily)."""
+    global wcwidth
+    from wcwidth import wcwidth
+    return wcwidth(char)
 
 
 # ========= 1) Welcome Screen =========
@@ -69,26 +114,31 @@ class WelcomeScreen:
         print("\n" + Fore.YELLOW + "═" * self.width + Style.RESET_ALL)
 
     # ----- Player Inputs -----
-    def get_inputs(self):
-        """Ask player for grid size (8–15) and number of ships (1–5)."""
+    def get_inputs(self, large=False):
+        """Ask player for grid size (8–15) and number of ships (1–5).
+
+        large=True enables large-board mode (grids up to 100x100).
+        """
+        max_size = LARGE_MAX_SIZE if large else MAX_SIZE
         print("\n")
 
         # Ask for grid size
         while True:
             size_str = input(
                 self.center_text(
-                    "Enter grid size (8–15) [default = 8]: ",
+                    f"Enter grid size ({MIN_SIZE}–{max_size}) "
+                    f"[default = {MIN_SIZE}]: ",
                     color=Fore.CYAN,
                 )
             ).strip()
-            size = 8 if size_str == "" else None
+            size = MIN_SIZE if size_str == "" else None
             if size_str.isdigit():
                 size = int(size_str)
-            if size and 8 <= size <= 15:
+            if size and MIN_SIZE <= size <= max_size:
                 break
             print(
                 self.center_text(
-                    "❌ Grid size must be 8–15.",
+                    f"❌ Grid size must be {MIN_SIZE}–{max_size}.",
                     color=Fore.RED,
                 )
             )
@@ -135,8 +185,10 @@ class WelcomeScreen:
             "Welcome, Commander. Enemy fleets lurk beyond the horizon..."
             + Style.RESET_ALL,
             f"The tactical grid is {size}×{size} sectors "
-            f"(rows A–{chr(64 + size)}, columns 1–{size}).",
-            f"Your fleet has deployed {ships} battleships to these waters.",
+            f"(rows A–{row_label(size - 1)}, columns 1–{size}).",
+            f"Your fleet has deployed {ships} ships to these waters: "
+            + ", ".join(f"{name} ({length})"
+                        for name, length in FLEET[:ships]) + ".",
             "Enemy ships are hidden. Hunt them down with precision fire!",
         ]
         for p in paragraphs:
@@ -195,11 +247,125 @@ MISS = "💦"
 HIT = "💥"
 SHIP_CHAR = "🚢"
 
+# Grid limits (large-board mode raises the cap to 100x100)
+MIN_SIZE = 8
+MAX_SIZE = 15
+LARGE_MAX_SIZE = 100
+
 LEFT_TITLE = "Enemy Fleet"
 RIGHT_TITLE = "Your Fleet"
 CELL_VISUAL = 3
 GAP_BETWEEN_BOARDS = " " * 8
 
+# Enemy AI levels: easy fires at random, hard opens from a precomputed
+# book (openings.py) and then uses a probability heatmap
+DIFFICULTIES = ("easy", "hard")
+# Shooter strategy (strategies.py) playing each difficulty
+ENEMY_SHOOTERS = {"easy": "random", "hard": "opening"}
+
+# Standard fleet, longest first; a game with n ships uses the first n
+FLEET = (
+    ("Carrier", 5), ("Battleship", 4), ("Cruiser", 3),
+    ("Submarine", 3), ("Destroyer", 2),
+)
+# Random picks per ship before falling back to filtering the index
+PLACEMENT_TRIES = 16
+# Fresh starts after a dead end before the one-ship-per-line layout
+PLACEMENT_RESTARTS = 3
+
+# Binary game state: format, size, ships, difficulty (| salvo flag),
+# seed, version, player shots, enemy shots, start time; then per board
+# the ships (start cell, length | vertical flag) and the hit and miss
+# bitmasks; then two messages and the move log.
+STATE_FORMAT = 4
+_STATE_HEADER = struct.Struct("<BBBBQIHHd")
+_SHIP = struct.Struct("<HB")
+_VERTICAL = 0x80
+_SALVO = 0x80
+_TEXT_LEN = struct.Struct("<H")
+_MOVES_LEN = struct.Struct("<I")
+
+# One move = little-endian u16: side bit, hit bit, 14-bit cell index
+MOVE_ENEMY = 0x8000
+MOVE_HIT = 0x4000
+MOVE_CELL = 0x3FFF
+
+
+def encode_move(enemy: bool, cell: int, hit: bool) -> int:
+    """Pack one shot into a 16-bit move code."""
+    return (MOVE_ENEMY if enemy else 0) | (MOVE_HIT if hit else 0) | cell
+
+
+def decode_move(code: int) -> tuple[bool, int, bool]:
+    """Unpack a move code -> (enemy, cell, hit)."""
+    return bool(code & MOVE_ENEMY), code & MOVE_CELL, bool(code & MOVE_HIT)
+
+
+@lru_cache(maxsize=None)
+def row_label(r: int) -> str:
+    """Row label for index r: A..Z, then AA, AB... (spreadsheet style)."""
+    label = ""
+    r += 1
+    while r:
+        r, rem = divmod(r - 1, 26)
+        label = ascii_uppercase[rem] + label
+    return label
+
+
+def parse_row_label(letters: str) -> int:
+    """Inverse of row_label ('A' -> 0, 'AA' -> 26)."""
+    r = 0
+    for ch in letters:
+        r = r * 26 + (ord(ch) - 64)
+    return r - 1
+
+
+def parse_position(guess: str, size: int) -> tuple[int, int]:
+    """Parse 'A1' / 'AB12' into (row, col).
+
+    Raises ValueError carrying the message to show the player.
+    """
+    guess = (guess or "").strip().upper()
+    split = len(guess) - len(guess.lstrip(ascii_uppercase))
+    letters, digits = guess[:split], guess[split:]
+
+    if len(guess) < 2 or not letters:
+        raise ValueError("❌ Format must be Letter+Number (e.g., A1).")
+    if not (digits.isascii() and digits.isdigit()):
+        raise ValueError("❌ Column must be a number (e.g., A1).")
+
+    r = parse_row_label(letters)
+    c = int(digits) - 1
+    if not (0 <= r < size and 0 <= c < size):
+        raise ValueError(
+            f"❌ Coordinates must be A–{row_label(size - 1)} "
+            f"+ 1–{size}."
+        )
+    return r, c
+
+
+def parse_salvo(guesses: str, size: int) -> list[tuple[int, int]]:
+    """Parse 'A1 B2, C3' into distinct (row, col) cells, in order.
+
+    Raises ValueError carrying the message to show the player.
+    """
+    cells = []
+    for guess in (guesses or "").replace(",", " ").split():
+        cell = parse_position(guess, size)
+        if cell in cells:
+            raise ValueError(
+                f"⚠️ {position_name(*cell)} is in the salvo twice.")
+        cells.append(cell)
+    if not cells:
+        raise ValueError("❌ Format must be Letter+Number (e.g., A1 B2).")
+    return cells
+
+
+@lru_cache(maxsize=16384)
+def position_name(r: int, c: int) -> str:
+    """Human-readable cell name, e.g. (0, 0) -> 'A1'."""
+    return f"{row_label(r)}{c + 1}"
+
 
 def clear_screen():
     """Clear terminal window (Windows & Unix)."""
@@ -219,182 +385,936 @@ def pad_visual(s: str, width: int) -> str:
     return s + " " * max(0, width - vis)
 
 
-def format_cell(symbol: str) -> str:
-    """Return one cell padded to CELL_VISUAL columns."""
-    return pad_visual(symbol, CELL_VISUAL)
+@lru_cache(maxsize=1024)
+def format_cell(symbol: str, width: int = CELL_VISUAL) -> str:
+    """Return one cell padded to CELL_VISUAL columns (memoized)."""
+    return pad_visual(symbol, width)
 
 
-def build_board_block(title_text: str,
-                      grid_rows: list[list[str]]) -> list[str]:
-    """Build one framed board with title, numbers, rows, and border."""
-    size = len(grid_rows)
-    inner_width = 3 + (size * CELL_VISUAL)
-    lines = []
+def cell_width(size: int) -> int:
+    """Cell width for a grid (wider once column numbers reach 3 digits)."""
+    return max(CELL_VISUAL, len(str(size)) + 1)
+
+
+def label_width(size: int) -> int:
+    """Width of the row-label column (letters + two spaces)."""
+    return len(row_label(size - 1)) + 2
+
+
+def board_width(size: int) -> int:
+    """Inner width of one framed board."""
+    return label_width(size) + size * cell_width(size)
+
+
+@lru_cache(maxsize=256)
+def board_frame(title_text: str, size: int) -> tuple[str, str, str]:
+    """Static frame lines for one board: (top + title, numbers, bottom)."""
+    width = cell_width(size)
+    inner_width = board_width(size)
 
     # Top border with centered title
     label = f" {title_text} "
     spare = inner_width - len(strip_ansi(label))
     left = max(0, spare // 2)
     right = max(0, spare - left)
-    lines.append("┌" + ("─" * left) + label + ("─" * right) + "┐")
+    top = "┌" + ("─" * left) + label + ("─" * right) + "┐"
 
     # Number header
-    nums = "".join(format_cell(str(i)) for i in range(1, size + 1))
-    lines.append("│" + "   " + nums + "│")
+    nums = "".join(format_cell(str(i), width) for i in range(1, size + 1))
+    header = "│" + " " * label_width(size) + nums + "│"
+
+    # Bottom border
+    bottom = "└" + ("─" * inner_width) + "┘"
+    return top, header, bottom
+
+
+@lru_cache(maxsize=256)
+def row_labels(size: int) -> tuple[str, ...]:
+    """Row labels padded to the label column (A, B, ... AA, AB...)."""
+    label_w = label_width(size)
+    return tuple(row_label(r).ljust(label_w) for r in range(size))
+
+
+def build_board_block(title_text: str,
+                      grid_rows: list[list[str]]) -> list[str]:
+    """Build one framed board with title, numbers, rows, and border."""
+    if isinstance(grid_rows, GridView):
+        return grid_rows.render(title_text)
+
+    size = len(grid_rows)
+    width = cell_width(size)
+    inner_width = board_width(size)
+    top, header, bottom = board_frame(title_text, size)
+    lines = [top, header]
 
     # Grid rows
-    for r in range(size):
-        row_label = chr(65 + r)  # A, B, C...
-        row_cells = "".join(format_cell(ch) for ch in grid_rows[r])
-        content = f"{row_label}  {row_cells}"
-        content = pad_visual(content, inner_width)
+    for label, row in zip(row_labels(size), grid_rows):
+        row_cells = "".join(format_cell(ch, width) for ch in row)
+        content = pad_visual(label + row_cells, inner_width)
         lines.append("│" + content + "│")
 
-    # Bottom border
-    lines.append("└" + ("─" * inner_width) + "┘")
+    lines.append(bottom)
     return lines
 
 
+class BoardRenderer:
+    """Incremental renderer for one framed board of a BitBoard.
+
+    Frame lines and padded symbols are precomputed; after each shot only
+    the rows whose bits changed since the last render are rebuilt.
+    """
+
+    __slots__ = ("title", "size", "reveal", "frame", "labels", "cells",
+                 "rows", "state")
+
+    def __init__(self, title_text, size, reveal=False):
+        self.title = title_text
+        self.size = size
+        self.reveal = reveal
+        self.frame = board_frame(title_text, size)
+        self.labels = row_labels(size)
+        width = cell_width(size)
+        self.cells = {
+            symbol: format_cell(symbol, width)
+            for symbol in (WATER, MISS, HIT, SHIP_CHAR)
+        }
+        self.rows = [""] * size
+        self.state = None
+
+    def dirty_rows(self, board) -> range | set:
+        """Rows whose cells changed since the previous render."""
+        state = (board.ships if self.reveal else 0, board.hits, board.misses)
+        old, self.state = self.state, state
+        if old is None:
+            return range(self.size)
+        changed = 0
+        for before, after in zip(old, state):
+            changed |= before ^ after
+        rows = set()
+        while changed:
+            low = changed & -changed
+            rows.add((low.bit_length() - 1) // self.size)
+            changed ^= low
+        return rows
+
+    def render_row(self, board, r) -> str:
+        cells = self.cells
+        return "│" + self.labels[r] + "".join(
+            cells[board.symbol(r, c, self.reveal)] for c in range(self.size)
+        ) + "│"
+
+    def render(self, board) -> list[str]:
+        """Return the framed board, re-rendering only dirty rows."""
+        for r in self.dirty_rows(board):
+            self.rows[r] = self.render_row(board, r)
+        top, header, bottom = self.frame
+        return [top, header, *self.rows, bottom]
+
+
+def board_lines(enemy_view: list[list[str]],
+                player_board: list[list[str]]) -> list[str]:
+    """Enemy + player boards side-by-side, one string per line."""
+    left_block = build_board_block(LEFT_TITLE, enemy_view)
+    right_block = build_board_block(RIGHT_TITLE, player_board)
+    return [lft + GAP_BETWEEN_BOARDS + rgt
+            for lft, rgt in zip(left_block, right_block)]
+
+
 def display_boards(enemy_view: list[list[str]],
                    player_board: list[list[str]]):
     """Print enemy + player boards side-by-side."""
-    left_block = build_board_block(LEFT_TITLE, enemy_view)
-    right_block = build_board_block(RIGHT_TITLE, player_board)
-    for lft, rgt in zip(left_block, right_block):
-        print(lft + GAP_BETWEEN_BOARDS + rgt)
+    for line in board_lines(enemy_view, player_board):
+        print(line)
 
 
-class BattleshipGame:
-    """Main Battleship game logic (turns, ships, status)."""
+class Screen:
+    """Differential terminal output: one buffered write per frame.
+
+    The first frame clears the screen; later frames move the cursor with
+    ANSI escapes and rewrite only what changed since the previous frame.
+    """
+
+    def __init__(self, out=None):
+        self.out = out or sys.stdout
+        self.lines = []
+        self.last_frame_time = 0.0
+        self.last_frame_bytes = 0
+
+    def reset(self):
+        """Forget the previous frame (next draw repaints everything)."""
+        self.lines = []
 
-    def __init__(self, size=8, num_ships=3, title_lines=None):
+    @staticmethod
+    def _changed_from(old: str, new: str) -> int:
+        """Index of the first differing character (ANSI-free lines only)."""
+        if "\x1b" in old or "\x1b" in new:
+            return 0
+        i = 0
+        for a, b in zip(old, new):
+            if a != b:
+                break
+            i += 1
+        # Never split a character from a following zero-width modifier
+        while 0 < i < len(new) and wcwidth(new[i]) == 0:
+            i -= 1
+        return i
+
+    def draw(self, lines: list[str]):
+        """Write one frame, emitting only the changed parts."""
+        started = time.perf_counter()
+        height = shutil.get_terminal_size().lines
+        old = self.lines
+        if not old or len(lines) >= height:
+            # First frame, or too tall to address: plain full repaint
+            old = []
+            buf = ["\x1b[H\x1b[2J"]
+        else:
+            buf = []
+
+        for row, line in enumerate(lines, start=1):
+            before = old[row - 1] if row <= len(old) else None
+            if line == before:
+                continue
+            start = 0 if before is None else self._changed_from(before, line)
+            col = wcswidth(line[:start]) + 1 if start else 1
+            buf.append(f"\x1b[{row};{col}H{line[start:]}\x1b[K")
+
+        # Park the cursor under the frame and clear stale prompt text
+        buf.append(f"\x1b[{len(lines) + 1};1H\x1b[J")
+
+        data = "".join(buf)
+        self.out.write(data)
+        self.out.flush()
+        self.lines = list(lines)
+        self.last_frame_bytes = len(data)
+        self.last_frame_time = time.perf_counter() - started
+
+
+@lru_cache(maxsize=None)
+def placements(size: int, length: int) -> tuple[int, ...]:
+    """Bitmask of every legal placement of one ship (both orientations)."""
+    if length > size:
+        return ()
+    row = (1 << length) - 1
+    column = sum(1 << (i * size) for i in range(length))
+    masks = []
+    for r in range(size):
+        for c in range(size - length + 1):
+            masks.append(row << (r * size + c))
+    for r in range(size - length + 1):
+        for c in range(size):
+            masks.append(column << (r * size + c))
+    return tuple(masks)
+
+
+def fleet_lengths(num_ships: int) -> tuple[int, ...]:
+    """Ship lengths of a fleet of num_ships (longest first)."""
+    if not 1 <= num_ships <= len(FLEET):
+        raise ValueError(f"num_ships must be 1–{len(FLEET)}")
+    return tuple(length for _, length in FLEET[:num_ships])
+
+
+def place_fleet(size, lengths, rng) -> tuple[int, ...]:
+    """Random non-overlapping placement; one bitmask per ship.
+
+    Each ship takes a few random picks from the precomputed placement
+    index, then falls back to the placements that still fit. A dead end
+    (no placement left) starts the fleet again, at most
+    PLACEMENT_RESTARTS times, then lays one ship per line, which always
+    fits: the cost is bounded, with no search.
+    """
+    for _ in range(PLACEMENT_RESTARTS):
+        fleet = _try_fleet(size, lengths, rng)
+        if fleet is not None:
+            return fleet
+    return _line_fleet(size, lengths, rng)
+
+
+def _try_fleet(size, lengths, rng):
+    """One pass of place_fleet -> ship masks, or None at a dead end."""
+    fleet = []
+    occupied = 0
+    for length in lengths:
+        options = placements(size, length)
+        for _ in range(PLACEMENT_TRIES):
+            mask = options[rng.randrange(len(options))]
+            if not mask & occupied:
+                break
+        else:
+            fits = [m for m in options if not m & occupied]
+            if not fits:
+                return None
+            mask = fits[rng.randrange(len(fits))]
+        fleet.append(mask)
+        occupied |= mask
+    return tuple(fleet)
+
+
+def _line_fleet(size, lengths, rng) -> tuple[int, ...]:
+    """Every ship on its own random row (or column), at a random offset."""
+    if len(lengths) > size or max(lengths, default=0) > size:
+        raise ValueError(f"fleet {lengths} does not fit a {size}x{size} "
+                         f"grid")
+    vertical = rng.random() < 0.5
+    lines = rng.sample(range(size), len(lengths))
+    fleet = []
+    for line, length in zip(lines, lengths):
+        offset = rng.randrange(size - length + 1)
+        start = offset * size + line if vertical else line * size + offset
+        fleet.append(ship_mask(start, length, vertical, size))
+    return tuple(fleet)
+
+
+def describe_ship(mask: int, size: int) -> tuple[int, int, bool]:
+    """(start cell, length, vertical) of one ship bitmask."""
+    start = (mask & -mask).bit_length() - 1
+    length = mask.bit_count()
+    return start, length, length > 1 and bool(mask >> (start + size) & 1)
+
+
+def ship_mask(start: int, length: int, vertical: bool, size: int) -> int:
+    """Inverse of describe_ship()."""
+    if vertical:  # one bit every `size` bits, in closed form
+        return ((1 << length * size) - 1) // ((1 << size) - 1) << start
+    return ((1 << length) - 1) << start
+
+
+class BitBoard:
+    """One side's board packed into integer bitmasks (bit = r * size + c).
+
+    fleet holds one bitmask per ship and remaining counts unhit cells
+    per ship, so a hit updates the sunk state in O(fleet size).
+    """
+
+    __slots__ = ("size", "fleet", "ships", "hits", "misses", "remaining",
+                 "sunk", "ships_afloat")
+
+    def __init__(self, size, fleet=(), hits=0, misses=0):
+        self.size = size
+        self.fleet = tuple(fleet)
+        self.hits = hits
+        self.misses = misses
+        self.ships = 0
+        self.remaining = []
+        self.sunk = 0  # cells of sunk ships
+        for mask in self.fleet:
+            self.ships |= mask
+            left = (mask & ~hits).bit_count()
+            self.remaining.append(left)
+            if not left:
+                self.sunk |= mask
+        self.ships_afloat = sum(1 for left in self.remaining if left)
+
+    def bit(self, r, c) -> int:
+        """Bitmask of a single cell."""
+        return 1 << (r * self.size + c)
+
+    @property
+    def tried(self) -> int:
+        """Cells already fired at (hits and misses)."""
+        return self.hits | self.misses
+
+    @property
+    def afloat(self) -> int:
+        """Ship cells not yet hit."""
+        return self.ships & ~self.hits
+
+    def cells_left(self) -> int:
+        """Number of ship cells still afloat."""
+        return self.afloat.bit_count()
+
+    def lengths_left(self) -> tuple:
+        """Lengths of the ships still afloat (public information)."""
+        return tuple(mask.bit_count()
+                     for mask, left in zip(self.fleet, self.remaining)
+                     if left)
+
+    def all_sunk(self) -> bool:
+        """True once every ship cell has been hit."""
+        return not self.ships_afloat
+
+    def ship_index(self, r, c):
+        """Index of the ship covering (r, c), or None (water)."""
+        b = 1 << (r * self.size + c)
+        if self.ships & b:
+            for k, mask in enumerate(self.fleet):
+                if mask & b:
+                    return k
+        return None
+
+    def fire(self, r, c) -> bool:
+        """Resolve a shot at an untried cell; True on a hit."""
+        k = self.ship_index(r, c)
+        if k is None:
+            self.misses |= self.bit(r, c)
+            return False
+        self.hits |= self.bit(r, c)
+        self.remaining[k] -= 1
+        if not self.remaining[k]:
+            self.sunk |= self.fleet[k]
+            self.ships_afloat -= 1
+        return True
+
+    def fire_many(self, mask) -> int:
+        """Resolve a salvo of untried cells in one pass -> mask of hits.
+
+        Hits and misses are bitmask ops; the sunk state is updated once
+        per ship rather than once per shot.
+        """
+        hit = mask & self.ships
+        self.misses |= mask ^ hit
+        if not hit:
+            return 0
+        self.hits |= hit
+        for k, ship in enumerate(self.fleet):
+            n = (ship & hit).bit_count()
+            if n:
+                self.remaining[k] -= n
+                if not self.remaining[k]:
+                    self.sunk |= ship
+                    self.ships_afloat -= 1
+        return hit
+
+    def sunk_ship(self, r, c):
+        """Index of the ship at (r, c) if it has been sunk, else None."""
+        k = self.ship_index(r, c)
+        if k is None or self.remaining[k]:
+            return None
+        return k
+
+    def symbol(self, r, c, reveal=False) -> str:
+        """Emoji for one cell (reveal=True shows unhit ships)."""
+        b = self.bit(r, c)
+        if self.hits & b:
+            return HIT
+        if self.misses & b:
+            return MISS
+        if reveal and self.ships & b:
+            return SHIP_CHAR
+        return WATER
+
+
+class GridRowView:
+    """Read-only row of emoji symbols, computed cell by cell on access."""
+
+    __slots__ = ("board", "r", "reveal")
+
+    def __init__(self, board, r, reveal):
+        self.board = board
+        self.r = r
+        self.reveal = reveal
+
+    def __len__(self):
+        return self.board.size
+
+    def __getitem__(self, c):
+        if isinstance(c, slice):
+            return [self[i] for i in range(*c.indices(self.board.size))]
+        if c < 0:
+            c += self.board.size
+        if not 0 <= c < self.board.size:
+            raise IndexError("column out of range")
+        return self.board.symbol(self.r, c, self.reveal)
+
+    def __iter__(self):
+        for c in range(self.board.size):
+            yield self.board.symbol(self.r, c, self.reveal)
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+
+class GridView:
+    """Read-only emoji grid over a BitBoard (materialized lazily)."""
+
+    __slots__ = ("board", "reveal", "renderer")
+
+    def __init__(self, board, reveal=False):
+        self.board = board
+        self.reveal = reveal
+        self.renderer = None
+
+    def render(self, title_text) -> list[str]:
+        """Framed board lines via a cached, incremental BoardRenderer."""
+        renderer = self.renderer
+        if renderer is None or renderer.title != title_text:
+            renderer = BoardRenderer(title_text, self.board.size, self.reveal)
+            self.renderer = renderer
+        return renderer.render(self.board)
+
+    def __len__(self):
+        return self.board.size
+
+    def __getitem__(self, r):
+        if isinstance(r, slice):
+            return [self[i] for i in range(*r.indices(self.board.size))]
+        if r < 0:
+            r += self.board.size
+        if not 0 <= r < self.board.size:
+            raise IndexError("row out of range")
+        return GridRowView(self.board, r, self.reveal)
+
+    def __iter__(self):
+        for r in range(self.board.size):
+            yield GridRowView(self.board, r, self.reveal)
+
+    def to_lists(self) -> list[list[str]]:
+        """Materialize the full emoji grid."""
+        return [list(row) for row in self]
+
+
+class CellSetView(Set):
+    """Read-only set of (row, col) tuples backed by a bitmask."""
+
+    __slots__ = ("board", "kind")
+
+    def __init__(self, board, kind):
+        self.board = board
+        self.kind = kind  # "afloat" or "tried"
+
+    def _mask(self) -> int:
+        return getattr(self.board, self.kind)
+
+    def __contains__(self, cell):
+        r, c = cell
+        size = self.board.size
+        return 0 <= r < size and 0 <= c < size and bool(
+            self._mask() & self.board.bit(r, c))
+
+    def __len__(self):
+        return self._mask().bit_count()
+
+    def __iter__(self):
+        mask = self._mask()
+        size = self.board.size
+        while mask:
+            low = mask & -mask
+            i = low.bit_length() - 1
+            yield divmod(i, size)
+            mask ^= low
+
+    def __repr__(self):
+        return f"{{{', '.join(map(repr, self))}}}"
+
+
+class _LazyRandom:
+    """random.Random(seed), seeded on first use.
+
+    Seeding costs microseconds and most enemy turns draw nothing (the
+    random shooter pops a pool shuffled once).
+    """
+
+    __slots__ = ("_seed", "_rng")
+
+    def __init__(self, seed):
+        self._seed = seed
+        self._rng = None
+
+    def __getattr__(self, attr):
+        if self._rng is None:
+            self._rng = random.Random(self._seed)
+        return getattr(self._rng, attr)
+
+
+class BattleshipGame:
+    """Main Battleship game logic (turns, ships, status).
+
+    Both fleets are stored as BitBoards; enemy_view, player_board,
+    enemy_ships, player_ships and enemy_tried are read-only views.
+    """
+
+    __slots__ = (
+        "size", "num_ships", "enemy_fleet", "player_fleet",
+        "enemy_view", "player_board", "enemy_ships", "player_ships",
+        "enemy_tried", "total_player_shots", "total_enemy_shots",
+        "player_msg", "enemy_msg", "title_lines", "seed", "difficulty",
+        "salvo", "enemy_shooter", "last_player_salvo", "last_enemy_salvo",
+        "version", "moves", "started_at",
+    )
+
+    def __init__(self, size=8, num_ships=3, title_lines=None, seed=None,
+                 difficulty="easy", salvo=False):
+        if difficulty not in DIFFICULTIES:
+            raise ValueError(f"difficulty must be one of {DIFFICULTIES}")
         self.size = size
         self.num_ships = num_ships
-        self.enemy_view = [[WATER] * size for _ in range(size)]
-        self.player_board = [[WATER] * size for _ in range(size)]
-        self.enemy_ships = self._place_ships()
-        self.player_ships = self._place_ships(reveal=True)
-        self.enemy_tried = set()
+        self.difficulty = difficulty
+        # Salvo variant: one shot per own ship afloat, every turn
+        self.salvo = salvo
+        # Per-game seed (ship placement here, enemy shots via rng)
+        self.seed = random.getrandbits(32) if seed is None else seed
+        # Bumped on every state change (HTTP ETags, the rng stream)
+        self.version = 0
+        self.enemy_shooter = None
+        placement = random.Random(self.seed)
+        self.enemy_fleet = BitBoard(size, self._place_ships(placement))
+        self.player_fleet = BitBoard(size, self._place_ships(placement))
+        self._make_views()
         self.total_player_shots = 0
         self.total_enemy_shots = 0
         self.player_msg = ""
         self.enemy_msg = ""
+        # Shots resolved in the last turn per side: ((row, col, hit), ...)
+        self.last_player_salvo = ()
+        self.last_enemy_salvo = ()
+        # Append-only log of every shot (2 bytes each, see encode_move)
+        self.moves = bytearray()
+        # Wall-clock start (Unix time), for the game's duration
+        self.started_at = time.time()
         self.title_lines = title_lines or []
 
-    def _place_ships(self, reveal=False):
-        """Randomly place ships (reveal=True shows on player board)."""
-        ships = set()
-        while len(ships) < self.num_ships:
-            r = random.randint(0, self.size - 1)
-            c = random.randint(0, self.size - 1)
-            ships.add((r, c))
-        if reveal:
-            for r, c in ships:
-                self.player_board[r][c] = SHIP_CHAR
-        return ships
+    # ----- Compact binary state -----
+    def to_bytes(self, moves=True) -> bytes:
+        """Pack the game state (boards as bitmasks) into a few bytes.
+
+        moves=False leaves out the move log (used for replay snapshots).
+        """
+        nbytes = (self.size * self.size + 7) // 8
+        parts = [_STATE_HEADER.pack(
+            STATE_FORMAT, self.size, self.num_ships,
+            DIFFICULTIES.index(self.difficulty)
+            | (_SALVO if self.salvo else 0), self.seed, self.version,
+            self.total_player_shots, self.total_enemy_shots,
+            self.started_at,
+        )]
+        for board in (self.enemy_fleet, self.player_fleet):
+            for mask in board.fleet:
+                start, length, vertical = describe_ship(mask, self.size)
+                parts.append(_SHIP.pack(
+                    start, length | (_VERTICAL if vertical else 0)))
+            for mask in (board.hits, board.misses):
+                parts.append(mask.to_bytes(nbytes, "little"))
+        for text in (self.player_msg, self.enemy_msg):
+            raw = text.encode()
+            parts.append(_TEXT_LEN.pack(len(raw)) + raw)
+        log = self.moves if moves else b""
+        parts.append(_MOVES_LEN.pack(len(log)) + log)
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "BattleshipGame":
+        """Rebuild a game packed by to_bytes()."""
+        if data[0] != STATE_FORMAT:  # checked first: headers differ
+            raise ValueError(f"unsupported game state format {data[0]}")
+        (_, size, num_ships, level, seed, version, player_shots,
+         enemy_shots, started_at) = _STATE_HEADER.unpack_from(data)
+
+        nbytes = (size * size + 7) // 8
+        offset = _STATE_HEADER.size
+        boards = []
+        for _ in range(2):
+            fleet = []
+            for _ in range(num_ships):
+                start, flags = _SHIP.unpack_from(data, offset)
+                offset += _SHIP.size
+                fleet.append(ship_mask(start, flags & ~_VERTICAL,
+                                       bool(flags & _VERTICAL), size))
+            masks = []
+            for _ in range(2):
+                masks.append(int.from_bytes(data[offset:offset + nbytes],
+                                            "little"))
+                offset += nbytes
+            boards.append(BitBoard(size, fleet, *masks))
+        texts = []
+        for _ in range(2):
+            (length,) = _TEXT_LEN.unpack_from(data, offset)
+            offset += _TEXT_LEN.size
+            texts.append(data[offset:offset + length].decode())
+            offset += length
+        (length,) = _MOVES_LEN.unpack_from(data, offset)
+        offset += _MOVES_LEN.size
+        moves = bytearray(data[offset:offset + length])
+
+        game = cls.__new__(cls)
+        game.size = size
+        game.num_ships = num_ships
+        game.difficulty = DIFFICULTIES[level & ~_SALVO]
+        game.salvo = bool(level & _SALVO)
+        game.seed = seed
+        # The enemy shooter (and its shot pool) is rebuilt lazily
+        game.enemy_shooter = None
+        game.enemy_fleet, game.player_fleet = boards
+        game._make_views()
+        game.total_player_shots = player_shots
+        game.total_enemy_shots = enemy_shots
+        game.player_msg, game.enemy_msg = texts
+        game.last_player_salvo = ()
+        game.last_enemy_salvo = ()
+        game.version = version
+        game.moves = moves
+        game.started_at = started_at
+        game.title_lines = []
+        return game
+
+    # ----- Last shots -----
+    @property
+    def last_player_shot(self):
+        """The player's last resolved shot (row, col, hit), or None."""
+        return self.last_player_salvo[-1] if self.last_player_salvo \
+            else None
+
+    @last_player_shot.setter
+    def last_player_shot(self, shot):
+        self.last_player_salvo = () if shot is None else (shot,)
+
+    @property
+    def last_enemy_shot(self):
+        """The enemy's last resolved shot (row, col, hit), or None."""
+        return self.last_enemy_salvo[-1] if self.last_enemy_salvo else None
+
+    @last_enemy_shot.setter
+    def last_enemy_shot(self, shot):
+        self.last_enemy_salvo = () if shot is None else (shot,)
+
+    # ----- Move log -----
+    def _record_move(self, enemy, r, c, hit):
+        """Append one shot to the move log."""
+        self.moves += encode_move(enemy, r * self.size + c, hit) \
+            .to_bytes(2, "little")
+
+    def apply_move(self, code: int):
+        """Replay one logged shot (no RNG, no messages).
+
+        Raises ValueError if the logged result does not match the board,
+        i.e. the log does not belong to this game.
+        """
+        enemy, cell, hit = decode_move(code)
+        r, c = divmod(cell, self.size)
+        board = self.player_fleet if enemy else self.enemy_fleet
+        if board.tried & board.bit(r, c) or board.fire(r, c) != hit:
+            raise ValueError(f"move {code:#06x} does not fit this game")
+        if enemy:
+            self.total_enemy_shots += 1
+            self.last_enemy_shot = (r, c, hit)
+        else:
+            self.total_player_shots += 1
+            self.last_player_shot = (r, c, hit)
+        self.version += 1
+        self._record_move(enemy, r, c, hit)
+
+    def _make_views(self):
+        """Attach the read-only views used by renderers and templates."""
+        self.enemy_view = GridView(self.enemy_fleet)
+        self.player_board = GridView(self.player_fleet, reveal=True)
+        self.enemy_ships = CellSetView(self.enemy_fleet, "afloat")
+        self.player_ships = CellSetView(self.player_fleet, "afloat")
+        self.enemy_tried = CellSetView(self.player_fleet, "tried")
+
+    @property
+    def rng(self):
+        """Random stream of the current state, made from (seed, version).
+
+        Not kept on the game (a Random is ~2.5 KB): every version gets
+        its own stream, so a reloaded game makes the same choices.
+        """
+        return _LazyRandom((self.seed << 32) ^ self.version)
+
+    def _place_ships(self, rng=None):
+        """Randomly place the fleet; returns one bitmask per ship."""
+        return place_fleet(self.size, fleet_lengths(self.num_ships),
+                           rng or self.rng)
+
+    def _banner_lines(self) -> list[str]:
+        """ASCII 'BATTLESHIPS' banner lines, centered above the boards."""
+        total_width = board_width(self.size) * 2 + len(GAP_BETWEEN_BOARDS)
+        lines = [line.center(total_width) for line in self.title_lines]
+        return lines + [""]  # one blank line after banner
 
     def _print_ascii_banner(self):
         """Print the ASCII 'BATTLESHIPS' banner above boards."""
-        board_width = 3 + (self.size * CELL_VISUAL)
-        total_width = (board_width * 2) + len(GAP_BETWEEN_BOARDS)
-        for line in self.title_lines:
-            print(line.center(total_width))
-        print()  # one blank line after banner
+        for line in self._banner_lines():
+            print(line)
+
+    def _frame_lines(self, current_turn="Player") -> list[str]:
+        """Banner, boards and status bar as one frame."""
+        return (
+            self._banner_lines()
+            + board_lines(self.enemy_view, self.player_board)
+            + self._status_lines(current_turn)
+        )
 
-    def play(self):
+    def play(self, screen=None):
         """Main loop: player turn, then enemy turn."""
+        screen = screen or Screen()
         while self.player_ships and self.enemy_ships:
-            clear_screen()
+            # Banner, boards and status bar for player turn
+            screen.draw(self._frame_lines(current_turn="Player"))
 
-            # Show banner and boards
-            self._print_ascii_banner()
-            display_boards(self.enemy_view, self.player_board)
-
-            # Status bar for player turn
-            self._show_status(current_turn="Player")
-
-            # Player turn
-            self._player_turn()
+            # Player turn (asked again after an invalid guess)
+            if not self._player_turn():
+                continue
             if not self.enemy_ships:
                 break
 
             # Enemy turn
             self.enemy_msg = self._enemy_turn()
 
-            clear_screen()
-
-            # Show banner and boards again
-            self._print_ascii_banner()
-            display_boards(self.enemy_view, self.player_board)
-
-            # Status bar for enemy turn
-            self._show_status(current_turn="Enemy")
+            # Redraw with status bar for enemy turn
+            screen.draw(self._frame_lines(current_turn="Enemy"))
 
         # End screen
         self._end_screen()
 
-    def _player_turn(self):
-        """Ask player for input and resolve strike."""
-        guess = input(
-            Fore.YELLOW + "\nEnter position (e.g., A1) or Q to quit: "
-            + Style.RESET_ALL
-        ).strip().upper()
+    def _player_turn(self) -> bool:
+        """Ask player for input and resolve strike; False if invalid."""
+        if self.salvo:
+            prompt = (f"\nEnter {self.salvo_size()} positions "
+                      f"(e.g., A1 B2) or Q to quit: ")
+        else:
+            prompt = "\nEnter position (e.g., A1) or Q to quit: "
+        guess = input(Fore.YELLOW + prompt + Style.RESET_ALL).strip().upper()
 
         if guess == "Q":
             clear_screen()
             print("👋 Game ended by user.")
             exit()
 
-        if len(guess) < 2:
-            self.player_msg = "❌ Format must be Letter+Number (e.g., A1)."
-            return
-
-        row_letter, digits = guess[0], guess[1:]
-        if not digits.isdigit():
-            self.player_msg = "❌ Column must be a number (e.g., A1)."
-            return
-
-        r = ord(row_letter) - 65
-        c = int(digits) - 1
-        if not (0 <= r < self.size and 0 <= c < self.size):
+        self.version += 1
+        self.last_player_shot = None
+        cells = self._aim(guess)
+        if cells is None:
+            return False
+        if self.salvo:
+            self.player_msg = self._salvo_msg(
+                "Salvo", self._fire_salvo(False, cells), self.enemy_fleet,
+                "Enemy")
+            return True
+        (r, c), = cells
+        pos = position_name(r, c)
+
+        if self._fire_at_enemy(r, c):
             self.player_msg = (
-                f"❌ Coordinates must be A–{chr(64 + self.size)} "
-                f"+ 1–{self.size}."
-            )
-            return
-
-        if self.enemy_view[r][c] in (MISS, HIT):
-            self.player_msg = "⚠️ Already tried that sector."
-            return
-
-        self.total_player_shots += 1
-        if (r, c) in self.enemy_ships:
-            self.enemy_view[r][c] = HIT
-            self.enemy_ships.remove((r, c))
-            self.player_msg = (
-                f"💥 Direct Hit! Enemy ship damaged at {row_letter}{c+1}!"
+                f"💥 Direct Hit! Enemy ship damaged at {pos}!"
+                + self._sunk_note(self.enemy_fleet, r, c, "Enemy")
             )
         else:
-            self.enemy_view[r][c] = MISS
             self.player_msg = (
-                f"💦 Torpedo missed at {row_letter}{c+1}, enemy evaded!"
+                f"💦 Torpedo missed at {pos}, enemy evaded!"
             )
+        return True
+
+    def salvo_size(self, enemy=False) -> int:
+        """Shots per turn: 1, or in salvo mode one per own ship afloat."""
+        if not self.salvo:
+            return 1
+        own = self.enemy_fleet if enemy else self.player_fleet
+        return own.ships_afloat
+
+    def _aim(self, guess):
+        """Parse and check the player's guess -> [(r, c), ...].
+
+        One cell, or up to salvo_size() cells in salvo mode. Returns None
+        with player_msg set when the guess is not a legal shot.
+        """
+        board = self.enemy_fleet
+        try:
+            if self.salvo:
+                cells = parse_salvo(guess, self.size)
+            else:
+                cells = [parse_position(guess, self.size)]
+        except ValueError as err:
+            self.player_msg = str(err)
+            return None
+
+        allowed = self.salvo_size()
+        if len(cells) > allowed:
+            self.player_msg = (f"❌ Salvo of {len(cells)} shots; you have "
+                               f"{allowed} (one per ship afloat).")
+            return None
+        tried = [position_name(r, c) for r, c in cells
+                 if board.tried & board.bit(r, c)]
+        if tried:
+            self.player_msg = "⚠️ Already tried that sector." \
+                if len(cells) == 1 \
+                else f"⚠️ Already tried {', '.join(tried)}."
+            return None
+        return cells
+
+    def _fire_salvo(self, enemy, cells) -> tuple:
+        """Resolve several untried cells in one batch -> shots fired."""
+        board = self.player_fleet if enemy else self.enemy_fleet
+        mask = 0
+        for r, c in cells:
+            mask |= board.bit(r, c)
+        hit = board.fire_many(mask)
+        salvo = tuple((r, c, bool(hit & board.bit(r, c))) for r, c in cells)
+        for shot in salvo:
+            self._record_move(enemy, *shot)
+        if enemy:
+            self.total_enemy_shots += len(salvo)
+            self.last_enemy_salvo = salvo
+        else:
+            self.total_player_shots += len(salvo)
+            self.last_player_salvo = salvo
+        return salvo
+
+    @staticmethod
+    def _salvo_msg(title, salvo, board, owner) -> str:
+        """'💥 Salvo: 2 hits (B3, C4), 1 miss. Enemy Cruiser sunk!'"""
+        hits = [position_name(r, c) for r, c, hit in salvo if hit]
+        misses = len(salvo) - len(hits)
+        text = f"{title}: {len(hits)} hit{'' if len(hits) == 1 else 's'}"
+        if hits:
+            text += f" ({', '.join(hits)})"
+        text += f", {misses} miss{'' if misses == 1 else 'es'}."
+        sunk = {board.sunk_ship(r, c) for r, c, hit in salvo if hit}
+        for k in sorted(sunk - {None}):
+            text += f" {owner} {FLEET[k][0]} sunk!"
+        return ("💥 " if hits else "💦 ") + text
+
+    def _fire_at_enemy(self, r, c) -> bool:
+        """Resolve the player's shot at an untried enemy cell."""
+        self.total_player_shots += 1
+        hit = self.enemy_fleet.fire(r, c)
+        self.last_player_shot = (r, c, hit)
+        self._record_move(False, r, c, hit)
+        return hit
+
+    @staticmethod
+    def _sunk_note(board, r, c, owner) -> str:
+        """' Enemy Cruiser sunk!' when the hit at (r, c) sank a ship."""
+        k = board.sunk_ship(r, c)
+        return "" if k is None else f" {owner} {FLEET[k][0]} sunk!"
+
+    def _enemy_shooter(self):
+        """The enemy's shooter strategy, built on first use."""
+        if self.enemy_shooter is None:
+            from strategies import make_shooter
+            self.enemy_shooter = make_shooter(
+                ENEMY_SHOOTERS[self.difficulty], self.size, self.seed)
+        return self.enemy_shooter
+
+    def _enemy_target(self):
+        """Pick the enemy's next untried cell -> (r, c), or None."""
+        return self._enemy_shooter().choose(self.player_fleet, self.rng)
+
+    def _enemy_salvo(self):
+        """Enemy AI fires one salvo at the player fleet (salvo mode)."""
+        cells = self._enemy_shooter().choose_salvo(
+            self.player_fleet, self.rng, self.salvo_size(enemy=True))
+        if not cells:
+            return "⚠️ Enemy has no sectors left to fire at."
+        return self._salvo_msg("Enemy salvo",
+                               self._fire_salvo(True, cells),
+                               self.player_fleet, "Your")
 
     def _enemy_turn(self):
-        """Enemy AI randomly fires at player fleet."""
-        while True:
-            r = random.randint(0, self.size - 1)
-            c = random.randint(0, self.size - 1)
-            if (r, c) not in self.enemy_tried:
-                self.enemy_tried.add((r, c))
-                break
+        """Enemy AI fires at player fleet (random or heatmap-guided)."""
+        self.version += 1
+        if self.salvo:
+            return self._enemy_salvo()
+        target = self._enemy_target()
+        if target is None:
+            return "⚠️ Enemy has no sectors left to fire at."
+        r, c = target
         self.total_enemy_shots += 1
-        pos = f"{chr(65+r)}{c+1}"
-        if (r, c) in self.player_ships:
-            self.player_board[r][c] = HIT
-            self.player_ships.remove((r, c))
-            return f"💥 Enemy fires at {pos} — Direct Hit!"
-        self.player_board[r][c] = MISS
+        pos = position_name(r, c)
+        hit = self.player_fleet.fire(r, c)
+        self.last_enemy_shot = (r, c, hit)
+        self._record_move(True, r, c, hit)
+        if hit:
+            return f"💥 Enemy fires at {pos} — Direct Hit!" + \
+                self._sunk_note(self.player_fleet, r, c, "Your")
         return f"💦 Enemy fires at {pos} — Torpedo missed, you evaded!"
 
     def enemy_turn(self):
@@ -402,58 +1322,81 @@ class BattleshipGame:
         Web-compatible enemy turn wrapper.
         Flask route se call hota hai.
         """
-        if not self.player_ships:
+        self.last_enemy_shot = None
+        if self.winner() is not None:
             return
 
         self.enemy_msg = self._enemy_turn()
 
+    def player_shot(self, r, c) -> bool:
+        """Resolve a validated shot at an untried enemy cell (no messages).
+
+        For headless callers (protocol mode); True on a hit.
+        """
+        self.version += 1
+        self.player_msg = ""
+        return self._fire_at_enemy(r, c)
+
     def player_turn(self, guess: str):
         """
         Web-compatible player turn.
-        Accepts a position like 'A1' instead of using input().
+        Accepts a position like 'A1' instead of using input(), or in
+        salvo mode several positions like 'A1 B2 C3'. Returns False when
+        no shot was fired (invalid guess, or the game is already over).
         """
+        self.version += 1
         self.player_msg = ""
+        self.last_player_shot = None
+        if self.winner() is not None:
+            self.player_msg = "⚠️ The battle is over."
+            return False
+
+        cells = self._aim(guess)
+        if cells is None:
+            return False
+        if self.salvo:
+            self.player_msg = self._salvo_msg(
+                "Salvo", self._fire_salvo(False, cells), self.enemy_fleet,
+                "Enemy")
+            return True
+        (r, c), = cells
+        pos = position_name(r, c)
+
+        if self._fire_at_enemy(r, c):
+            self.player_msg = f"💥 Hit at {pos}!" + self._sunk_note(
+                self.enemy_fleet, r, c, "Enemy")
+        else:
+            self.player_msg = f"💦 Miss at {pos}."
+        return True
 
-        guess = (guess or "").strip().upper()
-
-        if len(guess) < 2:
-            self.player_msg = "❌ Format must be Letter+Number (e.g., A1)."
-            return
-
-        row_letter, digits = guess[0], guess[1:]
-
-        if not digits.isdigit():
-            self.player_msg = "❌ Column must be a number (e.g., A1)."
-            return
-
-        r = ord(row_letter) - 65
-        c = int(digits) - 1
-
-        if not (0 <= r < self.size and 0 <= c < self.size):
-            self.player_msg = (
-                f"❌ Coordinates must be A–{chr(64 + self.size)} "
-                f"+ 1–{self.size}."
-            )
-            return
-
-        if self.enemy_view[r][c] in (MISS, HIT):
-            self.player_msg = "⚠️ Already tried that sector."
-            return
-
-        self.total_player_shots += 1
+    def hint(self):
+        """Posterior ship probability of every enemy cell (solver.py).
 
-        if (r, c) in self.enemy_ships:
-            self.enemy_view[r][c] = HIT
-            self.enemy_ships.remove((r, c))
-            self.player_msg = f"💥 Hit at {row_letter}{c + 1}!"
-        else:
-            self.enemy_view[r][c] = MISS
-            self.player_msg = f"💦 Miss at {row_letter}{c + 1}."
+        Uses only what the player can see: hits, misses, sunk ships and
+        the lengths of the ships still afloat.
+        """
+        from solver import posterior
+        board = self.enemy_fleet
+        return posterior(self.size, board.hits, board.misses, board.sunk,
+                         board.lengths_left())
+
+    def winner(self):
+        """'player' or 'enemy' once a fleet is destroyed, else None."""
+        if self.enemy_fleet.all_sunk():
+            return "player"
+        if self.player_fleet.all_sunk():
+            return "enemy"
+        return None
 
     def _show_status(self, current_turn="Player"):
         """Show compact status bar and last turn results with colors."""
-        enemy_left = len(self.enemy_ships)
-        player_left = len(self.player_ships)
+        for line in self._status_lines(current_turn):
+            print(line)
+
+    def _status_lines(self, current_turn="Player") -> list[str]:
+        """Compact status bar and last turn results, one string per line."""
+        enemy_left = self.enemy_fleet.ships_afloat
+        player_left = self.player_fleet.ships_afloat
 
         player_bar = (
             " ".join([SHIP_CHAR] * player_left)
@@ -472,29 +1415,28 @@ class BattleshipGame:
             turn_text = Fore.MAGENTA + "👾 Turn: Enemy" + Style.RESET_ALL
 
         # Compact status bar
-        print(
+        lines = [
             f"{turn_text} | "
             f"Enemy ships: {enemy_left} {enemy_bar} | "
-            f"Your ships: {player_left} {player_bar}"
-        )
-        print(
+            f"Your ships: {player_left} {player_bar}",
             f"Shots — Player: {self.total_player_shots} | "
-            f"Enemy: {self.total_enemy_shots}"
-        )
-        print()
+            f"Enemy: {self.total_enemy_shots}",
+            "",
+        ]
 
         # Flavor messages
         if self.player_msg:
-            print(Fore.CYAN + self.player_msg + Style.RESET_ALL)
+            lines.append(Fore.CYAN + self.player_msg + Style.RESET_ALL)
         if self.enemy_msg:
-            print(Fore.MAGENTA + self.enemy_msg + Style.RESET_ALL)
+            lines.append(Fore.MAGENTA + self.enemy_msg + Style.RESET_ALL)
 
         # Legend footer
         legend = (
             f"{HIT}=Hit   {MISS}=Miss   "
             f"{WATER}=Water   {SHIP_CHAR}=Player"
         )
-        print("\n" + Fore.YELLOW + "Legend: " + Style.RESET_ALL + legend)
+        lines += ["", Fore.YELLOW + "Legend: " + Style.RESET_ALL + legend]
+        return lines
 
     def _end_screen(self):
         """Final victory or defeat screen."""
@@ -507,6 +1449,32 @@ class BattleshipGame:
 
 # ========= 3) Run Game =========
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Battleships (terminal)")
+    parser.add_argument(
+        "--large", action="store_true",
+        help=f"large-board mode (grids up to {LARGE_MAX_SIZE}x"
+             f"{LARGE_MAX_SIZE})",
+    )
+    parser.add_argument(
+        "--salvo", action="store_true",
+        help="salvo rules: one shot per ship afloat every turn",
+    )
+    parser.add_argument(
+        "--name",
+        help="record the result on the leaderboard under this name "
+             "(see leaderboard.py)",
+    )
+    parser.add_argument(
+        "--protocol", action="store_true",
+        help="headless line protocol on stdin/stdout for bots "
+             "(see protocol.py)",
+    )
+    args = parser.parse_args()
+    if args.protocol:
+        from protocol import serve
+        sys.exit(serve())
+    init_colors()
+
     title_lines = [
         ("██████   █████  ████████ ████████ ██      ███████ ███████ "
          "██   ██ ██ ██████  ███████"),
@@ -531,9 +1499,13 @@ if __name__ == "__main__":
     ws = WelcomeScreen(title_lines, ship_art, width=100)
     ws.show_title()
     ws.show_ship()
-    size, ships = ws.get_inputs()
+    size, ships = ws.get_inputs(large=args.large)
     ws.mission_briefing(size, ships)
 
     # Start the game
-    game = BattleshipGame(size=size, num_ships=ships, title_lines=title_lines)
+    game = BattleshipGame(size=size, num_ships=ships, title_lines=title_lines,
+                          salvo=args.salvo)
     game.play()
+    if args.name:
+        from leaderboard import Leaderboard, default_path
+        Leaderboard(default_path()).record(game, args.name)
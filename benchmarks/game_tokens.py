@@ -0,0 +1,69 @@
+"""Size and cost of stateless game tokens (BATTLESHIP_TOKENS=1).
+
+Plays whole games the way the token store serves them: every turn
+decodes the token, plays the player's shot and the enemy's reply, and
+encodes a fresh token. Reported per board size: the largest token seen
+(a cookie must stay under 4 KB) and the median microseconds of each step.
+
+    python -m benchmarks.game_tokens --games 20
+"""
+import argparse
+import random
+import statistics
+import time
+
+from battleship import MAX_SIZE, MIN_SIZE, BattleshipGame, position_name
+from tokens import TokenCodec
+
+
+def play(codec, size, ships, salvo, rng, times):
+    """One game through the codec; returns the largest token (chars)."""
+    game = BattleshipGame(size=size, num_ships=ships, difficulty="hard",
+                          salvo=salvo, seed=rng.getrandbits(32))
+    token = codec.encode(game.to_bytes(), b"game")
+    largest = len(token)
+    cells = [position_name(r, c) for r in range(size) for c in range(size)]
+    rng.shuffle(cells)
+    while game.winner() is None:
+        started = time.perf_counter()
+        game = BattleshipGame.from_bytes(codec.decode(token, b"game"))
+        decoded = time.perf_counter()
+        volley = [cells.pop() for _ in range(min(game.salvo_size(),
+                                                 len(cells)))]
+        game.player_turn(" ".join(volley))
+        if game.winner() is None:
+            game.enemy_turn()
+        played = time.perf_counter()
+        token = codec.encode(game.to_bytes(), b"game")
+        encoded = time.perf_counter()
+        times["decode"].append(decoded - started)
+        times["turn"].append(played - decoded)
+        times["encode"].append(encoded - played)
+        largest = max(largest, len(token))
+    return largest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=20,
+                        help="games per board size")
+    parser.add_argument("--ships", type=int, default=5)
+    parser.add_argument("--salvo", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    codec = TokenCodec("benchmark secret", max_age=3600)
+    rng = random.Random(args.seed)
+    print(f"{'size':>5s} {'max token':>10s} {'decode us':>10s} "
+          f"{'turn us':>8s} {'encode us':>10s}")
+    for size in range(MIN_SIZE, MAX_SIZE + 1):
+        times = {"decode": [], "turn": [], "encode": []}
+        largest = max(play(codec, size, args.ships, args.salvo, rng, times)
+                      for _ in range(args.games))
+        med = {k: statistics.median(v) * 1e6 for k, v in times.items()}
+        print(f"{size:5d} {largest:10,d} {med['decode']:10.1f} "
+              f"{med['turn']:8.1f} {med['encode']:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
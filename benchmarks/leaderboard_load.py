@@ -0,0 +1,79 @@
+"""Leaderboard read latency as the number of recorded games grows.
+
+Records synthetic results in batches into a fresh SQLite file and, at
+each checkpoint, times the queries behind /api/leaderboard. They should
+cost the same at a thousand games and at millions.
+
+    python -m benchmarks.leaderboard_load --games 1000000 --players 50000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from leaderboard import Leaderboard
+
+
+def synthetic_results(rng, count, players, now):
+    """Plausible result rows (see Leaderboard.result_of)."""
+    for _ in range(count):
+        size = rng.randint(8, 15)
+        ships = rng.randint(1, 5)
+        won = rng.random() < 0.5
+        player = f"player{rng.randrange(players)}" \
+            if rng.random() < 0.8 else None
+        shots = rng.randint(ships * 3, size * size)
+        yield (player, "player" if won else "enemy", shots,
+               shots - (0 if won else 1), size, ships,
+               rng.choice(("easy", "hard")), int(rng.random() < 0.1),
+               rng.uniform(30, 900), now)
+
+
+def time_reads(board, rng, rounds=200):
+    """p50 and max microseconds of one leaderboard page's queries."""
+    times = []
+    for _ in range(rounds):
+        size, ships = rng.randint(8, 15), rng.randint(1, 5)
+        started = time.perf_counter()
+        board.totals()
+        board.top_players(10)
+        board.fastest_wins(size, ships, 10)
+        times.append(time.perf_counter() - started)
+    return statistics.median(times) * 1e6, max(times) * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=1_000_000)
+    parser.add_argument("--players", type=int, default=50_000)
+    parser.add_argument("--batch", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    checkpoints = [n for n in (1_000, 10_000, 100_000, 1_000_000,
+                               10_000_000) if n < args.games] + [args.games]
+    with tempfile.TemporaryDirectory() as tmp:
+        board = Leaderboard(os.path.join(tmp, "results.db"))
+        recorded = 0
+        insert_seconds = 0.0
+        print(f"{'games':>10s} {'insert/s':>9s} {'read p50 us':>12s} "
+              f"{'read max us':>12s}")
+        for checkpoint in checkpoints:
+            while recorded < checkpoint:
+                count = min(args.batch, checkpoint - recorded)
+                rows = list(synthetic_results(rng, count, args.players,
+                                              time.time()))
+                started = time.perf_counter()
+                board.record_many(rows)
+                insert_seconds += time.perf_counter() - started
+                recorded += count
+            p50, worst = time_reads(board, rng)
+            print(f"{recorded:10,d} {recorded / insert_seconds:9,.0f} "
+                  f"{p50:12.1f} {worst:12.1f}")
+
+
+if __name__ == "__main__":
+    main()
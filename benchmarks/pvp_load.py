@@ -0,0 +1,150 @@
+"""Load test for human-vs-human rooms over real local HTTP.
+
+Starts the Flask app on a threaded local server in a child process (so
+the clients do not share its GIL), then runs 2 x --rooms asyncio
+clients. Each client joins the lobby, long-polls for a match,
+then fires on its turn (after --think seconds, like a human) and
+long-polls (/pvp/wait) on the opponent's. No client ever polls /game.
+
+    python -m benchmarks.pvp_load --rooms 1000 --moves 10 --think 3
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import statistics
+import time
+from multiprocessing import Pipe, Process
+
+
+class Client:
+    """Minimal HTTP/1.0 client keeping the Flask session cookie."""
+
+    def __init__(self, host, port, headers=()):
+        self.host = host
+        self.port = port
+        self.headers = list(headers)
+        self.cookie = ""
+
+    async def request(self, method, path, body=None):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        payload = json.dumps(body).encode() if body is not None else b""
+        head = [f"{method} {path} HTTP/1.0", f"Host: {self.host}",
+                f"Content-Length: {len(payload)}"]
+        if body is not None:
+            head.append("Content-Type: application/json")
+        if self.cookie:
+            head.append(f"Cookie: {self.cookie}")
+        head.extend(self.headers)
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + payload)
+        await writer.drain()
+        raw = await reader.read()
+        writer.close()
+
+        header, _, content = raw.partition(b"\r\n\r\n")
+        lines = header.decode("latin-1").split("\r\n")
+        status = int(lines[0].split()[1])
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            if name.lower() == "set-cookie":
+                self.cookie = value.strip().split(";")[0]
+        is_json = content[:1] in (b"{", b"[")
+        return status, json.loads(content) if is_json else None
+
+    async def get(self, path):
+        return (await self.request("GET", path))[1]
+
+    async def post(self, path, body=None):
+        return (await self.request("POST", path, body or {}))[1]
+
+
+def serve(conn, backlog):
+    """Child process: run the app and report the port through conn."""
+    from werkzeug.serving import make_server
+    from app import app
+
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    server.socket.listen(backlog)
+    conn.send(server.server_port)
+    server.serve_forever()
+
+
+async def player(host, port, moves, think, stats, fired_at):
+    client = Client(host, port)
+    data = await client.post("/pvp/join")
+    while data["status"] == "waiting":
+        data = await client.get("/pvp/match")
+
+    size = data["size"]
+    cells = [f"{chr(65 + r)}{c + 1}" for r in range(size)
+             for c in range(size)]
+    random.shuffle(cells)
+    room = data["room"]
+    stats["rooms"].add(room)
+    made = 0
+    while data["winner"] is None and made < moves:
+        if data["turn"] == "you":
+            await asyncio.sleep(random.uniform(0, 2 * think))
+            fired_at[(room, data["version"])] = time.perf_counter()
+            started = time.perf_counter()
+            data = await client.post("/pvp/fire",
+                                     {"position": cells.pop()})
+            stats["fire"].append(time.perf_counter() - started)
+            made += 1
+        else:
+            data = await client.get(f"/pvp/wait?since={data['version']}")
+            sent = fired_at.get((room, data["version"] - 1))
+            if sent is not None:
+                stats["notify"].append(time.perf_counter() - sent)
+    await client.post("/pvp/leave")
+
+
+async def run_clients(host, port, count, moves, think):
+    stats = {"fire": [], "notify": [], "rooms": set()}
+    fired_at = {}
+    await asyncio.gather(*(
+        player(host, port, moves, think, stats, fired_at)
+        for _ in range(count)))
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rooms", type=int, default=1000)
+    parser.add_argument("--moves", type=int, default=10,
+                        help="shots per player before leaving")
+    parser.add_argument("--think", type=float, default=3.0,
+                        help="mean seconds before each shot")
+    parser.add_argument("--backlog", type=int, default=4096)
+    args = parser.parse_args(argv)
+
+    parent, child = Pipe()
+    server = Process(target=serve, args=(child, args.backlog), daemon=True)
+    server.start()
+    port = parent.recv()
+
+    started = time.perf_counter()
+    try:
+        stats = asyncio.run(run_clients(
+            "127.0.0.1", port, 2 * args.rooms, args.moves, args.think))
+    finally:
+        server.terminate()
+    elapsed = time.perf_counter() - started
+
+    def ms(values, q):
+        return statistics.quantiles(values, n=100)[q - 1] * 1000
+
+    moves = len(stats["fire"])
+    print(f"{len(stats['rooms'])} rooms, {2 * args.rooms} clients, "
+          f"{moves} moves in {elapsed:.1f} s ({moves / elapsed:,.0f} moves/s)")
+    print(f"fire:   p50 {ms(stats['fire'], 50):.1f} ms  "
+          f"p99 {ms(stats['fire'], 99):.1f} ms")
+    # move sent -> the opponent's long-poll answered
+    print(f"notify: p50 {ms(stats['notify'], 50):.1f} ms  "
+          f"p99 {ms(stats['notify'], 99):.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Load test: latency of well-behaved players while others abuse the API.
+
+Starts the Flask app in a child process (as pvp_load does) with the
+client address taken from X-Forwarded-For, so each simulated client has
+its own IP. Well-behaved players fire --rate shots per second; abusers
+hammer /setup and /api/fire with --abuser-streams requests in flight
+each and ignore Retry-After. The first phase has no abusers, the second
+has them. Reported per phase: end-to-end latency of the well-behaved
+players, and the server-side p99 of admitted /api/fire requests (from
+/metrics), which the limits should keep flat.
+
+    python -m benchmarks.ratelimit_load --good 40 --abusers 10
+    python -m benchmarks.ratelimit_load --no-limits   # for comparison
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import time
+import urllib.request
+from collections import Counter
+from multiprocessing import Pipe, Process
+
+from benchmarks.pvp_load import Client, serve
+
+
+async def good_player(host, port, ip, rate, until, stats):
+    """Plays at a human pace; starts a new game when one is over."""
+    client = Client(host, port, [f"X-Forwarded-For: {ip}"])
+    cells = []
+    while time.perf_counter() < until:
+        await asyncio.sleep(random.uniform(0.5, 1.5) / rate)
+        started = time.perf_counter()
+        if not cells:
+            status, _ = await client.request("POST", "/setup", {})
+            cells = [f"{chr(65 + r)}{c + 1}" for r in range(8)
+                     for c in range(8)]
+            random.shuffle(cells)
+        else:
+            status, data = await client.request(
+                "POST", "/api/fire", {"position": cells.pop()})
+            if status == 200 and data["over"]:
+                cells = []
+        stats["latency"].append(time.perf_counter() - started)
+        stats["status"][status] += 1
+
+
+async def abuser_stream(host, port, ip, until, stats):
+    """Back-to-back requests, ignoring 429 and Retry-After."""
+    client = Client(host, port, [f"X-Forwarded-For: {ip}"])
+    while time.perf_counter() < until:
+        if random.random() < 0.3:
+            status, _ = await client.request("POST", "/setup", {})
+        else:
+            status, _ = await client.request(
+                "POST", "/api/fire",
+                {"position": f"{chr(65 + random.randrange(8))}"
+                             f"{random.randrange(8) + 1}"})
+        stats["status"][status] += 1
+
+
+def fire_buckets(port) -> dict:
+    """Cumulative /api/fire 200 latency buckets from /metrics: le -> n."""
+    url = f"http://127.0.0.1:{port}/metrics"
+    with urllib.request.urlopen(url) as response:
+        text = response.read().decode()
+    prefix = ('battleship_request_seconds_bucket{route="/api/fire",'
+              'method="POST",status="200",le="')
+    buckets = {}
+    for line in text.splitlines():
+        if line.startswith(prefix):
+            le, _, count = line[len(prefix):].partition('"} ')
+            buckets[float(le)] = int(count)
+    return buckets
+
+
+def bucket_p99(before, after) -> float:
+    """Upper bound (seconds) of the bucket holding the phase's p99."""
+    counts = sorted((le, n - before.get(le, 0)) for le, n in after.items())
+    if not counts or not counts[-1][1]:
+        return float("nan")
+    for le, n in counts:
+        if n >= 0.99 * counts[-1][1]:
+            return le
+
+
+async def run_phase(host, port, args, abusers):
+    until = time.perf_counter() + args.seconds
+    good = {"latency": [], "status": Counter()}
+    bad = {"status": Counter()}
+    tasks = [good_player(host, port, f"10.1.{i // 250}.{i % 250 + 1}",
+                         args.rate, until, good)
+             for i in range(args.good)]
+    if abusers:
+        tasks += [abuser_stream(host, port, f"10.2.0.{i + 1}", until, bad)
+                  for i in range(args.abusers)
+                  for _ in range(args.abuser_streams)]
+    await asyncio.gather(*tasks)
+    return good, bad
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--good", type=int, default=40,
+                        help="well-behaved players")
+    parser.add_argument("--rate", type=float, default=2.0,
+                        help="requests per second per good player")
+    parser.add_argument("--abusers", type=int, default=10)
+    parser.add_argument("--abuser-streams", type=int, default=16,
+                        help="requests in flight per abuser")
+    parser.add_argument("--seconds", type=float, default=10.0,
+                        help="length of each phase")
+    parser.add_argument("--no-limits", action="store_true",
+                        help="run the server without rate limits")
+    parser.add_argument("--backlog", type=int, default=4096)
+    args = parser.parse_args(argv)
+
+    # Read by app.py in the child process
+    os.environ["BATTLESHIP_PROXIES"] = "1"
+    if args.no_limits:
+        os.environ["BATTLESHIP_RATE_LIMITS"] = "0"
+    parent, child = Pipe()
+    server = Process(target=serve, args=(child, args.backlog), daemon=True)
+    server.start()
+    port = parent.recv()
+
+    def ms(values, q):
+        return statistics.quantiles(values, n=100)[q - 1] * 1000
+
+    try:
+        for name, abusers in (("baseline", False), ("under abuse", True)):
+            before = fire_buckets(port)
+            good, bad = asyncio.run(
+                run_phase("127.0.0.1", port, args, abusers))
+            server_p99 = bucket_p99(before, fire_buckets(port))
+            print(f"{name:12s} good: {len(good['latency']):6d} requests  "
+                  f"p50 {ms(good['latency'], 50):7.1f} ms  "
+                  f"p99 {ms(good['latency'], 99):7.1f} ms  "
+                  f"status {dict(sorted(good['status'].items()))}")
+            print(f"{'':12s} server-side /api/fire p99 <= "
+                  f"{server_p99 * 1000:g} ms")
+            if abusers:
+                total = sum(bad["status"].values())
+                print(f"{'':12s} abusers: {total:6d} requests  "
+                      f"{total / args.seconds:,.0f}/s  "
+                      f"status {dict(sorted(bad['status'].items()))}")
+    finally:
+        server.terminate()
+
+
+if __name__ == "__main__":
+    main()
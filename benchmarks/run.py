@@ -0,0 +1,326 @@
+"""Benchmark suite for the engine, renderer and Flask routes.
+
+    python -m benchmarks.run                       # run + compare
+    python -m benchmarks.run -k render             # only matching cases
+    python -m benchmarks.run --output out.json     # save results
+    python -m benchmarks.run --save-baseline       # refresh baseline
+
+Each case reports seconds per call (best of several repeats). Results
+are compared with benchmarks/baseline.json; a case slower than the
+baseline by more than --threshold is a regression and the exit status
+is 1. Timings are divided by a fixed pure-Python calibration loop run
+alongside them, which cancels most machine-wide speed drift; still,
+refresh the baseline on the machine that runs the comparison.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import sys
+import time
+from contextlib import redirect_stdout
+
+from battleship import (
+    BattleshipGame, WelcomeScreen, board_lines, build_board_block,
+    display_boards, position_name,
+)
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+CASES = {}
+
+
+def bench(name):
+    """Register a case: a factory returning (function, calls per run)."""
+    def register(factory):
+        CASES[name] = factory
+        return factory
+    return register
+
+
+def measure(fn, calls) -> float:
+    """Seconds per call; fn() performs `calls` calls."""
+    started = time.perf_counter()
+    fn()
+    return (time.perf_counter() - started) / calls
+
+
+def calibrate(repeat=5) -> float:
+    """Best-of time of a fixed pure-Python workload (machine speed)."""
+    def work():
+        total = 0
+        for i in range(200_000):
+            total += i * i % 7
+        return total
+    return min(measure(work, 1) for _ in range(repeat))
+
+
+def filled_game(size, ships, fill, seed=0):
+    """A game where `fill` of each board has already been fired at."""
+    game = BattleshipGame(size=size, num_ships=ships, seed=seed)
+    cells = list(range(size * size))
+    game.rng.shuffle(cells)
+    for i in cells[:int(len(cells) * fill)]:
+        r, c = divmod(i, size)
+        for board in (game.enemy_fleet, game.player_fleet):
+            if not board.tried & board.bit(r, c):
+                board.fire(r, c)
+    return game
+
+
+def copies(game, n):
+    """n independent copies of a game (decoded outside the timing)."""
+    state = game.to_bytes()
+    return [BattleshipGame.from_bytes(state) for _ in range(n)]
+
+
+# ========= Engine =========
+for _size in range(8, 16):
+    for _ships in range(1, 6):
+        @bench(f"engine.init/{_size}x{_size}/{_ships}")
+        def _init(size=_size, ships=_ships):
+            def run():
+                for seed in range(200):
+                    BattleshipGame(size=size, num_ships=ships, seed=seed)
+            return run, 200
+
+        @bench(f"engine.place_ships/{_size}x{_size}/{_ships}")
+        def _place(size=_size, ships=_ships):
+            game = BattleshipGame(size=size, num_ships=ships, seed=0)
+            rng = random.Random(0)
+
+            def run():
+                for _ in range(500):
+                    game._place_ships(rng)
+            return run, 500
+
+for _label, _fill in (("empty", 0.0), ("half", 0.5), ("near_full", 0.95)):
+    @bench(f"engine.player_turn/15x15/{_label}")
+    def _player_turn(fill=_fill):
+        game = filled_game(15, 5, fill)
+        untried = [position_name(*divmod(i, 15)) for i in range(225)
+                   if not game.enemy_fleet.tried >> i & 1]
+        batch = copies(game, len(untried))
+
+        def run():
+            for g, pos in zip(batch, untried):
+                g.player_turn(pos)
+        return run, len(untried)
+
+    @bench(f"engine.enemy_turn/15x15/{_label}")
+    def _enemy_turn(fill=_fill):
+        batch = copies(filled_game(15, 5, fill), 200)
+        for g in batch:
+            g._enemy_turn()  # builds the shot pool outside the timing
+
+        def run():
+            for g in batch:
+                g._enemy_turn()
+        return run, len(batch)
+
+
+# ========= Game tokens =========
+@bench("tokens.roundtrip/15x15/half")
+def _token_roundtrip():
+    from tokens import TokenCodec
+    codec = TokenCodec("benchmark secret")
+    game = filled_game(15, 5, 0.5)
+    token = codec.encode(game.to_bytes(), b"game")
+
+    def run():
+        for _ in range(200):
+            state = BattleshipGame.from_bytes(codec.decode(token, b"game"))
+            codec.encode(state.to_bytes(), b"game")
+    return run, 200
+
+
+# ========= Renderer =========
+@bench("render.build_board_block/15x15/full")
+def _render_full():
+    grid = filled_game(15, 5, 0.5).player_board.to_lists()
+
+    def run():
+        for _ in range(100):
+            build_board_block("Your Fleet", grid)
+    return run, 100
+
+
+@bench("render.build_board_block/15x15/incremental")
+def _render_incremental():
+    batch = copies(filled_game(15, 5, 0.5), 100)
+    for g in batch:
+        build_board_block("Your Fleet", g.player_board)
+        g._enemy_turn()
+
+    def run():
+        for g in batch:
+            build_board_block("Your Fleet", g.player_board)
+    return run, len(batch)
+
+
+@bench("render.display_boards/15x15")
+def _render_display():
+    game = filled_game(15, 5, 0.5)
+    grids = game.enemy_view.to_lists(), game.player_board.to_lists()
+
+    def run():
+        with redirect_stdout(io.StringIO()):
+            for _ in range(50):
+                display_boards(*grids)
+    return run, 50
+
+
+@bench("render.board_lines/15x15/cached")
+def _render_cached():
+    game = filled_game(15, 5, 0.5)
+
+    def run():
+        for _ in range(200):
+            board_lines(game.enemy_view, game.player_board)
+    return run, 200
+
+
+# ========= Welcome screen =========
+TITLE = "██████   █████  ████████ ████████ ██      ███████"
+
+
+@bench("welcome.gradient_line")
+def _gradient():
+    ws = WelcomeScreen([TITLE], "", width=100)
+
+    def run():
+        for _ in range(500):
+            ws.gradient_line(TITLE)
+    return run, 500
+
+
+@bench("welcome.center_text")
+def _center():
+    ws = WelcomeScreen([TITLE], "", width=100)
+    text = ws.gradient_line(TITLE)
+
+    def run():
+        for _ in range(500):
+            ws.center_text(text)
+    return run, 500
+
+
+# ========= Flask routes =========
+def flask_client():
+    """Test client of the app with rate limits off (they would turn the
+    timed loops into 429s)."""
+    os.environ["BATTLESHIP_RATE_LIMITS"] = "0"  # read when app is imported
+    from app import app
+    return app.test_client()
+
+
+@bench("flask.setup_fire_roundtrip")
+def _flask_roundtrip():
+    client = flask_client()
+
+    def run():
+        for i in range(20):
+            client.post("/setup", data={"size": 15, "ships": 5})
+            client.post("/fire", data={"position": position_name(i % 15, 0)})
+    return run, 20
+
+
+@bench("flask.api_fire")
+def _flask_api_fire():
+    client = flask_client()
+
+    def run():
+        client.post("/setup", data={"size": 15, "ships": 5})
+        for i in range(50):
+            client.post("/api/fire",
+                        json={"position": position_name(*divmod(i, 15))})
+    return run, 51
+
+
+# ========= Runner =========
+def run_cases(pattern=None, repeat=5) -> dict:
+    results = {}
+    for name, factory in CASES.items():
+        if pattern and pattern not in name:
+            continue
+        best = float("inf")
+        calls = 1
+        for _ in range(repeat):
+            fn, calls = factory()  # fresh state for every repeat
+            best = min(best, measure(fn, calls))
+        results[name] = {"per_call": best, "calls": calls}
+        print(f"{name:50s} {best * 1e6:12.2f} us", file=sys.stderr)
+    return results
+
+
+def compare(results, baseline, threshold, speed=1.0) -> list[str]:
+    """Names of cases slower than baseline * (1 + threshold).
+
+    speed is this run's calibration time over the baseline's.
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        ratio = result["per_call"] / base["per_call"] / speed
+        result["vs_baseline"] = round(ratio, 3)
+        if ratio > 1 + threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", dest="pattern", help="substring filter")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write JSON results here")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown (0.25 = 25%%)")
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    results = run_cases(args.pattern, args.repeat)
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "calibration": calibrate(),
+        },
+        "results": results,
+    }
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as fp:
+            json.dump(report, fp, indent=1, sort_keys=True)
+        print(f"baseline saved to {args.baseline}")
+        return 0
+
+    regressions = []
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as fp:
+            baseline = json.load(fp)
+        speed = report["meta"]["calibration"] / \
+            baseline["meta"]["calibration"]
+        regressions = compare(results, baseline["results"],
+                              args.threshold, speed)
+        report["regressions"] = regressions
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fp:
+            json.dump(report, fp, indent=1, sort_keys=True)
+    else:
+        json.dump(report, sys.stdout, indent=1, sort_keys=True)
+        print()
+
+    for name in regressions:
+        print(f"REGRESSION {name}: {results[name]['vs_baseline']}x "
+              f"baseline", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
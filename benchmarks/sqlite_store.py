@@ -0,0 +1,95 @@
+"""Many worker processes sharing one SQLite game database.
+
+Each worker repeatedly loads a game, plays a turn and saves it (the
+/fire request cycle). At the end every game's shot counter must equal
+the number of saves that succeeded for it, i.e. no lost updates.
+
+    python -m benchmarks.sqlite_store --workers 8 --turns 2000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from collections import Counter
+from multiprocessing import Pool
+
+from battleship import BattleshipGame, position_name
+from storage import SQLiteGameStore
+
+
+def worker(args):
+    path, game_ids, turns, seed = args
+    store = SQLiteGameStore(path)
+    rng = random.Random(seed)
+    saved = Counter()
+    load_times, save_times = [], []
+
+    for _ in range(turns):
+        game_id = rng.choice(game_ids)
+        started = time.perf_counter()
+        game, loaded_version = store.load(game_id)
+        load_times.append(time.perf_counter() - started)
+
+        untried = [i for i in range(game.size ** 2)
+                   if not game.enemy_fleet.tried >> i & 1]
+        if not untried or game.winner():
+            continue
+        r, c = divmod(rng.choice(untried), game.size)
+        game.player_turn(position_name(r, c))
+
+        started = time.perf_counter()
+        conflicts = store.save_many([(game_id, game, loaded_version)])
+        save_times.append(time.perf_counter() - started)
+        if not conflicts:
+            saved[game_id] += 1
+    return saved, load_times, save_times
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--games", type=int, default=32)
+    parser.add_argument("--turns", type=int, default=2000,
+                        help="turns per worker")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "games.db")
+        store = SQLiteGameStore(path)
+        game_ids = [f"game-{i}" for i in range(args.games)]
+        for i, game_id in enumerate(game_ids):
+            store.put(game_id, BattleshipGame(size=15, num_ships=5, seed=i))
+
+        jobs = [(path, game_ids, args.turns, seed)
+                for seed in range(args.workers)]
+        started = time.perf_counter()
+        with Pool(args.workers) as pool:
+            results = pool.map(worker, jobs)
+        elapsed = time.perf_counter() - started
+
+        saved = Counter()
+        loads, saves = [], []
+        for worker_saved, load_times, save_times in results:
+            saved.update(worker_saved)
+            loads += load_times
+            saves += save_times
+
+        lost = sum(
+            1 for game_id in game_ids
+            if store.get(game_id).total_player_shots != saved[game_id]
+        )
+
+    turns = args.workers * args.turns
+    print(f"{args.workers} workers, {turns} turns in {elapsed:.2f} s "
+          f"({turns / elapsed:,.0f} turns/s)")
+    print(f"load: median {statistics.median(loads) * 1e6:.0f} us  "
+          f"save: median {statistics.median(saves) * 1e6:.0f} us")
+    print(f"{sum(saved.values())} saves committed, "
+          f"{len(saves) - sum(saved.values())} version conflicts, "
+          f"{lost} games with lost updates")
+
+
+if __name__ == "__main__":
+    main()
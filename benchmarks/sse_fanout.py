@@ -0,0 +1,97 @@
+"""One game broadcasting to many local SSE subscribers.
+
+Measures /api/fire latency through the Flask test client while N
+subscriber threads stream the game's events, and checks that every
+subscriber received every shot.
+
+    python -m benchmarks.sse_fanout --subscribers 1000 --turns 200
+"""
+import argparse
+import statistics
+import threading
+import time
+
+from battleship import position_name
+from benchmarks.run import flask_client
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def fire_latencies(client, turns, start=0):
+    """Time `turns` /api/fire calls (stops early when the game ends)."""
+    latencies = []
+    for i in range(start, start + turns):
+        size = 15
+        r, c = divmod(i % (size * size), size)
+        started = time.perf_counter()
+        reply = client.post("/api/fire",
+                            json={"position": position_name(r, c)})
+        latencies.append(time.perf_counter() - started)
+        if reply.json["over"]:
+            break
+    return latencies
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--subscribers", type=int, default=1000)
+    parser.add_argument("--turns", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    client = flask_client()  # rate limits off, or most shots get a 429
+    from app import games, spectators
+
+    client.post("/setup", data={"size": 15, "ships": 5})
+    with client.session_transaction() as sess:
+        game_id = sess["game_id"]
+    game = games.get(game_id)
+
+    # Baseline: nobody watching
+    baseline = fire_latencies(client, args.turns // 2)
+
+    received = [0] * args.subscribers
+    ready = threading.Barrier(args.subscribers + 1)
+
+    def watch(slot):
+        stream = spectators.subscribe(game_id)
+        next(stream)  # joined the channel
+        ready.wait()
+        for chunk in stream:
+            received[slot] += chunk.count(b"event: shot")
+
+    threads = [threading.Thread(target=watch, args=(i,), daemon=True)
+               for i in range(args.subscribers)]
+    for thread in threads:
+        thread.start()
+    ready.wait()
+
+    shots_before = game.total_player_shots + game.total_enemy_shots
+    started = time.perf_counter()
+    watched = fire_latencies(client, args.turns - len(baseline),
+                             start=len(baseline))
+    expected = game.total_player_shots + game.total_enemy_shots \
+        - shots_before
+
+    # Let every subscriber drain, then stop the streams
+    deadline = time.perf_counter() + 10
+    while min(received) < expected and time.perf_counter() < deadline:
+        time.sleep(0.01)
+    drained = time.perf_counter()
+    spectators.close(game_id)
+
+    for label, values in (("0 subscribers", baseline),
+                          (f"{args.subscribers} subscribers", watched)):
+        print(f"/api/fire with {label}: "
+              f"p50 {statistics.median(values) * 1e3:.3f} ms  "
+              f"p99 {percentile(values, 99) * 1e3:.3f} ms")
+    complete = sum(1 for n in received if n >= expected)
+    print(f"{complete}/{args.subscribers} subscribers got all "
+          f"{expected} shot events "
+          f"(all delivered {drained - started:.2f} s after the first shot)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# Probability-density (hunt/target) enemy AI
+from functools import lru_cache
+
+import numpy as np
+
+# Each unsunk hit inside a candidate placement multiplies its weight, so
+# placements through known hits dominate once a ship has been found.
+TARGET_WEIGHT = 30.0
+
+
+def mask_to_grid(mask: int, size: int) -> np.ndarray:
+    """Unpack a board bitmask into a (size, size) bool array."""
+    n = size * size
+    raw = np.frombuffer(mask.to_bytes((n + 7) // 8, "little"), np.uint8)
+    return np.unpackbits(raw, bitorder="little")[:n].reshape(size, size) \
+        .astype(bool)
+
+
+@lru_cache(maxsize=None)
+def _window_index(size: int, length: int):
+    """Index arrays mapping each cell to the windows that cover it."""
+    cols = np.arange(size)
+    last_start = size - length
+    upper = np.minimum(cols, last_start) + 1
+    lower = np.maximum(0, cols - length + 1)
+    return upper, lower
+
+
+def _row_coverage(free, hits, length) -> np.ndarray:
+    """Weighted count of horizontal placements covering each cell."""
+    size = free.shape[1]
+    if length > size:
+        return np.zeros(free.shape)
+
+    zero = np.zeros((free.shape[0], 1))
+    blocked = np.hstack([zero, np.cumsum(~free, axis=1)])
+    hit_sum = np.hstack([zero, np.cumsum(hits, axis=1)])
+    win_blocked = blocked[:, length:] - blocked[:, :-length]
+    win_hits = hit_sum[:, length:] - hit_sum[:, :-length]
+    weight = (win_blocked == 0) * TARGET_WEIGHT ** win_hits
+
+    upper, lower = _window_index(size, length)
+    total = np.hstack([zero, np.cumsum(weight, axis=1)])
+    return total[:, upper] - total[:, lower]
+
+
+def heatmap(size, hits, misses, sunk, lengths) -> np.ndarray:
+    """Relative ship probability for every cell of a target board.
+
+    hits, misses and sunk are bitmasks as seen by the shooter; lengths
+    are the lengths of the ships still afloat.
+    """
+    hit_grid = mask_to_grid(hits & ~sunk, size)
+    free = ~mask_to_grid(misses | sunk, size)
+
+    heat = np.zeros((size, size))
+    for length in set(lengths):
+        count = lengths.count(length)
+        heat += count * _row_coverage(free, hit_grid, length)
+        heat += count * _row_coverage(free.T, hit_grid.T, length).T
+
+    heat[mask_to_grid(hits | misses, size)] = 0.0
+    return heat
+
+
+def choose_target(board, rng):
+    """Pick the most probable untried cell of a BitBoard -> (r, c)."""
+    size = board.size
+    lengths = list(board.lengths_left())
+    heat = heatmap(size, board.hits, board.misses, board.sunk, lengths)
+
+    # Hunt mode: no open hits, so search a parity lattice of the grid
+    shortest = min(lengths, default=1)
+    if shortest > 1 and not board.hits & ~board.sunk:
+        r, c = np.indices((size, size))
+        lattice = heat * ((r + c) % shortest == 0)
+        if lattice.any():
+            heat = lattice
+
+    best = heat.max()
+    if best <= 0:
+        # No feasible placement left: fall back to any untried cell
+        open_cells = np.flatnonzero(~mask_to_grid(board.tried, size))
+    else:
+        open_cells = np.flatnonzero(heat == best)
+    i = int(open_cells[rng.randrange(len(open_cells))])
+    return divmod(i, size)
@@ -0,0 +1,113 @@
+# Server-sent-events fan-out for spectators
+import json
+import threading
+from collections import deque
+from itertools import islice
+
+
+def encode_event(seq, kind, data) -> bytes:
+    """One SSE frame (encoded once, shared by every subscriber)."""
+    payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    return f"id: {seq}\nevent: {kind}\ndata: {payload}\n\n".encode()
+
+
+class Channel:
+    """Bounded ring of encoded events for one game.
+
+    Subscribers only keep a cursor (the last event id they saw), so a
+    publish is one append plus a wake-up no matter how many clients
+    are listening. A subscriber that falls further behind than the
+    ring is long, or reconnects with an id this channel never issued,
+    gets a single 'resync' event instead of a backlog.
+    """
+
+    def __init__(self, maxlen=256):
+        self.ring = deque(maxlen=maxlen)
+        self.seq = 0
+        self.subscribers = 0
+        self.closed = False
+        self.cond = threading.Condition()
+
+    def publish(self, kind, data):
+        with self.cond:
+            self.seq += 1
+            self.ring.append(encode_event(self.seq, kind, data))
+            self.cond.notify_all()
+
+    def close(self):
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+
+    def _resync(self) -> bytes:
+        return encode_event(self.seq, "resync", {"seq": self.seq})
+
+    def read(self, cursor, timeout=None):
+        """Wait for events after cursor -> (chunks, new_cursor)."""
+        with self.cond:
+            if cursor > self.seq:
+                # An id from an earlier channel of this game (it is
+                # dropped when its last subscriber leaves): start over
+                return [self._resync()], self.seq
+            if cursor == self.seq and not self.closed:
+                self.cond.wait(timeout)
+            missed = self.seq - cursor
+            if missed <= 0:
+                return [], self.seq
+            if missed > len(self.ring):
+                return [self._resync()], self.seq
+            start = len(self.ring) - missed
+            return list(islice(self.ring, start, None)), self.seq
+
+
+class Broadcaster:
+    """Per-game channels; publishing to a game nobody watches is free."""
+
+    def __init__(self, maxlen=256, heartbeat=15.0):
+        self.maxlen = maxlen
+        self.heartbeat = heartbeat
+        self._channels = {}
+        self._lock = threading.Lock()
+
+    def publish(self, game_id, kind, data):
+        channel = self._channels.get(game_id)
+        if channel is not None:
+            channel.publish(kind, data)
+
+    def close(self, game_id):
+        """End every stream of a game (e.g. when it is deleted)."""
+        with self._lock:
+            channel = self._channels.pop(game_id, None)
+        if channel is not None:
+            channel.close()
+
+    def subscribers(self, game_id) -> int:
+        channel = self._channels.get(game_id)
+        return channel.subscribers if channel else 0
+
+    def _join(self, game_id):
+        with self._lock:
+            channel = self._channels.get(game_id)
+            if channel is None:
+                channel = self._channels[game_id] = Channel(self.maxlen)
+            channel.subscribers += 1
+            return channel
+
+    def _leave(self, game_id, channel):
+        with self._lock:
+            channel.subscribers -= 1
+            if not channel.subscribers and \
+                    self._channels.get(game_id) is channel:
+                del self._channels[game_id]
+
+    def subscribe(self, game_id, last_id=None):
+        """Generator of SSE bytes for one client (heartbeats when idle)."""
+        channel = self._join(game_id)
+        try:
+            cursor = channel.seq if last_id is None else last_id
+            yield b"retry: 2000\n\n"
+            while not channel.closed:
+                chunks, cursor = channel.read(cursor, self.heartbeat)
+                yield b"".join(chunks) if chunks else b": ping\n\n"
+        finally:
+            self._leave(game_id, channel)
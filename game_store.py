@@ -0,0 +1,165 @@
+# In-memory game store (one BattleshipGame per browser session)
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+
+def approx_size(obj, _seen=None) -> int:
+    """Rough deep size of an object in bytes (used for the memory cap)."""
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += approx_size(key, _seen) + approx_size(value, _seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += approx_size(item, _seen)
+    elif hasattr(obj, "__dict__"):
+        size += approx_size(vars(obj), _seen)
+    else:
+        for cls in type(obj).__mro__:
+            for name in cls.__dict__.get("__slots__", ()):
+                if hasattr(obj, name):
+                    size += approx_size(getattr(obj, name), _seen)
+    return size
+
+
+class GameStore:
+    """Thread-safe LRU + idle-TTL store of games keyed by session id.
+
+    Every operation is O(1): entries live in an OrderedDict ordered by
+    last access, so both the least recently used entry and the most
+    idle entry are always at the front.
+    """
+
+    def __init__(self, max_games=50_000, ttl=3600,
+                 max_bytes=512 * 1024 * 1024, clock=time.monotonic):
+        self.max_games = max_games
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self._lock = threading.Lock()
+        # key -> (game, last_access, cost_in_bytes, turn_lock)
+        self._entries = OrderedDict()
+        self._bytes = 0
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = {"lru": 0, "ttl": 0, "memory": 0}
+
+    # ----- Public API -----
+    def get(self, key):
+        """Return the game for key (or None) and mark it recently used."""
+        now = self.clock()
+        with self._lock:
+            self._expire(now)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            game, _, cost, turn_lock = entry
+            self._entries[key] = (game, now, cost, turn_lock)
+            self._entries.move_to_end(key)
+            return game
+
+    def put(self, key, game):
+        """Store (or replace) the game for key, evicting if needed."""
+        now = self.clock()
+        cost = approx_size(game)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            self._entries[key] = (game, now, cost, threading.Lock())
+            self._bytes += cost
+            self._expire(now)
+            self._shrink()
+
+    def save_many(self, items):
+        """Games are mutated in place, so there is nothing to write; only
+        their cost is measured again (a game grows as it is played).
+
+        Same interface as SQLiteGameStore; never conflicts.
+        """
+        for key, game, _ in items:
+            cost = approx_size(game)
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is None or entry[0] is not game:
+                    continue  # evicted or replaced meanwhile
+                self._bytes += cost - entry[2]
+                self._entries[key] = (game, entry[1], cost, entry[3])
+                self._shrink()
+        return []
+
+    def turn_lock(self, key):
+        """Lock to hold while playing a turn of key's game.
+
+        get() hands every request the same object, so two requests of
+        one game must take turns on it. A missing key gets a fresh lock.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        return threading.Lock() if entry is None else entry[3]
+
+    def delete(self, key):
+        """Forget the game for key (no-op when missing)."""
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+
+    def stats(self) -> dict:
+        """Snapshot of the store counters."""
+        with self._lock:
+            return {
+                "games": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": dict(self.evictions),
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        """Whether get(key) would find a game (not counted as a hit)."""
+        now = self.clock()
+        with self._lock:
+            self._expire(now)
+            return key in self._entries
+
+    # ----- Eviction (caller holds the lock) -----
+    def _evict_oldest(self, reason):
+        _, (_, _, cost, _) = self._entries.popitem(last=False)
+        self._bytes -= cost
+        self.evictions[reason] += 1
+
+    def _expire(self, now):
+        """Drop idle entries; stops at the first fresh one (amortised O(1))."""
+        if self.ttl is None:
+            return
+        while self._entries:
+            _, last_access, _, _ = next(iter(self._entries.values()))
+            if now - last_access < self.ttl:
+                break
+            self._evict_oldest("ttl")
+
+    def _shrink(self):
+        """Enforce the entry-count and memory caps (never drops the newest)."""
+        while len(self._entries) > 1:
+            if self.max_games and len(self._entries) > self.max_games:
+                self._evict_oldest("lru")
+            elif self.max_bytes and self._bytes > self.max_bytes:
+                self._evict_oldest("memory")
+            else:
+                break
@@ -0,0 +1,227 @@
+# Finished-game results with incrementally maintained leaderboards
+import os
+import sqlite3
+import threading
+import time
+
+MAX_NAME = 24
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id           INTEGER PRIMARY KEY,
+    player       TEXT,
+    winner       TEXT NOT NULL,
+    player_shots INTEGER NOT NULL,
+    enemy_shots  INTEGER NOT NULL,
+    size         INTEGER NOT NULL,
+    num_ships    INTEGER NOT NULL,
+    difficulty   TEXT NOT NULL,
+    salvo        INTEGER NOT NULL,
+    seconds      REAL NOT NULL,
+    finished     REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_player ON results (player, finished)
+    WHERE player IS NOT NULL;
+CREATE INDEX IF NOT EXISTS results_fastest
+    ON results (size, num_ships, player_shots, seconds)
+    WHERE winner = 'player' AND player IS NOT NULL;
+
+CREATE TABLE IF NOT EXISTS players (
+    player       TEXT PRIMARY KEY,
+    games        INTEGER NOT NULL,
+    wins         INTEGER NOT NULL,
+    shots        INTEGER NOT NULL,
+    win_shots    INTEGER NOT NULL,
+    best_shots   INTEGER,
+    seconds      REAL NOT NULL,
+    last_played  REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS players_wins ON players (wins DESC, games);
+
+CREATE TABLE IF NOT EXISTS totals (
+    id           INTEGER PRIMARY KEY CHECK (id = 1),
+    games        INTEGER NOT NULL,
+    player_wins  INTEGER NOT NULL,
+    enemy_wins   INTEGER NOT NULL,
+    shots        INTEGER NOT NULL,
+    seconds      REAL NOT NULL
+);
+INSERT OR IGNORE INTO totals VALUES (1, 0, 0, 0, 0, 0.0);
+"""
+
+INSERT_RESULT = """
+INSERT INTO results (player, winner, player_shots, enemy_shots, size,
+                     num_ships, difficulty, salvo, seconds, finished)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Per-player aggregates, updated in place: O(log n) per result
+UPSERT_PLAYER = """
+INSERT INTO players (player, games, wins, shots, win_shots, best_shots,
+                     seconds, last_played)
+VALUES (?1, 1, ?2, ?3, ?2 * ?3, CASE WHEN ?2 THEN ?3 END, ?4, ?5)
+ON CONFLICT (player) DO UPDATE SET
+    games = games + 1,
+    wins = wins + excluded.wins,
+    shots = shots + excluded.shots,
+    win_shots = win_shots + excluded.win_shots,
+    best_shots = min(coalesce(best_shots, excluded.best_shots),
+                     coalesce(excluded.best_shots, best_shots)),
+    seconds = seconds + excluded.seconds,
+    last_played = excluded.last_played
+"""
+
+UPDATE_TOTALS = """
+UPDATE totals SET games = games + ?, player_wins = player_wins + ?,
+    enemy_wins = enemy_wins + ?, shots = shots + ?, seconds = seconds + ?
+WHERE id = 1
+"""
+
+
+def default_path():
+    """Results file: BATTLESHIP_RESULTS_DB, else one in the working dir."""
+    return os.environ.get("BATTLESHIP_RESULTS_DB", "battleship-results.db")
+
+
+def clean_name(name):
+    """Leaderboard name from user input (None when blank)."""
+    name = " ".join((name or "").split())[:MAX_NAME]
+    return name or None
+
+
+class Leaderboard:
+    """Game results in one SQLite file, with aggregates kept current.
+
+    record() appends the result and, in the same transaction, updates
+    the player's row and the global totals, so no query ever scans the
+    history: top players is an index walk over players (wins), fastest
+    wins a range scan of a partial index on results, and the totals a
+    single row. Reads cost the same at a thousand or millions of games.
+    Anonymous results count in the totals only.
+    """
+
+    def __init__(self, path, busy_timeout=5000):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self):
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, isolation_level=None,
+                                 check_same_thread=False,
+                                 cached_statements=64)
+            db.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout)}")
+            db.execute("PRAGMA journal_mode = WAL")
+            db.execute("PRAGMA synchronous = NORMAL")
+            self._local.db = db
+        return db
+
+    # ----- Writes -----
+    @staticmethod
+    def result_of(game, player=None, finished=None) -> tuple:
+        """Result row of a finished BattleshipGame."""
+        finished = time.time() if finished is None else finished
+        return (clean_name(player), game.winner(), game.total_player_shots,
+                game.total_enemy_shots, game.size, game.num_ships,
+                game.difficulty, int(game.salvo),
+                max(0.0, finished - game.started_at), finished)
+
+    def record(self, game, player=None):
+        """Store the result of a finished game."""
+        self.record_many([self.result_of(game, player)])
+
+    def record_many(self, results):
+        """Store result rows (see result_of) in one transaction."""
+        db = self._connection()
+        totals = [0, 0, 0, 0, 0.0]
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            for row in results:
+                (player, winner, player_shots, _, _, _, _, _,
+                 seconds, finished) = row
+                won = int(winner == "player")
+                db.execute(INSERT_RESULT, row)
+                if player is not None:
+                    db.execute(UPSERT_PLAYER, (player, won, player_shots,
+                                               seconds, finished))
+                totals[0] += 1
+                totals[1] += won
+                totals[2] += 1 - won
+                totals[3] += player_shots
+                totals[4] += seconds
+            db.execute(UPDATE_TOTALS, totals)
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    # ----- Reads -----
+    def top_players(self, n=10) -> list[dict]:
+        """Most wins first (fewer games breaks ties)."""
+        rows = self._connection().execute(
+            "SELECT player, games, wins, win_shots, best_shots, seconds "
+            "FROM players ORDER BY wins DESC, games LIMIT ?", (n,))
+        return [{
+            "player": player,
+            "games": games,
+            "wins": wins,
+            "win_rate": round(wins / games, 4),
+            "mean_shots_to_win": round(win_shots / wins, 1) if wins
+            else None,
+            "best_shots": best,
+            "mean_seconds": round(seconds / games, 1),
+        } for player, games, wins, win_shots, best, seconds in rows]
+
+    def fastest_wins(self, size, num_ships, n=10) -> list[dict]:
+        """Wins on one board setup in the fewest shots."""
+        rows = self._connection().execute(
+            "SELECT player, player_shots, seconds, difficulty, salvo, "
+            "finished FROM results "
+            "WHERE winner = 'player' AND player IS NOT NULL "
+            "AND size = ? AND num_ships = ? "
+            "ORDER BY player_shots, seconds LIMIT ?",
+            (size, num_ships, n))
+        return [{
+            "player": player,
+            "shots": shots,
+            "seconds": round(seconds, 1),
+            "difficulty": difficulty,
+            "salvo": bool(salvo),
+            "finished": finished,
+        } for player, shots, seconds, difficulty, salvo, finished in rows]
+
+    def player(self, name) -> dict | None:
+        """Aggregates of one player, or None."""
+        row = self._connection().execute(
+            "SELECT games, wins, shots, win_shots, best_shots, seconds, "
+            "last_played FROM players WHERE player = ?",
+            (clean_name(name),)).fetchone()
+        if row is None:
+            return None
+        games, wins, shots, win_shots, best, seconds, last = row
+        return {
+            "player": clean_name(name),
+            "games": games,
+            "wins": wins,
+            "shots": shots,
+            "mean_shots_to_win": round(win_shots / wins, 1) if wins
+            else None,
+            "best_shots": best,
+            "mean_seconds": round(seconds / games, 1),
+            "last_played": last,
+        }
+
+    def totals(self) -> dict:
+        games, player_wins, enemy_wins, shots, seconds = \
+            self._connection().execute(
+                "SELECT games, player_wins, enemy_wins, shots, seconds "
+                "FROM totals WHERE id = 1").fetchone()
+        return {
+            "games": games,
+            "player_wins": player_wins,
+            "enemy_wins": enemy_wins,
+            "mean_player_shots": round(shots / games, 1) if games else None,
+            "mean_seconds": round(seconds / games, 1) if games else None,
+        }
@@ -0,0 +1,314 @@
+# Prometheus-style metrics: latency histograms, counters and gauges
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from collections import deque
+from functools import wraps
+
+# Seconds; spans a cached 304 (~50 us) up to a slow hard-AI request
+LATENCY_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+                   0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+def format_labels(names, values, extra=()) -> str:
+    """'{a="1",b="2"}' (empty string when there are no labels)."""
+    pairs = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    pairs += [f'{n}="{v}"' for n, v in extra]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value):
+    return (value.replace("\\", r"\\").replace("\n", r"\n")
+            .replace('"', r'\"'))
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _ThreadMark:
+    """Kept only in a thread-local: freed when its thread exits."""
+
+
+class _Sharded:
+    """Per-thread accumulation: the hot path never takes a lock.
+
+    Each thread writes only to its own shard (a dict of label tuple ->
+    list); a collector sums the shards. Python list updates are atomic
+    enough for monitoring: a scrape may miss an in-flight observation,
+    never corrupt one. When a thread exits its shard is folded into
+    shared totals, so a server starting a thread per request keeps
+    one shard per live thread.
+    """
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._local = threading.local()
+        self._shards = {}  # id -> shard of each live thread
+        self._retired = {}  # sums of the shards of finished threads
+        # Only for new and finished threads, and scrapes
+        self._shards_lock = threading.RLock()
+
+    def _shard(self):
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            mark = self._local.mark = _ThreadMark()
+            with self._shards_lock:
+                self._shards[id(shard)] = shard
+            weakref.finalize(mark, self._retire, shard)
+            return shard
+
+    def _retire(self, shard):
+        """Fold a finished thread's shard into the shared totals."""
+        with self._shards_lock:
+            del self._shards[id(shard)]
+            for key, values in shard.items():
+                total = self._retired.get(key)
+                if total is None:
+                    self._retired[key] = list(values)
+                else:
+                    for i, v in enumerate(values):
+                        total[i] += v
+
+    def _merged(self, width) -> dict:
+        """label tuple -> element-wise sum of every thread's list."""
+        with self._shards_lock:
+            shards = list(self._shards.values())
+            merged = {key: list(values)
+                      for key, values in self._retired.items()}
+        for shard in shards:
+            for key, values in list(shard.items()):
+                total = merged.setdefault(key, [0] * width)
+                for i, v in enumerate(values):
+                    total[i] += v
+        return merged
+
+
+class Counter(_Sharded):
+    """Monotonic counter, optionally labelled."""
+
+    def inc(self, *labels, amount=1):
+        shard = self._shard()
+        cell = shard.get(labels)
+        if cell is None:
+            cell = shard[labels] = [0]
+        cell[0] += amount
+
+    def total(self) -> int:
+        return sum(v[0] for v in self._merged(1).values())
+
+    def expose(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        for key, (value,) in sorted(self._merged(1).items()):
+            yield f"{self.name}{format_labels(self.labels, key)} {value}"
+
+
+class Histogram(_Sharded):
+    """Latency histogram: cumulative buckets plus _sum and _count."""
+
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+        # bucket counts..., +Inf count, sum
+        self._width = len(self.buckets) + 2
+
+    def observe(self, value, *labels):
+        shard = self._shard()
+        cell = shard.get(labels)
+        if cell is None:
+            cell = shard[labels] = [0] * self._width
+        cell[bisect_left(self.buckets, value)] += 1
+        cell[-1] += value
+
+    def time(self, *labels):
+        """Decorator recording the wrapped call's duration."""
+        def decorate(fn):
+            @wraps(fn)
+            def timed(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.observe(time.perf_counter() - started, *labels)
+            return timed
+        return decorate
+
+    def expose(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        for key, cell in sorted(self._merged(self._width).items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), cell[:-1]):
+                cumulative += count
+                le = bound if bound == "+Inf" else _number(bound)
+                labels = format_labels(self.labels, key, [("le", le)])
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = format_labels(self.labels, key)
+            yield f"{self.name}_sum{labels} {_number(cell[-1])}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class Gauge:
+    """Value read from a callback at scrape time (nothing on the hot path)."""
+
+    def __init__(self, name, help, read):
+        self.name = name
+        self.help = help
+        self.read = read
+
+    def expose(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} gauge"
+        yield f"{self.name} {_number(self.read())}"
+
+
+class Rate:
+    """Per-second rate of a Counter over a trailing window.
+
+    Samples are taken at scrape time only, so the hot path stays the
+    counter's plain increment.
+    """
+
+    def __init__(self, counter, window=60.0, clock=time.monotonic):
+        self.counter = counter
+        self.window = window
+        self.clock = clock
+        self._samples = deque([(clock(), 0)])
+        self._lock = threading.Lock()
+
+    def __call__(self) -> float:
+        now = self.clock()
+        total = self.counter.total()
+        with self._lock:
+            self._samples.append((now, total))
+            while (len(self._samples) > 2
+                   and now - self._samples[1][0] >= self.window):
+                self._samples.popleft()
+            then, before = self._samples[0]
+        return (total - before) / (now - then) if now > then else 0.0
+
+
+class Registry:
+    """Ordered collection of metrics rendered as one text exposition."""
+
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self):
+        self.metrics = []
+
+    def add(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name, help, labels=()):
+        return self.add(Counter(name, help, labels))
+
+    def histogram(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        return self.add(Histogram(name, help, labels, buckets))
+
+    def gauge(self, name, help, read):
+        return self.add(Gauge(name, help, read))
+
+    def expose(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.expose())
+        return "\n".join(lines) + "\n"
+
+
+# ========= Battleship instrumentation =========
+ENGINE_METHODS = ("player_turn", "enemy_turn", "_place_ships")
+
+registry = Registry()
+request_seconds = registry.histogram(
+    "battleship_request_seconds", "Flask request latency by route.",
+    ("route", "method", "status"))
+engine_seconds = registry.histogram(
+    "battleship_engine_seconds", "BattleshipGame call latency.",
+    ("call",))
+template_seconds = registry.histogram(
+    "battleship_template_seconds", "Jinja template render latency.",
+    ("template",))
+shots = registry.counter(
+    "battleship_shots_total", "Shots fired, by side.", ("side",))
+games_started = registry.counter(
+    "battleship_games_started_total", "Games created.")
+games_finished = registry.counter(
+    "battleship_games_finished_total", "Games won by either side.",
+    ("winner",))
+rejected = registry.counter(
+    "battleship_rejected_total",
+    "Requests refused by rate limits or the concurrency cap.", ("reason",))
+registry.gauge("battleship_shots_per_second",
+               "Shots per second over the last minute of scrapes.",
+               Rate(shots))
+
+
+def instrument_engine(cls, methods=ENGINE_METHODS):
+    """Time the given methods of a game class (patched once, in place)."""
+    for name in methods:
+        method = getattr(cls, name)
+        if not getattr(method, "_instrumented", False):
+            timed = engine_seconds.time(name.lstrip("_"))(method)
+            timed._instrumented = True
+            setattr(cls, name, timed)
+
+
+def instrument_app(app, live_games):
+    """Per-route and per-template timings plus the /metrics endpoint.
+
+    Call before registering other after_request handlers: Flask runs
+    them in reverse order, so this one then sees the final status.
+    """
+    from flask import g, request, signals
+
+    registry.gauge("battleship_live_games", "Games held by the store.",
+                   live_games)
+
+    @app.before_request
+    def start_timer():
+        g.metrics_started = time.perf_counter()
+
+    @app.after_request
+    def record_request(response):
+        started = g.pop("metrics_started", None)
+        if started is not None:
+            rule = request.url_rule
+            request_seconds.observe(
+                time.perf_counter() - started,
+                rule.rule if rule is not None else "unmatched",
+                request.method, response.status_code)
+        return response
+
+    local = threading.local()
+
+    def template_started(sender, template, context, **extra):
+        stack = getattr(local, "stack", None)
+        if stack is None:
+            stack = local.stack = []
+        stack.append(time.perf_counter())
+
+    def template_done(sender, template, context, **extra):
+        stack = getattr(local, "stack", None)
+        if stack:
+            template_seconds.observe(time.perf_counter() - stack.pop(),
+                                     template.name)
+
+    signals.before_render_template.connect(template_started, app,
+                                           weak=False)
+    signals.template_rendered.connect(template_done, app, weak=False)
+
+    @app.route("/metrics", methods=["GET"])
+    def metrics():
+        """
+        Prometheus text exposition of every metric
+        """
+        return app.response_class(registry.expose(),
+                                  mimetype=None,
+                                  content_type=Registry.CONTENT_TYPE)
@@ -0,0 +1,160 @@
+# Precomputed opening books for the enemy AI, read through mmap
+import argparse
+import mmap
+import os
+import random
+import struct
+import time
+from functools import lru_cache
+
+from battleship import FLEET, MAX_SIZE, MIN_SIZE, fleet_lengths, place_fleet
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            "data", "openings.bin")
+
+# File: header (magic, format, smallest and largest size, most ships,
+# book depth), then one record of `depth` u8 cell indices per
+# (size, ships) pair in size-major order; END pads a shorter book.
+BOOK_FORMAT = 1
+_HEADER = struct.Struct("<4sBBBBB3x")
+_MAGIC = b"BSOB"
+END = 0xFF
+
+DEPTH = 32
+SAMPLES = 100_000
+# Stop a book once fewer sampled fleets agree with all its misses
+MIN_SAMPLES = 500
+
+
+class OpeningBook:
+    """A memory-mapped openings file.
+
+    Nothing is parsed or copied beyond the 12-byte header: move() reads
+    one byte at a computed offset, and every process mapping the file
+    shares the same page-cache pages.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, fmt, self.min_size, self.max_size, self.max_ships,
+         self.depth) = _HEADER.unpack_from(self._map)
+        if magic != _MAGIC or fmt != BOOK_FORMAT:
+            raise ValueError(f"{path} is not an openings file "
+                             f"(format {BOOK_FORMAT})")
+        records = (self.max_size - self.min_size + 1) * self.max_ships
+        if len(self._map) < _HEADER.size + records * self.depth:
+            raise ValueError(f"{path} is truncated")
+
+    def move(self, size, num_ships, k):
+        """Cell index of the k-th opening shot (0-based), or None."""
+        if not (self.min_size <= size <= self.max_size
+                and 1 <= num_ships <= self.max_ships
+                and 0 <= k < self.depth):
+            return None
+        record = (size - self.min_size) * self.max_ships + num_ships - 1
+        cell = self._map[_HEADER.size + record * self.depth + k]
+        return None if cell == END else cell
+
+
+@lru_cache(maxsize=None)
+def load_book(path=None):
+    """The process-wide OpeningBook, or None when there is no file.
+
+    BATTLESHIP_OPENINGS overrides the default path.
+    """
+    path = path or os.environ.get("BATTLESHIP_OPENINGS") or DEFAULT_PATH
+    try:
+        return OpeningBook(path)
+    except FileNotFoundError:
+        return None
+
+
+def transform(cell, size, symmetry):
+    """Map a cell index through one of the 8 symmetries of the square."""
+    r, c = divmod(cell, size)
+    if symmetry & 1:
+        c = size - 1 - c
+    if symmetry & 2:
+        r = size - 1 - r
+    if symmetry & 4:
+        r, c = c, r
+    return r, c
+
+
+# ========= Generator =========
+def opening(size, num_ships, rng, samples=SAMPLES, depth=DEPTH):
+    """Greedy opening: the likeliest cell given that every shot missed.
+
+    Fleets are sampled from place_fleet (the placement every game
+    uses); after each shot only the fleets it would have missed are
+    kept, so each step is the posterior best cell of an all-miss start.
+    Like the heatmap hunt, only cells of the parity lattice of the
+    shortest ship are fired at: every ship covers one of them.
+    """
+    import numpy as np
+
+    lengths = fleet_lengths(num_ships)
+    n = size * size
+    nbytes = (n + 7) // 8
+    raw = bytearray()
+    for _ in range(samples):
+        occupied = 0
+        for mask in place_fleet(size, lengths, rng):
+            occupied |= mask
+        raw += occupied.to_bytes(nbytes, "little")
+    fleets = np.unpackbits(np.frombuffer(bytes(raw), np.uint8)
+                           .reshape(samples, nbytes),
+                           axis=1, bitorder="little")[:, :n].astype(bool)
+
+    shortest = min(lengths)
+    cells = []
+    tried = np.array([(r + c) % shortest != 0 for r in range(size)
+                      for c in range(size)])
+    while len(cells) < depth and len(fleets) >= MIN_SAMPLES:
+        counts = fleets.sum(axis=0).astype(float)
+        counts[tried] = -1.0
+        cell = int(counts.argmax())
+        cells.append(cell)
+        tried[cell] = True
+        fleets = fleets[~fleets[:, cell]]
+    return cells
+
+
+def write_book(path, seed=0, samples=SAMPLES, depth=DEPTH, log=None):
+    """Generate the book for every (size, ships) pair and write it."""
+    max_ships = len(FLEET)
+    parts = [_HEADER.pack(_MAGIC, BOOK_FORMAT, MIN_SIZE, MAX_SIZE,
+                          max_ships, depth)]
+    for size in range(MIN_SIZE, MAX_SIZE + 1):
+        for num_ships in range(1, max_ships + 1):
+            started = time.perf_counter()
+            rng = random.Random(f"{seed}:{size}:{num_ships}")
+            cells = opening(size, num_ships, rng, samples, depth)
+            parts.append(bytes(cells) + bytes([END]) * (depth - len(cells)))
+            if log:
+                log(f"{size:2d}x{size:<2d} {num_ships} ships: "
+                    f"{len(cells):2d} moves  "
+                    f"{time.perf_counter() - started:.1f} s")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(b"".join(parts))
+    os.replace(tmp, path)  # never expose a half-written file to mmap
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Generate the enemy AI opening books")
+    parser.add_argument("--out", default=DEFAULT_PATH)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--samples", type=int, default=SAMPLES,
+                        help="sampled fleets per (size, ships) pair")
+    parser.add_argument("--depth", type=int, default=DEPTH,
+                        help="longest opening, in shots")
+    args = parser.parse_args(argv)
+    write_book(args.out, args.seed, args.samples, args.depth, log=print)
+
+
+if __name__ == "__main__":
+    main()
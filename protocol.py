@@ -0,0 +1,155 @@
+# Line-oriented protocol for scripted players (bots) over stdin/stdout
+#
+#   NEW <id> [size] [ships] [seed] [difficulty]
+#       -> NEW <id> size=<n> ships=<n> seed=<n> difficulty=<level>
+#       (hard only up to MAX_SIZE: its heatmap is O(cells) per shot)
+#   FIRE <id> <cell>
+#       -> SHOT <id> player <cell> miss|hit|sunk [<ship>]
+#       -> SHOT <id> enemy <cell> miss|hit|sunk [<ship>]
+#       -> OVER <id> <winner> shots=<player shots>    (when it ends)
+#   END <id>  -> END <id>          (forget a game)
+#   QUIT      -> stop reading
+#   errors    -> ERR <id or -> <reason> [detail]
+#
+# Any number of games run side by side, multiplexed by id. Several
+# commands may share one line separated by ";"; their answers are
+# written together, and output is flushed once per input line.
+import sys
+
+from battleship import (
+    DIFFICULTIES, FLEET, LARGE_MAX_SIZE, MAX_SIZE, MIN_SIZE,
+    BattleshipGame, parse_position, position_name,
+)
+
+
+class ProtocolError(Exception):
+    """A command that cannot be run; reported as an ERR line."""
+
+    def __init__(self, reason, detail=""):
+        super().__init__(reason)
+        self.reason = reason
+        self.detail = detail
+
+
+def shot_line(game_id, side, shot, board) -> str:
+    """SHOT line for one resolved shot."""
+    r, c, hit = shot
+    line = f"SHOT {game_id} {side} {position_name(r, c)} "
+    if not hit:
+        return line + "miss"
+    k = board.sunk_ship(r, c)
+    return line + ("hit" if k is None else f"sunk {FLEET[k][0]}")
+
+
+class ProtocolSession:
+    """Games of one protocol stream, keyed by the client's ids."""
+
+    def __init__(self):
+        self.games = {}
+
+    # ----- Commands -----
+    def cmd_new(self, game_id, size=str(MIN_SIZE), ships="3", seed=None,
+                difficulty="easy"):
+        try:
+            size, ships = int(size), int(ships)
+            seed = None if seed is None else int(seed)
+        except ValueError:
+            raise ProtocolError("bad-argument") from None
+        if not MIN_SIZE <= size <= LARGE_MAX_SIZE:
+            raise ProtocolError("bad-size", f"{MIN_SIZE}-{LARGE_MAX_SIZE}")
+        if not 1 <= ships <= len(FLEET):
+            raise ProtocolError("bad-ships", f"1-{len(FLEET)}")
+        if difficulty not in DIFFICULTIES:
+            raise ProtocolError("bad-difficulty", "|".join(DIFFICULTIES))
+        if difficulty == "hard" and size > MAX_SIZE:
+            raise ProtocolError("bad-size", f"{MIN_SIZE}-{MAX_SIZE} for hard")
+        game = BattleshipGame(size=size, num_ships=ships, seed=seed,
+                              difficulty=difficulty)
+        self.games[game_id] = game
+        return [f"NEW {game_id} size={size} ships={ships} "
+                f"seed={game.seed} difficulty={difficulty}"]
+
+    def cmd_fire(self, game_id, cell):
+        game = self._game(game_id)
+        if game.winner() is not None:
+            raise ProtocolError("game-over")
+        try:
+            r, c = parse_position(cell, game.size)
+        except ValueError:
+            raise ProtocolError("bad-cell", cell) from None
+        if game.enemy_fleet.tried & game.enemy_fleet.bit(r, c):
+            raise ProtocolError("already-tried", position_name(r, c))
+
+        game.player_shot(r, c)
+        lines = [shot_line(game_id, "player", game.last_player_shot,
+                           game.enemy_fleet)]
+        if game.winner() is None:
+            game.enemy_turn()
+            if game.last_enemy_shot is not None:
+                lines.append(shot_line(game_id, "enemy", game.last_enemy_shot,
+                                       game.player_fleet))
+        winner = game.winner()
+        if winner is not None:
+            lines.append(f"OVER {game_id} {winner} "
+                         f"shots={game.total_player_shots}")
+        return lines
+
+    def cmd_end(self, game_id):
+        self._game(game_id)
+        del self.games[game_id]
+        return [f"END {game_id}"]
+
+    def _game(self, game_id):
+        game = self.games.get(game_id)
+        if game is None:
+            raise ProtocolError("no-game")
+        return game
+
+    # ----- Dispatch -----
+    # name -> (handler, min arguments, max arguments), id included
+    COMMANDS = {
+        "NEW": (cmd_new, 1, 5),
+        "FIRE": (cmd_fire, 2, 2),
+        "END": (cmd_end, 1, 1),
+    }
+
+    def handle(self, command) -> list[str]:
+        """Answer lines for one command ('FIRE g1 A1')."""
+        name, *args = command.split()
+        name = name.upper()
+        game_id = args[0] if args else "-"
+        try:
+            if name not in self.COMMANDS:
+                raise ProtocolError("unknown-command", name)
+            handler, least, most = self.COMMANDS[name]
+            if not least <= len(args) <= most:
+                raise ProtocolError("bad-arguments", name)
+            return handler(self, *args)
+        except ProtocolError as err:
+            return [f"ERR {game_id} {err.reason} {err.detail}".rstrip()]
+
+
+def serve(infile=None, outfile=None) -> int:
+    """Run commands from infile until QUIT or end of input."""
+    infile = infile or sys.stdin
+    outfile = outfile or sys.stdout
+    session = ProtocolSession()
+    for line in infile:
+        out = []
+        for command in line.split(";"):
+            command = command.strip()
+            if not command or command.startswith("#"):
+                continue
+            if command.upper() == "QUIT":
+                outfile.write("".join(out))
+                outfile.flush()
+                return 0
+            out.extend(f"{answer}\n" for answer in session.handle(command))
+        if out:
+            outfile.write("".join(out))
+            outfile.flush()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(serve())
@@ -0,0 +1,166 @@
+# Token-bucket rate limits and a concurrency cap for the engine routes
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from metrics import rejected
+
+
+class TokenBuckets:
+    """Thread-safe token buckets, one per key (a client or a game).
+
+    Each bucket refills at rate tokens per second up to burst. take() is
+    O(1): buckets live in an OrderedDict ordered by last use, so idle
+    buckets are evicted from the front. A bucket idle for burst / rate
+    seconds is full again, so dropping it changes nothing; max_keys
+    bounds memory when many keys are active at once.
+    """
+
+    def __init__(self, rate, burst, max_keys=100_000, clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self.clock = clock
+        self._lock = threading.Lock()
+        # key -> (tokens, last_update)
+        self._buckets = OrderedDict()
+
+        # Counters
+        self.limited = 0
+        self.evictions = 0
+
+    def take(self, key, cost=1.0) -> float:
+        """Spend cost tokens -> 0.0, or the seconds to wait if over limit."""
+        now = self.clock()
+        with self._lock:
+            entry = self._buckets.pop(key, None)
+            if entry is None:
+                tokens = self.burst
+            else:
+                tokens, last = entry
+                tokens = min(self.burst, tokens + (now - last) * self.rate)
+            if tokens >= cost:
+                tokens -= cost
+                wait = 0.0
+            else:
+                wait = (cost - tokens) / self.rate
+                self.limited += 1
+            self._buckets[key] = (tokens, now)
+            self._evict(now)
+        return wait
+
+    def _evict(self, now):
+        """Drop refilled buckets, then the least recently used past max."""
+        refill = self.burst / self.rate
+        buckets = self._buckets
+        while buckets:
+            _, last = next(iter(buckets.values()))
+            if len(buckets) <= self.max_keys and now - last < refill:
+                break
+            buckets.popitem(last=False)
+            self.evictions += 1
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class ConcurrencyLimit:
+    """At most limit requests in flight; the rest are shed at once.
+
+    Shedding early keeps the admitted requests fast instead of letting
+    every request queue for the GIL and time out together.
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self._slots = threading.BoundedSemaphore(limit)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.shed = 0
+
+    def acquire(self) -> bool:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.shed += 1
+            return False
+        with self._lock:
+            self.in_flight += 1
+        return True
+
+    def release(self):
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+
+def retry_after(wait) -> str:
+    """Retry-After header value: whole seconds, at least 1."""
+    return str(max(1, math.ceil(wait)))
+
+
+class ClientRateLimit:
+    """WSGI middleware: per-client token buckets on the given paths.
+
+    Runs before Flask, so a refused request never decodes the session
+    or builds a request context: the 429 is a few bytes written at once.
+    costs maps path -> tokens; a client is REMOTE_ADDR (put ProxyFix
+    outside this middleware when behind a proxy).
+    """
+
+    BODY = b'{"error":"client rate limit, retry later"}\n'
+
+    def __init__(self, app, costs, buckets: TokenBuckets):
+        self.app = app
+        self.costs = costs
+        self.buckets = buckets
+
+    def __call__(self, environ, start_response):
+        cost = self.costs.get(environ.get("PATH_INFO"))
+        if cost is not None:
+            wait = self.buckets.take(environ.get("REMOTE_ADDR", ""), cost)
+            if wait:
+                rejected.inc("client rate limit")
+                start_response("429 Too Many Requests", [
+                    ("Content-Type", "application/json"),
+                    ("Content-Length", str(len(self.BODY))),
+                    ("Retry-After", retry_after(wait)),
+                ])
+                return [self.BODY]
+        return self.app(environ, start_response)
+
+
+def protect_app(app, endpoints, games, concurrency, game_key):
+    """Per-game rate limit and a concurrency cap on the given endpoints.
+
+    Endpoints other than "setup" take one token from the bucket of
+    game_key() when there is a game: over the limit -> 429 with
+    Retry-After. More than the cap in flight at once -> 503.
+    """
+    from flask import g, jsonify, request
+
+    def refuse(status, reason, wait):
+        rejected.inc(reason)
+        response = jsonify(error=f"{reason}, retry later")
+        response.status_code = status
+        response.headers["Retry-After"] = retry_after(wait)
+        return response
+
+    @app.before_request
+    def limit_request():
+        if request.endpoint not in endpoints:
+            return None
+        game_id = game_key() if request.endpoint != "setup" else None
+        if game_id is not None:
+            wait = games.take(game_id)
+            if wait:
+                return refuse(429, "game rate limit", wait)
+        if not concurrency.acquire():
+            return refuse(503, "server busy", 1)
+        g.holding_slot = True
+        return None
+
+    @app.teardown_request
+    def release_slot(exc):
+        if g.pop("holding_slot", False):
+            concurrency.release()
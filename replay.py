@@ -0,0 +1,202 @@
+# Event-sourced move log with snapshotted replay
+import struct
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+
+from battleship import _SALVO, DIFFICULTIES, BattleshipGame
+
+# Stream layout: file header, then length-prefixed records
+#   header  = magic, log format, size, ships, difficulty (| _SALVO), seed
+#   record  = kind (u8), length (u32), payload
+#   MOVES   payload = packed 2-byte move codes
+#   SNAPSHOT payload = move count (u32) + state without the move log
+MAGIC = b"BSLG"
+LOG_FORMAT = 1
+_HEADER = struct.Struct("<4sBBBBQ")
+_RECORD = struct.Struct("<BI")
+_TURN = struct.Struct("<I")
+MOVES = 1
+SNAPSHOT = 2
+
+
+def log_header(game) -> bytes:
+    """Stream header for a game (or GameLog): everything but the moves."""
+    level = DIFFICULTIES.index(game.difficulty)
+    if game.salvo:
+        level |= _SALVO
+    return _HEADER.pack(MAGIC, LOG_FORMAT, game.size, game.num_ships,
+                        level, game.seed)
+
+
+class GameLog:
+    """Append-only log of one game's shots plus periodic snapshots.
+
+    The seed reproduces the ship placement; the moves reproduce every
+    shot. A snapshot every `snapshot_every` moves lets game_at(n) start
+    from the nearest earlier snapshot (bisect, O(log N)) and replay at
+    most `snapshot_every` moves instead of the whole log.
+    """
+
+    def __init__(self, size, num_ships, seed, difficulty="easy",
+                 snapshot_every=32, salvo=False):
+        self.size = size
+        self.num_ships = num_ships
+        self.seed = seed
+        self.difficulty = difficulty
+        self.salvo = salvo
+        self.snapshot_every = snapshot_every
+        self.moves = bytearray()
+        self.snapshot_turns = [0]
+        self.snapshots = [self.initial_game().to_bytes(moves=False)]
+
+    @classmethod
+    def from_game(cls, game, snapshot_every=32):
+        """Log of a (live or stored) game, built from its seed and moves."""
+        log = cls(game.size, game.num_ships, game.seed, game.difficulty,
+                  snapshot_every, game.salvo)
+        log.record(game)
+        return log
+
+    def __len__(self):
+        """Number of logged moves."""
+        return len(self.moves) // 2
+
+    def initial_game(self) -> BattleshipGame:
+        """The game before any shot (placement reproduced from the seed)."""
+        return BattleshipGame(size=self.size, num_ships=self.num_ships,
+                              seed=self.seed, difficulty=self.difficulty,
+                              salvo=self.salvo)
+
+    # ----- Recording -----
+    def record(self, game):
+        """Append the moves `game` made since the last call."""
+        if len(game.moves) < len(self.moves):
+            raise ValueError("game history is shorter than this log")
+        new = game.moves[len(self.moves):]
+        for i in range(0, len(new), 2):
+            self._append(int.from_bytes(new[i:i + 2], "little"))
+
+    def _append(self, code):
+        self.moves += code.to_bytes(2, "little")
+        turn = len(self)
+        if turn - self.snapshot_turns[-1] >= self.snapshot_every:
+            game = self.game_at(turn)
+            # Snapshot first: a concurrent game_at() only finds it by turn
+            self.snapshots.append(game.to_bytes(moves=False))
+            self.snapshot_turns.append(turn)
+
+    # ----- Replay -----
+    def game_at(self, turn=None) -> BattleshipGame:
+        """Reconstruct the game after `turn` moves (default: all)."""
+        turn = len(self) if turn is None else turn
+        if not 0 <= turn <= len(self):
+            raise IndexError(f"turn {turn} outside 0..{len(self)}")
+
+        k = bisect_right(self.snapshot_turns, turn) - 1
+        start = self.snapshot_turns[k]
+        game = BattleshipGame.from_bytes(self.snapshots[k])
+        game.moves = bytearray(self.moves[:start * 2])
+        for i in range(start, turn):
+            game.apply_move(int.from_bytes(self.moves[i * 2:i * 2 + 2],
+                                           "little"))
+        return game
+
+    # ----- Streaming -----
+    def header(self) -> bytes:
+        return log_header(self)
+
+    def to_bytes(self) -> bytes:
+        """Header, every snapshot and the moves as one stream."""
+        parts = [self.header()]
+        for turn, state in zip(self.snapshot_turns[1:], self.snapshots[1:]):
+            payload = _TURN.pack(turn) + state
+            parts.append(_RECORD.pack(SNAPSHOT, len(payload)) + payload)
+        parts.append(_RECORD.pack(MOVES, len(self.moves)) + self.moves)
+        return b"".join(parts)
+
+    def write(self, fp):
+        fp.write(self.to_bytes())
+
+    @classmethod
+    def read(cls, fp, snapshot_every=32) -> "GameLog":
+        """Read a stream written by write() or LogWriter."""
+        raw = fp.read(_HEADER.size)
+        magic, fmt, size, ships, level, seed = _HEADER.unpack(raw)
+        if magic != MAGIC or fmt != LOG_FORMAT:
+            raise ValueError("not a battleship move log")
+
+        log = cls(size, ships, seed, DIFFICULTIES[level & ~_SALVO],
+                  snapshot_every, bool(level & _SALVO))
+        snapshots = {}
+        moves = bytearray()
+        while True:
+            head = fp.read(_RECORD.size)
+            if len(head) < _RECORD.size:
+                break
+            kind, length = _RECORD.unpack(head)
+            payload = fp.read(length)
+            if kind == MOVES:
+                moves += payload
+            elif kind == SNAPSHOT:
+                (turn,) = _TURN.unpack_from(payload)
+                snapshots[turn] = payload[_TURN.size:]
+
+        if not snapshots:
+            # Plain move stream (e.g. from LogWriter): rebuild snapshots
+            for i in range(0, len(moves), 2):
+                log._append(int.from_bytes(moves[i:i + 2], "little"))
+            return log
+
+        log.moves = moves
+        for turn in sorted(snapshots):
+            if 0 < turn <= len(log):
+                log.snapshot_turns.append(turn)
+                log.snapshots.append(snapshots[turn])
+        return log
+
+
+class LogCache:
+    """The GameLogs of recently replayed games, kept in step with them.
+
+    log_of() appends only the moves a game made since its log was last
+    used, so seeking a live game costs O(log N + k) rather than a
+    rebuild of the whole log. A game whose history no longer extends
+    its log (a new game, or an older saved state) gets a fresh one.
+    """
+
+    def __init__(self, max_logs=1024):
+        self.max_logs = max_logs
+        self._logs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def log_of(self, key, game) -> GameLog:
+        with self._lock:
+            log = self._logs.get(key)
+            if log is None or log.seed != game.seed \
+                    or not game.moves.startswith(log.moves):
+                log = GameLog.from_game(game)
+                self._logs[key] = log
+            else:
+                log.record(game)
+            self._logs.move_to_end(key)
+            while len(self._logs) > self.max_logs:
+                self._logs.popitem(last=False)
+            return log
+
+
+class LogWriter:
+    """Stream a live game's moves to a file as they happen."""
+
+    def __init__(self, fp, game):
+        self.fp = fp
+        self.written = 0  # bytes of game.moves already written
+        fp.write(log_header(game))
+        self.record(game)
+
+    def record(self, game):
+        """Append the moves made since the last call as one record."""
+        new = game.moves[self.written:]
+        if new:
+            self.fp.write(_RECORD.pack(MOVES, len(new)) + new)
+            self.written += len(new)
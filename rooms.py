@@ -0,0 +1,245 @@
+# Human-vs-human rooms, matchmaking lobby and long-poll notification
+import random
+import secrets
+import threading
+import time
+from collections import deque
+
+from battleship import (
+    FLEET, BitBoard, fleet_lengths, parse_position, place_fleet,
+    position_name,
+)
+
+
+class Room:
+    """One PvP game between two players, guarded by its own lock.
+
+    boards[i] is player i's own fleet; player i fires at boards[1 - i].
+    Every change bumps version and wakes the waiters of this room only.
+    """
+
+    def __init__(self, room_id, players, size=10, num_ships=5, seed=None):
+        rng = random.Random(seed)
+        lengths = fleet_lengths(num_ships)
+        self.id = room_id
+        self.players = tuple(players)
+        self.size = size
+        self.num_ships = num_ships
+        self.boards = tuple(BitBoard(size, place_fleet(size, lengths, rng))
+                            for _ in players)
+        # Emoji rows per board: (as its owner sees it, as the opponent
+        # does); a shot patches one cell instead of redrawing the board.
+        self.rows = tuple((_rows(b, reveal=True), _rows(b, reveal=False))
+                          for b in self.boards)
+        self.shots = [0, 0]
+        self.turn = rng.randrange(2)  # seat to move
+        self.winner = None            # seat index once the game is over
+        self.last_shot = None         # (seat, r, c, hit)
+        self.version = 0
+        self.updated = time.monotonic()
+        self.cond = threading.Condition()
+
+    def seat(self, player) -> int:
+        """Seat index (0 or 1) of a player; KeyError if not in the room."""
+        try:
+            return self.players.index(player)
+        except ValueError:
+            raise KeyError(player) from None
+
+    def _changed(self):
+        """Caller holds cond: publish a new version to the waiters."""
+        self.version += 1
+        self.updated = time.monotonic()
+        self.cond.notify_all()
+
+    # ----- Moves -----
+    def fire(self, player, position) -> str:
+        """Resolve player's shot; returns a message, ValueError if illegal."""
+        seat = self.seat(player)
+        with self.cond:
+            if self.winner is not None:
+                raise ValueError("Game over.")
+            if self.turn != seat:
+                raise ValueError("Not your turn.")
+            target = self.boards[1 - seat]
+            r, c = parse_position(position, self.size)
+            pos = position_name(r, c)
+            if target.tried & target.bit(r, c):
+                raise ValueError("⚠️ Already tried that sector.")
+
+            hit = target.fire(r, c)
+            for reveal, rows in zip((True, False), self.rows[1 - seat]):
+                row = rows[r]
+                rows[r] = row[:c] + target.symbol(r, c, reveal) \
+                    + row[c + 1:]
+            self.shots[seat] += 1
+            self.last_shot = (seat, r, c, hit)
+            if target.all_sunk():
+                self.winner = seat
+            else:
+                self.turn = 1 - seat
+            self._changed()
+
+        if not hit:
+            return f"💦 Miss at {pos}."
+        k = target.sunk_ship(r, c)
+        if k is None:
+            return f"💥 Hit at {pos}!"
+        return f"💥 Hit at {pos}! {FLEET[k][0]} sunk!"
+
+    def leave(self, player):
+        """Forfeit: the other player wins."""
+        seat = self.seat(player)
+        with self.cond:
+            if self.winner is None:
+                self.winner = 1 - seat
+                self._changed()
+
+    def wait(self, since, timeout) -> bool:
+        """Block until version > since (True) or timeout (False)."""
+        with self.cond:
+            return self.cond.wait_for(lambda: self.version > since, timeout)
+
+    # ----- Views -----
+    def view(self, player) -> dict:
+        """JSON-ready state as seen by one player."""
+        seat = self.seat(player)
+        with self.cond:
+            own, other = self.boards[seat], self.boards[1 - seat]
+            last = None
+            if self.last_shot is not None:
+                by, r, c, hit = self.last_shot
+                last = {"by": "you" if by == seat else "opponent",
+                        "cell": position_name(r, c),
+                        "result": "hit" if hit else "miss"}
+            return {
+                "room": self.id,
+                "version": self.version,
+                "size": self.size,
+                "turn": "you" if self.turn == seat else "opponent",
+                "winner": None if self.winner is None
+                else "you" if self.winner == seat else "opponent",
+                "last_shot": last,
+                "your_board": list(self.rows[seat][0]),
+                "opponent_board": list(self.rows[1 - seat][1]),
+                "your_ships": own.ships_afloat,
+                "opponent_ships": other.ships_afloat,
+                "your_shots": self.shots[seat],
+                "opponent_shots": self.shots[1 - seat],
+            }
+
+
+def _rows(board, reveal):
+    """Emoji rows of a board (every symbol is one code point)."""
+    size = board.size
+    return ["".join(board.symbol(r, c, reveal) for c in range(size))
+            for r in range(size)]
+
+
+class RoomRegistry:
+    """All rooms of this process; the lock only guards the dicts."""
+
+    def __init__(self, size=10, num_ships=5, idle_ttl=3600):
+        self.size = size
+        self.num_ships = num_ships
+        self.idle_ttl = idle_ttl
+        self._lock = threading.Lock()
+        self._rooms = {}      # room id -> Room
+        self._player_room = {}  # player -> room id
+        self._created = 0
+
+    def create(self, players) -> Room:
+        room = Room(secrets.token_urlsafe(8), players, self.size,
+                    self.num_ships)
+        with self._lock:
+            self._rooms[room.id] = room
+            for player in players:
+                self._player_room[player] = room.id
+            self._created += 1
+            sweep = self._created % 256 == 0
+        if sweep:
+            self.sweep()
+        return room
+
+    def get(self, room_id):
+        return self._rooms.get(room_id)
+
+    def room_of(self, player):
+        """The player's current room, or None."""
+        room_id = self._player_room.get(player)
+        return None if room_id is None else self._rooms.get(room_id)
+
+    def remove(self, room):
+        with self._lock:
+            self._rooms.pop(room.id, None)
+            for player in room.players:
+                if self._player_room.get(player) == room.id:
+                    del self._player_room[player]
+
+    def sweep(self):
+        """Drop rooms idle for longer than idle_ttl."""
+        cutoff = time.monotonic() - self.idle_ttl
+        for room in [r for r in list(self._rooms.values())
+                     if r.updated < cutoff]:
+            self.remove(room)
+
+    def __len__(self):
+        return len(self._rooms)
+
+
+class _Ticket:
+    """A waiting player's place in the lobby."""
+
+    __slots__ = ("event", "room")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.room = None
+
+
+class Lobby:
+    """FIFO matchmaking: the second player to join meets the first.
+
+    join() is O(1): a deque of waiting players plus a dict of their
+    tickets. Leaving only drops the ticket; the stale queue entry is
+    skipped when it reaches the front.
+    """
+
+    def __init__(self, rooms: RoomRegistry):
+        self.rooms = rooms
+        self._lock = threading.Lock()
+        self._queue = deque()
+        self._tickets = {}  # waiting player -> _Ticket
+
+    def join(self, player):
+        """Pair player with the longest-waiting player -> Room, or None."""
+        with self._lock:
+            if player in self._tickets:
+                return None  # already waiting
+            while self._queue:
+                other = self._queue.popleft()
+                ticket = self._tickets.pop(other, None)
+                if ticket is None:
+                    continue  # left the lobby
+                room = self.rooms.create((other, player))
+                ticket.room = room
+                ticket.event.set()
+                return room
+            self._tickets[player] = _Ticket()
+            self._queue.append(player)
+            return None
+
+    def wait_match(self, player, timeout):
+        """Block until a waiting player is paired -> Room, or None."""
+        ticket = self._tickets.get(player)
+        if ticket is None:
+            return self.rooms.room_of(player)
+        ticket.event.wait(timeout)
+        return ticket.room
+
+    def leave(self, player):
+        with self._lock:
+            self._tickets.pop(player, None)
+
+    def waiting(self) -> int:
+        return len(self._tickets)
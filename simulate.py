@@ -0,0 +1,233 @@
+# Headless AI-vs-AI simulation (no terminal I/O)
+import argparse
+import os
+import random
+import time
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from battleship import BattleshipGame, fleet_lengths, position_name
+
+GameResult = namedtuple(
+    "GameResult",
+    "size num_ships winner player_shots enemy_shots",
+)
+
+
+def game_seed(base_seed, size, num_ships, index) -> int:
+    """Deterministic per-game seed (independent of batch layout)."""
+    return random.Random(
+        f"{base_seed}:{size}:{num_ships}:{index}").getrandbits(32)
+
+
+def play_headless(size, num_ships, seed) -> GameResult:
+    """Play one random-vs-random game through player_turn/enemy_turn."""
+    game = BattleshipGame(size=size, num_ships=num_ships, seed=seed)
+
+    # The "player" side shoots a pre-shuffled order of every cell
+    order = list(range(size * size))
+    random.Random(seed ^ 0x5EED).shuffle(order)
+
+    winner = None
+    for i in order:
+        r, c = divmod(i, size)
+        game.player_turn(position_name(r, c))
+        if not game.enemy_ships:
+            winner = "player"
+            break
+        game.enemy_turn()
+        if not game.player_ships:
+            winner = "enemy"
+            break
+
+    return GameResult(size, num_ships, winner,
+                      game.total_player_shots, game.total_enemy_shots)
+
+
+class SimStats:
+    """Aggregated results; mergeable so workers can send partial stats."""
+
+    def __init__(self):
+        self.games = 0
+        self.wins = Counter()          # (size, num_ships, winner) -> n
+        self.played = Counter()        # (size, num_ships) -> n
+        self.shots_to_win = Counter()  # winner's shot count -> n
+
+    def add(self, result: GameResult):
+        key = (result.size, result.num_ships)
+        self.games += 1
+        self.played[key] += 1
+        self.wins[key + (result.winner,)] += 1
+        shots = (result.player_shots if result.winner == "player"
+                 else result.enemy_shots)
+        self.shots_to_win[shots] += 1
+
+    def merge(self, other: "SimStats"):
+        self.games += other.games
+        self.played.update(other.played)
+        self.wins.update(other.wins)
+        self.shots_to_win.update(other.shots_to_win)
+
+    def win_rate(self, size, num_ships, winner="player") -> float:
+        played = self.played[(size, num_ships)]
+        return self.wins[(size, num_ships, winner)] / played if played else 0.0
+
+    def mean_shots(self) -> float:
+        total = sum(self.shots_to_win.values())
+        if not total:
+            return 0.0
+        return sum(s * n for s, n in self.shots_to_win.items()) / total
+
+    def summary(self) -> dict:
+        return {
+            "games": self.games,
+            "mean_shots_to_win": round(self.mean_shots(), 2),
+            "shots_to_win": dict(sorted(self.shots_to_win.items())),
+            "player_win_rate": {
+                f"{size}x{size}/{ships}": round(
+                    self.win_rate(size, ships), 4)
+                for size, ships in sorted(self.played)
+            },
+        }
+
+
+def run_batch(size, num_ships, base_seed, start, count) -> SimStats:
+    """Worker entry point: play games start..start+count, return stats."""
+    stats = SimStats()
+    for index in range(start, start + count):
+        seed = game_seed(base_seed, size, num_ships, index)
+        stats.add(play_headless(size, num_ships, seed))
+    return stats
+
+
+def simulate(configs, games_per_config, base_seed=0, workers=None,
+             batch_size=500):
+    """Fan batches out over a process pool; yield running SimStats.
+
+    configs is an iterable of (size, num_ships) pairs. A merged
+    snapshot is yielded every time a batch finishes.
+    """
+    workers = workers or os.cpu_count() or 1
+    total = SimStats()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(run_batch, size, ships, base_seed, start,
+                        min(batch_size, games_per_config - start))
+            for size, ships in configs
+            for start in range(0, games_per_config, batch_size)
+        ]
+        for future in as_completed(futures):
+            total.merge(future.result())
+            yield total
+
+
+# ========= Lockstep (NumPy) mode =========
+def lockstep(size, num_ships, games, seed=0) -> dict:
+    """Step many random-vs-random games at once as NumPy arrays.
+
+    Every game in the batch advances one shot per side per step, so the
+    cost per step is a handful of vectorized array operations. Random
+    shooters cannot see ship shapes, so each fleet is drawn as the same
+    number of random cells, which gives the same outcome distribution.
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    cells = size * size
+    ship_cells = sum(fleet_lengths(num_ships))
+    rows = np.arange(games)
+
+    def random_orders():
+        return np.argsort(rng.random((games, cells)), axis=1)
+
+    def random_fleets():
+        ships = np.zeros((games, cells), dtype=bool)
+        ships[rows[:, None], random_orders()[:, :ship_cells]] = True
+        return ships
+
+    enemy_ships, player_ships = random_fleets(), random_fleets()
+    player_order, enemy_order = random_orders(), random_orders()
+    enemy_left = np.full(games, ship_cells)
+    player_left = np.full(games, ship_cells)
+    winner = np.zeros(games, dtype=np.int8)  # 0 running, 1 player, 2 enemy
+    shots = np.zeros(games, dtype=np.int32)
+
+    started = time.perf_counter()
+    for step in range(cells):
+        running = winner == 0
+        if not running.any():
+            break
+        enemy_left -= running & enemy_ships[rows, player_order[:, step]]
+        won = running & (enemy_left == 0)
+        winner[won] = 1
+        shots[won] = step + 1
+
+        running &= ~won
+        player_left -= running & player_ships[rows, enemy_order[:, step]]
+        lost = running & (player_left == 0)
+        winner[lost] = 2
+        shots[lost] = step + 1
+    elapsed = time.perf_counter() - started
+
+    values, counts = np.unique(shots, return_counts=True)
+    return {
+        "games": games,
+        "player_win_rate": float((winner == 1).mean()),
+        "mean_shots_to_win": float(shots.mean()),
+        "shots_to_win": dict(zip(values.tolist(), counts.tolist())),
+        "seconds": elapsed,
+        "games_per_second": games / elapsed if elapsed else float("inf"),
+    }
+
+
+# ========= CLI =========
+def _int_range(text):
+    """Parse '8-15' or '8' into a range."""
+    low, _, high = text.partition("-")
+    return range(int(low), int(high or low) + 1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless Battleship sims")
+    parser.add_argument("--games", type=int, default=10_000,
+                        help="games per (size, ships) pair")
+    parser.add_argument("--sizes", type=_int_range, default=range(8, 16))
+    parser.add_argument("--ships", type=_int_range, default=range(1, 6))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--lockstep", action="store_true",
+                        help="NumPy lockstep mode (single core)")
+    args = parser.parse_args(argv)
+
+    configs = [(s, n) for s in args.sizes for n in args.ships]
+
+    if args.lockstep:
+        for size, ships in configs:
+            result = lockstep(size, ships, args.games, seed=args.seed)
+            print(f"{size}x{size} ships={ships}: "
+                  f"{result['games_per_second']:,.0f} games/s/core, "
+                  f"player wins {result['player_win_rate']:.1%}, "
+                  f"mean shots {result['mean_shots_to_win']:.1f}")
+        return
+
+    workers = args.workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    stats = SimStats()
+    for stats in simulate(configs, args.games, args.seed, workers,
+                          args.batch_size):
+        rate = stats.games / (time.perf_counter() - started)
+        print(f"\r{stats.games:,} games  {rate:,.0f} games/s  "
+              f"mean shots to win {stats.mean_shots():.1f}",
+              end="", flush=True)
+    elapsed = time.perf_counter() - started
+    print()
+    print(f"{stats.games / elapsed / workers:,.0f} games/s per core "
+          f"({workers} workers)")
+    for (size, ships) in sorted(stats.played):
+        print(f"{size}x{size} ships={ships}: "
+              f"player wins {stats.win_rate(size, ships):.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+# Posterior ship probabilities for the hint endpoint
+import random
+import time
+from bisect import bisect_right
+from collections import namedtuple
+from functools import lru_cache
+from itertools import accumulate, product
+
+from battleship import placements
+
+# Exact enumeration gives up past this many (state, placement) steps
+EXACT_WORK = 20_000
+# Time for one answer; sampling stops at the deadline or MAX_SAMPLES
+TIME_BUDGET = 0.04
+MAX_SAMPLES = 50_000
+
+Posterior = namedtuple("Posterior", "grid method samples")
+Posterior.__doc__ = """Ship probability per cell (tried cells are None).
+
+method is "exact" or "sampled"; samples counts the accepted samples
+(0 for exact answers).
+"""
+
+
+def _spread(size, weights, total, tried):
+    """Per-cell probability from placement weights ({mask: weight})."""
+    cells = [0.0] * (size * size)
+    for mask, weight in weights.items():
+        while mask:
+            low = mask & -mask
+            cells[low.bit_length() - 1] += weight
+            mask ^= low
+    return tuple(
+        tuple(None if tried >> (r * size + c) & 1
+              else cells[r * size + c] / total
+              for c in range(size))
+        for r in range(size)
+    )
+
+
+def _candidates(size, lengths, blocked):
+    """Placements of each ship that avoid misses and sunk ships."""
+    return [[m for m in placements(size, length) if not m & blocked]
+            for length in lengths]
+
+
+# ========= Exact: layered enumeration with merged states =========
+def _exact(candidates, open_hits, lengths, deadline):
+    """{mask: configurations using it} and the total, or None if too big.
+
+    Layer k maps each set of occupied cells reachable after placing k
+    ships to the number of ways to reach it, so orderings that end in
+    the same cells are counted once. A backward pass counts the valid
+    completions of every state (all open hits covered at the end).
+    """
+    n = len(candidates)
+    left = [sum(lengths[k:]) for k in range(n + 1)]
+    layers = [{0: 1}]
+    work = 0
+    for k, cands in enumerate(candidates):
+        work += len(layers[-1]) * len(cands)
+        if work > EXACT_WORK or time.perf_counter() > deadline:
+            return None
+        nxt = {}
+        for occupied, ways in layers[-1].items():
+            for m in cands:
+                if m & occupied:
+                    continue
+                state = occupied | m
+                # Prune: remaining ships cannot cover the open hits
+                if (open_hits & ~state).bit_count() > left[k + 1]:
+                    continue
+                nxt[state] = nxt.get(state, 0) + ways
+        layers.append(nxt)
+
+    # Completions per state, last layer first
+    completions = {s: 0 if open_hits & ~s else 1 for s in layers[n]}
+    weights = {}
+    for k in range(n - 1, -1, -1):
+        current = {}
+        for occupied, ways in layers[k].items():
+            total = 0
+            for m in candidates[k]:
+                if m & occupied:
+                    continue
+                done = completions.get(occupied | m, 0)
+                if done:
+                    total += done
+                    weights[m] = weights.get(m, 0) + ways * done
+            current[occupied] = total
+        completions = current
+    return weights, completions.get(0, 0)
+
+
+# ========= Sampled: stratified rejection sampling =========
+def _sample(candidates, open_hits, rng, deadline):
+    """{mask: accepted samples using it} and the accepted count.
+
+    Every ship draws uniformly from its candidate placements, which
+    are split into those touching an open hit and the rest; the set of
+    ships that touch a hit is drawn first, in proportion to the number
+    of tuples it covers. Rejecting overlaps and uncovered hits leaves
+    a uniform sample of the valid fleets.
+    """
+    split = [([m for m in c if m & open_hits],
+              [m for m in c if not m & open_hits]) for c in candidates]
+    # pick 0 = a placement touching an open hit, 1 = any other
+    choices, sizes = [], []
+    for choice in product((0, 1), repeat=len(split)):
+        if open_hits and 0 not in choice:
+            continue  # no ship touches a hit: never valid
+        count = 1
+        for pick, pools in zip(choice, split):
+            count *= len(pools[pick])
+        if count:
+            choices.append(choice)
+            sizes.append(count)
+    if not choices:
+        return {}, 0
+    sizes = list(accumulate(sizes))
+
+    weights = {}
+    accepted = 0
+    for attempt in range(MAX_SAMPLES):
+        if attempt % 256 == 0 and time.perf_counter() > deadline:
+            break
+        choice = choices[bisect_right(sizes, rng.random() * sizes[-1])]
+        occupied = 0
+        fleet = []
+        for pick, pools in zip(choice, split):
+            pool = pools[pick]
+            m = pool[rng.randrange(len(pool))]
+            if m & occupied:
+                break
+            occupied |= m
+            fleet.append(m)
+        else:
+            if open_hits & ~occupied:
+                continue
+            accepted += 1
+            for m in fleet:
+                weights[m] = weights.get(m, 0) + 1
+    return weights, accepted
+
+
+@lru_cache(maxsize=4096)
+def posterior(size, hits, misses, sunk, lengths) -> Posterior:
+    """Probability that each untried cell holds a ship.
+
+    hits, misses and sunk are the shooter's bitmasks and lengths the
+    ships still afloat. Every fleet consistent with them (no ship on
+    a miss or a sunk ship, every open hit covered) is equally likely.
+    Small cases are enumerated exactly; larger ones are sampled until
+    TIME_BUDGET runs out. Cached per board state.
+    """
+    deadline = time.perf_counter() + TIME_BUDGET
+    tried = hits | misses
+    lengths = tuple(sorted(lengths, reverse=True))
+    open_hits = hits & ~sunk
+    candidates = _candidates(size, lengths, misses | sunk)
+
+    exact = _exact(candidates, open_hits, lengths, deadline)
+    if exact is not None:
+        weights, total = exact
+        method, samples = "exact", 0
+    else:
+        rng = random.Random(f"{size}:{hits}:{misses}:{sunk}:{lengths}")
+        weights, total = _sample(candidates, open_hits, rng, deadline)
+        method, samples = "sampled", total
+    return Posterior(_spread(size, weights, total or 1, tried),
+                     method, samples)
+
+
+def best_cell(post):
+    """Most probable untried cell of a Posterior -> (r, c), or None."""
+    best, cell = -1.0, None
+    for r, row in enumerate(post.grid):
+        for c, p in enumerate(row):
+            if p is not None and p > best:
+                best, cell = p, (r, c)
+    return cell
@@ -0,0 +1,197 @@
+# SQLite-backed game store shared by every worker process
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from battleship import BattleshipGame
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id      TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    state   BLOB NOT NULL,
+    updated REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS games_updated ON games (updated);
+"""
+
+
+class SQLiteGameStore:
+    """Games persisted as compact blobs in one SQLite file (WAL mode).
+
+    Each thread gets its own connection; sqlite3 keeps compiled
+    statements per connection, so every query below is prepared once.
+    A small per-worker LRU of decoded games is validated against the
+    stored version on every read, so other workers' writes are always
+    seen. Saves are compare-and-set on that version.
+
+    A cached game is checked out by the request that loads it (a
+    concurrent request on the same game decodes its own copy from the
+    row) and comes back to the cache when that request saves it, so no
+    two requests ever share a mutable game.
+
+    With a ttl, games not saved for that many seconds are purged by
+    put() (at most once per purge_interval, so new games stay cheap).
+    """
+
+    def __init__(self, path, cache_size=1024, busy_timeout=5000, ttl=None,
+                 purge_interval=60, clock=time.time):
+        self.path = path
+        self.cache_size = cache_size
+        self.busy_timeout = busy_timeout
+        self.ttl = ttl
+        self.purge_interval = purge_interval
+        self.clock = clock
+        self._next_purge = 0.0
+        self._local = threading.local()
+        self._cache = OrderedDict()  # id -> (stored version, game)
+        self._cache_lock = threading.Lock()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.conflicts = 0
+
+        with self._connection() as db:
+            db.executescript(SCHEMA)
+
+    # ----- Connections -----
+    def _connection(self):
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, isolation_level=None,
+                                 check_same_thread=False,
+                                 cached_statements=64)
+            db.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout)}")
+            db.execute("PRAGMA journal_mode = WAL")
+            db.execute("PRAGMA synchronous = NORMAL")
+            self._local.db = db
+        return db
+
+    # ----- Read-through cache -----
+    def _checkout(self, key, version):
+        """Take the cached game at version out of the cache, or None."""
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None or entry[0] != version:
+                return None
+            del self._cache[key]
+            return entry[1]
+
+    def _remember(self, key, version, game):
+        with self._cache_lock:
+            self._cache[key] = (version, game)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def forget(self, key):
+        """Drop a game from this worker's cache (e.g. after a failure)."""
+        with self._cache_lock:
+            self._cache.pop(key, None)
+
+    # ----- Public API (same shape as GameStore) -----
+    def load(self, key):
+        """(game, stored version) for key, or (None, None).
+
+        The game is this caller's own copy; pass the version back to
+        save_many() as the loaded version.
+        """
+        db = self._connection()
+        row = db.execute("SELECT version FROM games WHERE id = ?",
+                         (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            self.forget(key)
+            return None, None
+        game = self._checkout(key, row[0])
+        if game is not None:
+            self.hits += 1
+            return game, row[0]
+
+        self.misses += 1
+        row = db.execute("SELECT version, state FROM games WHERE id = ?",
+                         (key,)).fetchone()
+        if row is None:
+            return None, None
+        return BattleshipGame.from_bytes(row[1]), row[0]
+
+    def get(self, key):
+        """Return the stored game for key (the caller's own copy), or None."""
+        return self.load(key)[0]
+
+    def put(self, key, game):
+        """Insert or replace a game unconditionally."""
+        self._connection().execute(
+            "INSERT OR REPLACE INTO games (id, version, state, updated) "
+            "VALUES (?, ?, ?, ?)",
+            (key, game.version, game.to_bytes(), self.clock()),
+        )
+        self.forget(key)  # the caller keeps using its game
+        if self.ttl is not None and self.clock() >= self._next_purge:
+            self._next_purge = self.clock() + self.purge_interval
+            self.purge(self.ttl)
+
+    def save_many(self, items):
+        """Write changed games in one transaction.
+
+        items are (key, game, loaded_version) triples. A game whose
+        stored version moved since it was loaded is not written; its key
+        is returned in the list of conflicts.
+        """
+        conflicts = []
+        db = self._connection()
+        now = self.clock()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            for key, game, loaded_version in items:
+                cursor = db.execute(
+                    "UPDATE games SET version = ?, state = ?, updated = ? "
+                    "WHERE id = ? AND version = ?",
+                    (game.version, game.to_bytes(), now, key,
+                     loaded_version),
+                )
+                if cursor.rowcount != 1:
+                    conflicts.append(key)
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            for key, _, _ in items:
+                self.forget(key)
+            raise
+
+        for key, game, _ in items:
+            if key in conflicts:
+                self.forget(key)
+            else:
+                self._remember(key, game.version, game)
+        self.conflicts += len(conflicts)
+        return conflicts
+
+    def delete(self, key):
+        self._connection().execute("DELETE FROM games WHERE id = ?", (key,))
+        self.forget(key)
+
+    def purge(self, idle_seconds):
+        """Delete games not saved for idle_seconds; returns the count."""
+        cursor = self._connection().execute(
+            "DELETE FROM games WHERE updated < ?",
+            (self.clock() - idle_seconds,),
+        )
+        return cursor.rowcount
+
+    def stats(self) -> dict:
+        (count,) = self._connection().execute(
+            "SELECT COUNT(*) FROM games").fetchone()
+        return {
+            "games": count,
+            "cached": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "conflicts": self.conflicts,
+        }
+
+    def __contains__(self, key):
+        return self._connection().execute(
+            "SELECT 1 FROM games WHERE id = ?", (key,)).fetchone() is not None
@@ -0,0 +1,264 @@
+# Pluggable AI strategies: shooters pick cells, placers place fleets
+from array import array
+from functools import lru_cache
+
+from battleship import place_fleet, placements
+
+SHOOTERS = {}
+PLACERS = {}
+DEFAULT_SHOOTER = "random"
+DEFAULT_PLACER = "random"
+
+
+def register_shooter(name):
+    """Class decorator: make a Shooter selectable by name."""
+    def register(cls):
+        cls.name = name
+        SHOOTERS[name] = cls
+        return cls
+    return register
+
+
+def register_placer(name):
+    """Function decorator: make a placer selectable by name."""
+    def register(fn):
+        PLACERS[name] = fn
+        return fn
+    return register
+
+
+def make_shooter(name, size, seed=None):
+    """New shooter instance (one per game side) for a registered name."""
+    try:
+        return SHOOTERS[name](size, seed)
+    except KeyError:
+        raise ValueError(f"unknown shooter {name!r}; "
+                         f"choose from {sorted(SHOOTERS)}") from None
+
+
+def get_placer(name):
+    """Registered placer by name: fn(size, lengths, rng) -> ship masks."""
+    try:
+        return PLACERS[name]
+    except KeyError:
+        raise ValueError(f"unknown placer {name!r}; "
+                         f"choose from {sorted(PLACERS)}") from None
+
+
+# ----- Bitmask helpers -----
+@lru_cache(maxsize=None)
+def _edges(size):
+    """(first column, last column, whole board, border) bitmasks."""
+    first = sum(1 << (r * size) for r in range(size))
+    full = (1 << (size * size)) - 1
+    last = first << (size - 1)
+    top = (1 << size) - 1
+    bottom = top << (size * (size - 1))
+    return first, last, full, first | last | top | bottom
+
+
+def neighbours(mask, size) -> int:
+    """Cells orthogonally next to any cell of mask (mask excluded)."""
+    first, last, full, _ = _edges(size)
+    around = ((mask >> 1) & ~last) | ((mask << 1) & ~first) \
+        | (mask >> size) | (mask << size)
+    return around & full & ~mask
+
+
+def _cells(mask):
+    """Cell indices of a bitmask."""
+    cells = []
+    while mask:
+        low = mask & -mask
+        cells.append(low.bit_length() - 1)
+        mask ^= low
+    return cells
+
+
+# ========= Shooters =========
+class Shooter:
+    """Picks the next cell to fire at on the opponent's BitBoard.
+
+    One instance per game side, so it may keep state between shots.
+    It must only use what a player can see: board.hits, board.misses,
+    board.sunk and board.lengths_left(). seed is the game's seed (or
+    None), for choices that must not change when a saved game rebuilds
+    its shooter.
+    """
+
+    name = None
+
+    def __init__(self, size, seed=None):
+        self.size = size
+        self.seed = seed
+
+    def choose(self, board, rng):
+        """Next untried cell -> (r, c), or None when none is left."""
+        raise NotImplementedError
+
+    def choose_salvo(self, board, rng, n):
+        """Up to n distinct untried cells for one salvo -> [(r, c), ...].
+
+        Picks one at a time on a view where the cells already picked
+        count as misses, so the salvo spreads out; none is fired yet.
+        """
+        aimed = _Aimed(board)
+        cells = []
+        for _ in range(n):
+            cell = self.choose(aimed, rng)
+            if cell is None:
+                break
+            cells.append(cell)
+            aimed.pending |= board.bit(*cell)
+        return cells
+
+
+class _Aimed:
+    """A BitBoard seen with the cells of a pending salvo as misses."""
+
+    __slots__ = ("board", "pending")
+
+    def __init__(self, board):
+        self.board = board
+        self.pending = 0
+
+    def __getattr__(self, name):
+        return getattr(self.board, name)
+
+    @property
+    def misses(self) -> int:
+        return self.board.misses | self.pending
+
+    @property
+    def tried(self) -> int:
+        return self.board.tried | self.pending
+
+
+@register_shooter("random")
+class RandomShooter(Shooter):
+    """Uniform random fire from a pre-shuffled pool (the easy AI)."""
+
+    def __init__(self, size, seed=None):
+        super().__init__(size, seed)
+        self.pool = None
+
+    def choose(self, board, rng):
+        # Pop from the end, skipping cells tried some other way. Each
+        # cell is popped at most once -> O(1) amortised.
+        if self.pool is None:
+            cells = array("H", range(self.size * self.size))
+            rng.shuffle(cells)
+            self.pool = cells
+        tried = board.tried
+        while self.pool:
+            i = self.pool.pop()
+            if not tried >> i & 1:
+                return divmod(i, self.size)
+        return None
+
+
+@register_shooter("hunt-target")
+class HuntTargetShooter(RandomShooter):
+    """Checkerboard hunt; after a hit, fire next to the open hits."""
+
+    def choose(self, board, rng):
+        if self.pool is None:
+            # Odd-parity cells first (popped last): the hunt only needs
+            # every other cell to find ships of length 2 or more.
+            odd = [i for i in range(self.size * self.size)
+                   if sum(divmod(i, self.size)) % 2]
+            even = [i for i in range(self.size * self.size)
+                    if not sum(divmod(i, self.size)) % 2]
+            rng.shuffle(odd)
+            rng.shuffle(even)
+            self.pool = array("H", odd + even)
+
+        targets = neighbours(board.hits & ~board.sunk, self.size) \
+            & ~board.tried
+        if targets:
+            cells = _cells(targets)
+            return divmod(cells[rng.randrange(len(cells))], self.size)
+        return super().choose(board, rng)
+
+
+@register_shooter("heatmap")
+class HeatmapShooter(Shooter):
+    """Probability-density hunt/target AI (see enemy_ai)."""
+
+    def choose(self, board, rng):
+        from enemy_ai import choose_target
+        if board.tried.bit_count() >= self.size ** 2:
+            return None
+        return choose_target(board, rng)
+
+
+@register_shooter("opening")
+class OpeningShooter(HeatmapShooter):
+    """Precomputed opening (openings.py) until the first hit, then heatmap.
+
+    Each game plays the book through one of the 8 symmetries of the
+    board, taken from the game's seed so that it survives a reload and
+    the opening differs between games.
+    """
+
+    def __init__(self, size, seed=None):
+        super().__init__(size, seed)
+        self.symmetry = None if seed is None else seed % 8
+
+    def choose(self, board, rng):
+        if not board.hits:
+            cell = self._book_move(board, rng)
+            if cell is not None:
+                return cell
+        return super().choose(board, rng)
+
+    def _book_move(self, board, rng):
+        from openings import load_book, transform
+        book = load_book()
+        if book is None:
+            return None
+        if self.symmetry is None:
+            self.symmetry = rng.randrange(8)
+        # No hits yet: every shot so far missed and all ships are afloat
+        cell = book.move(self.size, len(board.lengths_left()),
+                         board.misses.bit_count())
+        if cell is None:
+            return None
+        r, c = transform(cell, self.size, self.symmetry)
+        return None if board.tried & board.bit(r, c) else (r, c)
+
+
+# ========= Placers =========
+register_placer("random")(place_fleet)
+
+
+def _place_filtered(size, lengths, rng, allowed, spacing=False):
+    """Random fleet using only placements allowed(mask) where possible.
+
+    spacing=True also keeps ships from touching. Bounded picks per ship
+    from the filtered index; a dead end falls back to place_fleet.
+    """
+    fleet = []
+    blocked = 0
+    for length in lengths:
+        options = [m for m in placements(size, length)
+                   if allowed(m) and not m & blocked]
+        if not options:
+            return place_fleet(size, lengths, rng)
+        mask = options[rng.randrange(len(options))]
+        fleet.append(mask)
+        blocked |= mask | (neighbours(mask, size) if spacing else 0)
+    return tuple(fleet)
+
+
+@register_placer("edges")
+def place_on_edges(size, lengths, rng):
+    """Ships along the border (defeats centre-weighted searches)."""
+    border = _edges(size)[3]
+    return _place_filtered(size, lengths, rng, lambda m: m & border)
+
+
+@register_placer("spread")
+def place_spread(size, lengths, rng):
+    """Ships never touching each other (one hit reveals only one ship)."""
+    return _place_filtered(size, lengths, rng, lambda m: True, spacing=True)
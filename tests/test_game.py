@@ -0,0 +1,25 @@
+from battleship import BattleshipGame, position_name
+
+
+def lose(game):
+    """Let the enemy fire until it has sunk the player's fleet."""
+    while game.winner() is None:
+        game.enemy_turn()
+
+
+def test_no_shots_after_the_game_is_over():
+    game = BattleshipGame(size=8, num_ships=1, seed=5)
+    lose(game)
+    assert game.winner() == "enemy"
+    tried = game.enemy_fleet.tried
+    for i in range(64):
+        assert not game.player_turn(position_name(*divmod(i, 8)))
+    assert game.enemy_fleet.tried == tried
+    assert game.winner() == "enemy"
+
+
+def test_invalid_salvo_fires_nothing():
+    game = BattleshipGame(size=8, num_ships=3, seed=5, salvo=True)
+    assert not game.player_turn("A1 A1 Z9")
+    assert game.last_player_salvo == ()
+    assert not game.enemy_fleet.tried
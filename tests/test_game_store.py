@@ -0,0 +1,38 @@
+from battleship import BattleshipGame, position_name
+from game_store import GameStore, approx_size
+
+
+def test_save_measures_the_played_game_again():
+    store = GameStore()
+    game = BattleshipGame(size=15, num_ships=5, seed=2)
+    store.put("g", game)
+    fresh = store.stats()["bytes"]
+    for i in range(60):
+        game.player_turn(position_name(*divmod(i, 15)))
+        game.enemy_turn()
+    store.save_many([("g", game, 0)])
+    assert store.stats()["bytes"] > fresh
+
+
+def test_contains_agrees_with_get_after_the_ttl():
+    now = [0.0]
+    store = GameStore(ttl=60, clock=lambda: now[0])
+    store.put("g", BattleshipGame(size=8, num_ships=2, seed=1))
+    assert "g" in store
+    now[0] += 61
+    assert "g" not in store
+    assert store.get("g") is None
+
+
+def test_turns_of_one_game_share_a_lock():
+    store = GameStore()
+    store.put("g", BattleshipGame(size=8, num_ships=2, seed=1))
+    assert store.turn_lock("g") is store.turn_lock("g")
+    store.put("h", BattleshipGame(size=8, num_ships=2, seed=1))
+    assert store.turn_lock("h") is not store.turn_lock("g")
+
+
+def test_a_fresh_game_stays_small():
+    # No Random instance or cell -> ship dict on the game
+    game = BattleshipGame(size=15, num_ships=5, seed=3)
+    assert approx_size(game) < 3000
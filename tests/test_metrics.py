@@ -0,0 +1,29 @@
+import threading
+
+from metrics import Counter, Histogram
+
+
+def run_threads(n, fn):
+    for _ in range(n):
+        thread = threading.Thread(target=fn)
+        thread.start()
+        thread.join()
+
+
+def test_finished_threads_fold_into_totals():
+    counter = Counter("test_total", "test", ("side",))
+    histogram = Histogram("test_seconds", "test")
+    counter.inc("player")
+
+    def work():
+        counter.inc("player")
+        counter.inc("enemy", amount=2)
+        histogram.observe(0.001)
+
+    run_threads(2000, work)
+    assert len(counter._shards) == 1  # the main thread's
+    assert len(histogram._shards) == 0
+    assert counter._merged(1) == {("player",): [2001], ("enemy",): [4000]}
+    assert counter.total() == 6001
+    (cell,) = histogram._merged(histogram._width).values()
+    assert sum(cell[:-1]) == 2000
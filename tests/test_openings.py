@@ -0,0 +1,29 @@
+from battleship import BattleshipGame, position_name
+from openings import load_book, transform
+
+
+def enemy_opening(seed, reload):
+    """Enemy shots until its first hit (reload: from bytes every turn)."""
+    game = BattleshipGame(size=10, num_ships=5, difficulty="hard",
+                          seed=seed)
+    shots = []
+    for i in range(30):
+        if reload:
+            game = BattleshipGame.from_bytes(game.to_bytes())
+        game.player_turn(position_name(*divmod(i, 10)))
+        game.enemy_turn()
+        r, c, hit = game.last_enemy_shot
+        if hit:
+            break
+        shots.append((r, c))
+    return shots
+
+
+def test_reloaded_game_keeps_its_book_symmetry():
+    book = load_book()
+    for seed in range(20):
+        shots = enemy_opening(seed, reload=True)
+        assert shots == enemy_opening(seed, reload=False)
+        expected = [transform(book.move(10, 5, k), 10, seed % 8)
+                    for k in range(len(shots))]
+        assert shots == expected
@@ -0,0 +1,11 @@
+import pytest
+
+from protocol import ProtocolError, ProtocolSession
+
+
+def test_hard_games_are_capped_at_the_normal_size():
+    session = ProtocolSession()
+    with pytest.raises(ProtocolError, match="bad-size"):
+        session.cmd_new("a", "100", "3", "1", "hard")
+    assert session.cmd_new("b", "15", "3", "1", "hard")
+    assert session.cmd_new("c", "100", "3", "1", "easy")
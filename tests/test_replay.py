@@ -0,0 +1,60 @@
+import io
+
+from battleship import BattleshipGame, position_name
+from replay import GameLog, LogCache
+
+
+def play(game, turns):
+    cells = [position_name(r, c) for r in range(game.size)
+             for c in range(game.size)]
+    game.rng.shuffle(cells)
+    for position in cells[:turns]:
+        if game.winner() is not None:
+            break
+        game.player_turn(position)
+        if game.winner() is None:
+            game.enemy_turn()
+
+
+def state(game):
+    return (game.enemy_fleet.hits, game.enemy_fleet.misses,
+            game.player_fleet.hits, game.player_fleet.misses,
+            game.total_player_shots, game.total_enemy_shots, game.moves)
+
+
+def test_cached_log_follows_the_game():
+    cache = LogCache()
+    game = BattleshipGame(size=10, num_ships=3, seed=5)
+    play(game, 20)
+    log = cache.log_of("g", game)
+    play(game, 30)
+    assert cache.log_of("g", game) is log  # extended, not rebuilt
+    fresh = GameLog.from_game(game)
+    assert log.moves == fresh.moves
+    assert log.snapshot_turns == fresh.snapshot_turns
+    for turn in (0, 1, 33, len(log)):
+        assert state(log.game_at(turn)) == state(fresh.game_at(turn))
+
+
+def test_cache_rebuilds_for_another_history():
+    cache = LogCache()
+    game = BattleshipGame(size=10, num_ships=3, seed=5)
+    play(game, 20)
+    log = cache.log_of("g", game)
+    older = BattleshipGame.from_bytes(game.to_bytes())
+    older.moves = older.moves[:10]
+    assert cache.log_of("g", older) is not log
+    assert len(cache.log_of("g", older)) == 5
+
+    new_game = BattleshipGame(size=10, num_ships=3, seed=6)
+    assert cache.log_of("g", new_game).seed == 6
+
+
+def test_salvo_rules_survive_the_log():
+    game = BattleshipGame(size=10, num_ships=3, seed=7, salvo=True)
+    play(game, 12)
+    log = GameLog.read(io.BytesIO(GameLog.from_game(game).to_bytes()))
+    assert log.salvo
+    assert all(log.game_at(turn).salvo for turn in range(len(log) + 1))
+    assert state(log.game_at()) == state(game)
+    assert log.game_at().salvo_size() == game.salvo_size()
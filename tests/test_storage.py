@@ -0,0 +1,69 @@
+import os
+
+import pytest
+
+from battleship import BattleshipGame
+from storage import SQLiteGameStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteGameStore(os.path.join(tmp_path, "games.db"))
+    store.put("g", BattleshipGame(size=8, num_ships=2, seed=1))
+    return store
+
+
+def turn(game, position):
+    game.player_turn(position)
+    if game.winner() is None:
+        game.enemy_turn()
+
+
+def test_interleaved_requests_get_their_own_games(store):
+    # Request A loads and plays; request B loads before A saves
+    game_a, version_a = store.load("g")
+    store.save_many([("g", game_a, version_a)])  # caches A's game
+    game_a, version_a = store.load("g")
+    turn(game_a, "A1")
+    game_b, version_b = store.load("g")
+    assert game_b is not game_a
+    assert version_b == version_a
+    turn(game_b, "H8")
+
+    assert store.save_many([("g", game_a, version_a)]) == []
+    assert store.save_many([("g", game_b, version_b)]) == ["g"]
+
+    saved, version = store.load("g")
+    assert version == game_a.version
+    assert saved.enemy_fleet.tried == game_a.enemy_fleet.tried
+    assert saved.total_player_shots == 1
+
+
+def test_saved_game_is_served_from_the_cache(store):
+    game, version = store.load("g")
+    turn(game, "B2")
+    store.save_many([("g", game, version)])
+    again, version = store.load("g")
+    assert again is game
+    assert version == game.version
+    assert store.load("g")[0] is not game  # checked out by the first load
+
+
+def test_load_reports_the_stored_version(store):
+    game, version = store.load("g")
+    game.version += 5  # local changes must not move the loaded version
+    assert store.load("g")[1] == version
+    assert store.load("missing") == (None, None)
+
+
+def test_put_purges_idle_games(tmp_path):
+    now = [1000.0]
+    store = SQLiteGameStore(os.path.join(tmp_path, "games.db"), ttl=60,
+                            clock=lambda: now[0])
+    store.put("old", BattleshipGame(size=8, num_ships=2, seed=1))
+    now[0] += 30
+    store.put("busy", BattleshipGame(size=8, num_ships=2, seed=2))
+    now[0] += 40  # "old" idle for 70 s, "busy" for 40 s
+    store.put("new", BattleshipGame(size=8, num_ships=2, seed=3))
+    assert "old" not in store
+    assert "busy" in store and "new" in store
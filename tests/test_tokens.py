@@ -0,0 +1,61 @@
+import base64
+
+import pytest
+from flask import Flask
+
+from battleship import BattleshipGame
+from tokens import COOKIE, TokenCodec, TokenGameStore
+
+
+def test_codec_round_trip_hides_the_payload():
+    codec = TokenCodec("secret")
+    payload = BattleshipGame(size=15, num_ships=5, seed=3).to_bytes()
+    token = codec.encode(payload, b"g1")
+    assert codec.decode(token, b"g1") == payload
+    assert codec.encode(payload, b"g1") != token  # fresh nonce
+    raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+    assert payload[28:60] not in raw  # ship positions are encrypted
+
+
+@pytest.mark.parametrize("change", [
+    lambda token, codec: (token[:30] + ("A" if token[30] != "A" else "B")
+                          + token[31:], b"g1", codec),
+    lambda token, codec: (token, b"g2", codec),
+    lambda token, codec: (token, b"g1", TokenCodec("other secret")),
+    lambda token, codec: ("not a token!", b"g1", codec),
+])
+def test_codec_rejects_changed_or_foreign_tokens(change):
+    codec = TokenCodec("secret")
+    token, context, decoder = change(codec.encode(b"state", b"g1"), codec)
+    with pytest.raises(ValueError):
+        decoder.decode(token, context)
+
+
+def test_codec_rejects_expired_tokens():
+    now = [1000.0]
+    codec = TokenCodec("secret", max_age=60, clock=lambda: now[0])
+    token = codec.encode(b"state")
+    now[0] += 61
+    with pytest.raises(ValueError, match="expired"):
+        codec.decode(token)
+
+
+def test_store_keeps_the_game_in_a_cookie():
+    app = Flask(__name__)
+    store = TokenGameStore("secret")
+    store.install(app)
+    game = BattleshipGame(size=8, num_ships=2, seed=4)
+
+    with app.test_request_context():
+        store.put("g1", game)
+        response = app.process_response(app.response_class())
+    token = response.headers["Set-Cookie"].split(";")[0].split("=", 1)[1]
+
+    headers = {"Cookie": f"{COOKIE}={token}"}
+    with app.test_request_context(headers=headers):
+        loaded = store.get("g1")
+        assert loaded.to_bytes() == game.to_bytes()
+        assert store.get("g1") is loaded  # decoded once per request
+    with app.test_request_context(headers=headers):
+        assert store.get("g2") is None  # token of another game
+    assert store.stats()["rejected"] == 1
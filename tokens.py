@@ -0,0 +1,193 @@
+# Stateless game storage: each game travels with its client as a token
+import base64
+import hashlib
+import hmac
+import os
+import struct
+import time
+
+from battleship import BattleshipGame
+
+# Token: header (format, issue time in Unix seconds, random nonce), the
+# encrypted game state (BattleshipGame.to_bytes), then a 16-byte tag;
+# URL-safe base64 without padding.
+TOKEN_FORMAT = 1
+_HEADER = struct.Struct("<BI12s")
+_CONTEXT_LEN = struct.Struct("<H")
+TAG_SIZE = 16
+
+COOKIE = "battleship_game"
+
+
+class TokenCodec:
+    """Encrypt-then-MAC for small payloads, keyed from one secret.
+
+    The payload is XORed with a SHAKE-256 keystream of (key, nonce), so
+    a client cannot read the ship positions, and HMAC-SHA256 over the
+    header, the ciphertext and a context string (the game id) detects
+    any change or a token moved to another game. Both keys are derived
+    from the secret; encode and decode are a few microseconds each.
+    """
+
+    def __init__(self, secret, max_age=None, clock=time.time):
+        if isinstance(secret, str):
+            secret = secret.encode()
+        self._cipher_key = hmac.digest(secret, b"battleship token cipher",
+                                       "sha256")
+        self._mac_key = hmac.digest(secret, b"battleship token mac",
+                                    "sha256")
+        self.max_age = max_age
+        self.clock = clock
+
+    def _xor(self, nonce, data) -> bytes:
+        stream = hashlib.shake_256(self._cipher_key + nonce).digest(
+            len(data))
+        return (int.from_bytes(data, "little")
+                ^ int.from_bytes(stream, "little")).to_bytes(len(data),
+                                                             "little")
+
+    def _tag(self, context, signed) -> bytes:
+        message = _CONTEXT_LEN.pack(len(context)) + context + signed
+        return hmac.digest(self._mac_key, message, "sha256")[:TAG_SIZE]
+
+    def encode(self, payload: bytes, context=b"") -> str:
+        """Seal payload into a URL-safe token bound to context."""
+        nonce = os.urandom(12)
+        signed = (_HEADER.pack(TOKEN_FORMAT, int(self.clock()), nonce)
+                  + self._xor(nonce, payload))
+        raw = signed + self._tag(context, signed)
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+    def decode(self, token: str, context=b"") -> bytes:
+        """Payload of a token from encode(); ValueError if it is not
+        genuine, was issued for another context, or has expired."""
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        except ValueError:
+            raise ValueError("malformed token") from None
+        if len(raw) < _HEADER.size + TAG_SIZE:
+            raise ValueError("malformed token")
+        signed, tag = raw[:-TAG_SIZE], raw[-TAG_SIZE:]
+        if not hmac.compare_digest(tag, self._tag(context, signed)):
+            raise ValueError("token signature mismatch")
+        fmt, issued, nonce = _HEADER.unpack_from(signed)
+        if fmt != TOKEN_FORMAT:
+            raise ValueError(f"unsupported token format {fmt}")
+        if self.max_age is not None \
+                and self.clock() - issued > self.max_age:
+            raise ValueError("token expired")
+        return self._xor(nonce, signed[_HEADER.size:])
+
+
+class TokenGameStore:
+    """Keeps no games: each one lives in a cookie on its client.
+
+    Same interface as GameStore. get() decodes the request's cookie
+    (once per request), put(), save_many() and delete() queue a new
+    cookie that the hook added by install() sets on the response. Any
+    worker sharing the secret can serve any request, with no sticky
+    sessions and nothing to expire.
+
+    The server cannot tell a stale token from the latest one, so a
+    client can replay an older state of its own game (until max_age),
+    e.g. to take back a miss. The app therefore keeps these games off
+    the leaderboard (see replayable).
+    """
+
+    # Clients can rewind their games: results are not trustworthy
+    replayable = True
+
+    def __init__(self, secret, max_age=3600, cookie=COOKIE):
+        self.codec = TokenCodec(secret, max_age)
+        self.max_age = max_age
+        self.cookie = cookie
+
+        # Counters
+        self.issued = 0
+        self.decoded = 0
+        self.rejected = 0
+
+    def install(self, app):
+        """Set queued cookies after every request.
+
+        Call before registering the after_request handlers that save
+        games (Flask runs them in reverse order).
+        """
+        from flask import g, request
+
+        @app.after_request
+        def set_game_token(response):
+            for token in g.pop("game_tokens", {}).values():
+                if token is None:
+                    response.delete_cookie(self.cookie)
+                else:
+                    response.set_cookie(
+                        self.cookie, token, max_age=self.max_age,
+                        httponly=True, samesite="Lax",
+                        secure=request.is_secure)
+            return response
+
+    # ----- Per-request state -----
+    @staticmethod
+    def _request_state():
+        from flask import g
+
+        return (g.setdefault("token_games", {}),
+                g.setdefault("game_tokens", {}))
+
+    def _queue(self, key, game):
+        games, tokens = self._request_state()
+        games[key] = game
+        tokens[key] = self.codec.encode(game.to_bytes(), key.encode())
+        self.issued += 1
+
+    # ----- Public API (same shape as GameStore) -----
+    def get(self, key):
+        """Return the game in this request's token, or None."""
+        from flask import request
+
+        games, _ = self._request_state()
+        if key in games:
+            return games[key]
+        token = request.cookies.get(self.cookie)
+        if token is None:
+            return None
+        try:
+            game = BattleshipGame.from_bytes(
+                self.codec.decode(token, key.encode()))
+        except ValueError:
+            self.rejected += 1
+            return None
+        self.decoded += 1
+        games[key] = game
+        return game
+
+    def put(self, key, game):
+        """Send the client a token for game."""
+        self._queue(key, game)
+
+    def save_many(self, items):
+        """Re-issue the tokens of changed games; never conflicts (the
+        client holds the only copy)."""
+        for key, game, _ in items:
+            self._queue(key, game)
+        return []
+
+    def delete(self, key):
+        """Clear the client's token."""
+        games, tokens = self._request_state()
+        games[key] = None
+        tokens[key] = None
+
+    def stats(self) -> dict:
+        """Snapshot of the token counters (games live on the clients)."""
+        return {
+            "games": 0,
+            "issued": self.issued,
+            "decoded": self.decoded,
+            "rejected": self.rejected,
+        }
+
+    def __contains__(self, key):
+        """Unknowable without the client's token: any id may be live."""
+        return True
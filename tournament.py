@@ -0,0 +1,299 @@
+# Round-robin tournament between registered AI strategies
+import argparse
+import json
+import math
+import os
+import random
+import time
+from bisect import bisect_left
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import combinations
+
+from battleship import BitBoard, fleet_lengths
+from strategies import PLACERS, SHOOTERS, get_placer, make_shooter
+
+# Decision-time histogram bounds: 1 us doubling up to ~16 s
+TIME_BUCKETS = tuple(1e-6 * 2 ** k for k in range(25))
+Z_95 = 1.96
+
+
+def entrant_name(shooter, placer) -> str:
+    return f"{shooter}/{placer}"
+
+
+def match_seed(base_seed, a, b, index) -> int:
+    """Deterministic per-game seed (independent of chunk layout)."""
+    return random.Random(f"{base_seed}:{a}:{b}:{index}").getrandbits(32)
+
+
+class DecisionTimes:
+    """Per-strategy call counts, total, max and a log2 histogram."""
+
+    def __init__(self):
+        self.calls = Counter()
+        self.total = Counter()
+        self.max = {}
+        self.buckets = {}
+
+    def add(self, name, seconds):
+        self.calls[name] += 1
+        self.total[name] += seconds
+        if seconds > self.max.get(name, 0.0):
+            self.max[name] = seconds
+        buckets = self.buckets.get(name)
+        if buckets is None:
+            buckets = self.buckets[name] = [0] * (len(TIME_BUCKETS) + 1)
+        buckets[bisect_left(TIME_BUCKETS, seconds)] += 1
+
+    def merge(self, other: "DecisionTimes"):
+        self.calls.update(other.calls)
+        self.total.update(other.total)
+        for name, seconds in other.max.items():
+            self.max[name] = max(self.max.get(name, 0.0), seconds)
+        for name, counts in other.buckets.items():
+            mine = self.buckets.setdefault(name, [0] * len(counts))
+            for i, n in enumerate(counts):
+                mine[i] += n
+
+    def percentile(self, name, q) -> float:
+        """Upper bound of the bucket holding the q-th quantile."""
+        target = q * self.calls[name]
+        seen = 0
+        for bound, n in zip(TIME_BUCKETS, self.buckets[name]):
+            seen += n
+            if seen >= target:
+                return bound
+        return self.max[name]
+
+    def summary(self) -> dict:
+        return {
+            name: {
+                "calls": calls,
+                "mean_us": round(self.total[name] / calls * 1e6, 2),
+                "p50_us": round(self.percentile(name, 0.5) * 1e6, 2),
+                "p95_us": round(self.percentile(name, 0.95) * 1e6, 2),
+                "max_us": round(self.max[name] * 1e6, 2),
+            }
+            for name, calls in sorted(self.calls.items())
+        }
+
+
+class Standings:
+    """Win counts per pairing; mergeable so workers send partial results.
+
+    Ratings are recomputed from the counts on demand, so they update
+    incrementally as chunks finish and never depend on game order.
+    """
+
+    def __init__(self):
+        self.games = 0
+        self.wins = Counter()    # (winner, loser) -> n
+        self.played = Counter()  # entrant -> games
+        self.shots = Counter()   # entrant -> shots in games it won
+
+    def add(self, winner, loser, shots):
+        self.games += 1
+        self.wins[(winner, loser)] += 1
+        self.played[winner] += 1
+        self.played[loser] += 1
+        self.shots[winner] += shots
+
+    def merge(self, other: "Standings"):
+        self.games += other.games
+        self.wins.update(other.wins)
+        self.played.update(other.played)
+        self.shots.update(other.shots)
+
+    def won(self, entrant) -> int:
+        return sum(n for (w, _), n in self.wins.items() if w == entrant)
+
+    def ratings(self) -> list[dict]:
+        """Elo-scale performance rating per entrant with a 95% interval.
+
+        The rating is the Elo difference implied by the entrant's score
+        against the whole field (1500 = field average); the interval is
+        the Wilson score interval mapped onto the same scale.
+        """
+        rows = []
+        for entrant, n in self.played.items():
+            won = self.won(entrant)
+            score = won / n
+            centre = (score + Z_95 ** 2 / (2 * n)) / (1 + Z_95 ** 2 / n)
+            spread = Z_95 / (1 + Z_95 ** 2 / n) * math.sqrt(
+                score * (1 - score) / n + Z_95 ** 2 / (4 * n * n))
+            rows.append({
+                "entrant": entrant,
+                "games": n,
+                "win_rate": round(score, 4),
+                "rating": round(_elo(score, n)),
+                "low": round(_elo(centre - spread, n)),
+                "high": round(_elo(centre + spread, n)),
+                "mean_shots_to_win": round(self.shots[entrant] / won, 1)
+                if won else None,
+            })
+        rows.sort(key=lambda row: -row["rating"])
+        return rows
+
+    def matrix(self) -> dict:
+        """'a vs b' -> a's win rate against b."""
+        result = {}
+        for (w, loser), n in self.wins.items():
+            for a, b in ((w, loser), (loser, w)):
+                key = f"{a} vs {b}"
+                if key not in result:
+                    total = self.wins[(a, b)] + self.wins[(b, a)]
+                    result[key] = round(self.wins[(a, b)] / total, 4)
+        return dict(sorted(result.items()))
+
+
+def _elo(score, n) -> float:
+    """1500 + Elo difference for a score (clamped half a game from 0/1)."""
+    edge = 0.5 / n
+    score = min(max(score, edge), 1 - edge)
+    return 1500 + 400 * math.log10(score / (1 - score))
+
+
+# ========= Games =========
+def play_match(a, b, size, num_ships, seed, times) -> tuple[int, int]:
+    """One game between entrants a and b -> (winner index, its shots).
+
+    Each side places its own fleet and fires at the other's; the side
+    that moves first alternates with the seed.
+    """
+    rng = random.Random(seed)
+    lengths = fleet_lengths(num_ships)
+    sides = []
+    for entrant in (a, b):
+        shooter_name, placer_name = entrant.split("/")
+        placer = get_placer(placer_name)
+        started = time.perf_counter()
+        fleet = placer(size, lengths, rng)
+        times.add(f"placer:{placer_name}", time.perf_counter() - started)
+        sides.append((make_shooter(shooter_name, size),
+                      BitBoard(size, fleet),
+                      random.Random(rng.getrandbits(32))))
+
+    turn = seed & 1
+    shots = [0, 0]
+    while True:
+        shooter, _, shooter_rng = sides[turn]
+        target = sides[1 - turn][1]
+        started = time.perf_counter()
+        cell = shooter.choose(target, shooter_rng)
+        times.add(f"shooter:{shooter.name}", time.perf_counter() - started)
+        if cell is None or target.tried & target.bit(*cell):
+            raise ValueError(f"{shooter.name} chose an invalid cell {cell}")
+        target.fire(*cell)
+        shots[turn] += 1
+        if target.all_sunk():
+            return turn, shots[turn]
+        turn ^= 1
+
+
+def run_chunk(a, b, size, num_ships, base_seed, start, count):
+    """Worker entry point: games start..start+count of one pairing."""
+    standings = Standings()
+    times = DecisionTimes()
+    for index in range(start, start + count):
+        seed = match_seed(base_seed, a, b, index)
+        winner, shots = play_match(a, b, size, num_ships, seed, times)
+        pair = (a, b) if winner == 0 else (b, a)
+        standings.add(*pair, shots)
+    return standings, times
+
+
+def tournament(entrants, games_per_pair, size=10, num_ships=5,
+               base_seed=0, workers=None, chunk_size=20):
+    """Round robin over a process pool; yield (Standings, DecisionTimes).
+
+    Every pairing is cut into small chunks, interleaved across pairings
+    and queued up front; each idle worker takes the next chunk, so a
+    slow strategy never leaves the other workers waiting. A merged
+    snapshot is yielded every time a chunk finishes.
+    """
+    workers = workers or os.cpu_count() or 1
+    pairs = list(combinations(entrants, 2))
+    jobs = [
+        (a, b, size, num_ships, base_seed, start,
+         min(chunk_size, games_per_pair - start))
+        for start in range(0, games_per_pair, chunk_size)
+        for a, b in pairs
+    ]
+    standings, times = Standings(), DecisionTimes()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_chunk, *job) for job in jobs]
+        for future in as_completed(futures):
+            part_standings, part_times = future.result()
+            standings.merge(part_standings)
+            times.merge(part_times)
+            yield standings, times
+
+
+# ========= CLI =========
+def _names(text):
+    return [name for name in text.split(",") if name]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Round-robin tournament between AI strategies")
+    parser.add_argument("--shooters", type=_names, default=sorted(SHOOTERS))
+    parser.add_argument("--placers", type=_names, default=sorted(PLACERS))
+    parser.add_argument("--games", type=int, default=200,
+                        help="games per pairing")
+    parser.add_argument("--size", type=int, default=10)
+    parser.add_argument("--ships", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=20)
+    parser.add_argument("--json", action="store_true",
+                        help="print the final results as JSON")
+    args = parser.parse_args(argv)
+
+    for name in args.shooters:
+        make_shooter(name, args.size)  # fail fast on unknown names
+    for name in args.placers:
+        get_placer(name)
+    entrants = [entrant_name(s, p) for s in args.shooters
+                for p in args.placers]
+
+    started = time.perf_counter()
+    standings, times = Standings(), DecisionTimes()
+    for standings, times in tournament(entrants, args.games, args.size,
+                                       args.ships, args.seed, args.workers,
+                                       args.chunk_size):
+        if not args.json:
+            rate = standings.games / (time.perf_counter() - started)
+            print(f"\r{standings.games:,} games  {rate:,.0f} games/s",
+                  end="", flush=True)
+
+    if args.json:
+        print(json.dumps({
+            "games": standings.games,
+            "ratings": standings.ratings(),
+            "matrix": standings.matrix(),
+            "decision_times": times.summary(),
+        }, indent=1))
+        return
+
+    print()
+    print(f"{'entrant':28s} {'rating':>6s} {'95% CI':>13s} "
+          f"{'win%':>6s} {'shots':>6s}")
+    for row in standings.ratings():
+        shots = row["mean_shots_to_win"]
+        print(f"{row['entrant']:28s} {row['rating']:6d} "
+              f"{row['low']:6d}–{row['high']:<6d} "
+              f"{row['win_rate']:6.1%} "
+              f"{'-' if shots is None else shots:>6}")
+    print()
+    print(f"{'decision':28s} {'calls':>9s} {'mean us':>9s} "
+          f"{'p50 us':>9s} {'p95 us':>9s} {'max us':>9s}")
+    for name, row in times.summary().items():
+        print(f"{name:28s} {row['calls']:9d} {row['mean_us']:9.1f} "
+              f"{row['p50_us']:9.1f} {row['p95_us']:9.1f} "
+              f"{row['max_us']:9.1f}")
+
+
+if __name__ == "__main__":
+    main()